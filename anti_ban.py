@@ -1,23 +1,30 @@
 # anti_ban.py
 import random
+import re
 import time
 from typing import Tuple
 
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.common.by import By
 
 import config
+import metrics
 
 
-def human_delay():
-    """Sleep random amount in configured range."""
-    t = random.uniform(config.DELAY_MIN, config.DELAY_MAX)
-    time.sleep(t)
+def human_delay(scale: float = 1.0):
+    """Sleep random amount in configured range (scaled by the adaptive throttle)."""
+    t = random.uniform(config.DELAY_MIN, config.DELAY_MAX) * scale
+    with metrics.timer("human_delay"):
+        time.sleep(t)
 
 
 def small_random_scroll(driver: WebDriver):
     """Do small incremental scrolls to simulate reading."""
+    with metrics.timer("scroll"):
+        _scroll(driver)
+
+
+def _scroll(driver: WebDriver):
     height = driver.execute_script("return document.body.scrollHeight || document.documentElement.scrollHeight;")
     # do 2-5 small scrolls
     steps = random.randint(2, 5)
@@ -30,6 +37,11 @@ def small_random_scroll(driver: WebDriver):
 
 def jitter_mouse(driver: WebDriver, times: int = 3):
     """Move mouse to random points on the page slightly (best-effort)."""
+    with metrics.timer("jitter"):
+        _jitter(driver, times)
+
+
+def _jitter(driver: WebDriver, times: int):
     try:
         actions = ActionChains(driver)
         w = driver.execute_script("return window.innerWidth")
@@ -46,22 +58,52 @@ def jitter_mouse(driver: WebDriver, times: int = 3):
         pass
 
 
+BLOCK_MARKERS = ("captcha", "access denied", "attention required", "just a moment",
+                 "verify you are human", "request blocked")
+
+# One round trip: title, challenge elements and the start of the body text
+# only (block pages are tiny), instead of transferring the whole page_source
+BLOCK_CHECK_JS = """
+var markers = arguments[0];
+if (document.querySelector('iframe[src*="captcha"], #challenge-form, #cf-challenge-running, [data-sitekey]')) {
+    return true;
+}
+var text = ((document.title || '') + ' ' +
+            (document.body ? document.body.textContent.slice(0, 2000) : '')).toLowerCase();
+for (var i = 0; i < markers.length; i++) {
+    if (text.indexOf(markers[i]) !== -1) { return true; }
+}
+return false;
+"""
+
+_TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.I | re.S)
+_CHALLENGE_RE = re.compile(r'iframe[^>]+src="[^"]*captcha|id="challenge-form"|data-sitekey=', re.I)
+
+
 def detect_captcha_or_block(driver: WebDriver) -> bool:
-    """Return True if a captcha or block page is likely present."""
-    # Common heuristics
-    page_source = driver.page_source.lower()
-    if "captcha" in page_source or "cloudflare" in page_source or "access denied" in page_source:
-        return True
-    # check for known recaptcha iframe or elements
+    """Return True if a captcha or block page is likely present (one WebDriver round trip)."""
     try:
-        frames = driver.find_elements(By.TAG_NAME, "iframe")
-        for f in frames:
-            src = f.get_attribute("src") or ""
-            if "recaptcha" in src or "captcha" in src:
-                return True
+        with metrics.timer("block_check"):
+            blocked = bool(driver.execute_script(BLOCK_CHECK_JS, list(BLOCK_MARKERS)))
     except Exception:
-        pass
-    return False
+        return False
+    if blocked:
+        metrics.count("block_pages")
+    return blocked
+
+
+def is_block_html(html: str) -> bool:
+    """detect_captcha_or_block for raw HTML (HTTP fetches, archives)."""
+    if _CHALLENGE_RE.search(html):
+        return True
+    m = _TITLE_RE.search(html)
+    head = ((m.group(1) if m else "") + " " + _body_start(html)).lower()
+    return any(marker in head for marker in BLOCK_MARKERS)
+
+
+def _body_start(html: str, size: int = 2000) -> str:
+    i = html.lower().find("<body")
+    return html[i:i + size] if i != -1 else html[:size]
 
 
 def apply_pre_visit_behaviors(driver: WebDriver):
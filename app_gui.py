@@ -1,19 +1,16 @@
 # app_gui.py
 import threading
 import queue
-import time
-import os
 import traceback
-from typing import List
-import pandas as pd
 import tkinter as tk
 from tkinter import ttk, filedialog, scrolledtext, messagebox
 
-from selenium.webdriver.common.by import By
-
-from browser import create_driver
-from parser import extract_links_from_list_page, parse_job_detail
-from anti_ban import small_random_scroll, human_delay, detect_captcha_or_block
+import metrics
+from crawler import crawl, load_resumable
+from journal import RunJournal, journal_path
+from progress import Progress
+from sinks import open_sink, resumable
+from seen_index import SeenIndex, default_index_path
 from utils import build_classification_url
 
 import config
@@ -21,154 +18,73 @@ import config
 
 class ScrapeWorker(threading.Thread):
     def __init__(self, base_url: str, route: str, max_pages: int, output_file: str,
-                 log_queue: queue.Queue, stop_event: threading.Event):
+                 log_queue: queue.Queue, stop_event: threading.Event, num_workers: int = 1,
+                 list_only: bool = False, incremental: bool = False, resume: bool = False):
         super().__init__(daemon=True)
         self.base_url = base_url
         self.route = route
         self.max_pages = max_pages
         self.output_file = output_file
+        self.num_workers = num_workers
+        self.list_only = list_only
+        self.incremental = incremental
+        self.resume = resume
         self.log_queue = log_queue
         self.stop_event = stop_event
-        self.driver = None
+        self.progress = Progress()
 
     def log(self, *args):
         self.log_queue.put(" ".join(str(a) for a in args))
 
-    def safe_quit_driver(self):
-        try:
-            if self.driver:
-                self.driver.quit()
-        except:
-            pass
-        self.driver = None
-
-    def safe_get(self, url: str):
-        if self.stop_event.is_set():
-            raise RuntimeError("Stop requested")
-
-        try:
-            self.driver.get(url)
-            return
-        except Exception as e:
-            self.log("Navigation error:", repr(e), "Restarting browser...")
-            self.safe_quit_driver()
-
-            if self.stop_event.is_set():
-                raise RuntimeError("Stop requested")
-
-            self.driver = create_driver()
-            time.sleep(1)
-            self.driver.get(url)
-
-    def collect_links_paginated(self) -> List[str]:
-        from parser import extract_links_from_list_page
-        links_acc = []
-
-        for page in range(1, self.max_pages + 1):
-            if self.stop_event.is_set():
-                self.log("Stop detected during pagination.")
-                break
-
-            self.log(f"Collecting page {page}...")
-            try:
-                small_random_scroll(self.driver)
-            except:
-                pass
-
-            human_delay()
-
-            try:
-                links = extract_links_from_list_page(self.driver, self.base_url)
-            except Exception as e:
-                self.log("Failed to extract links:", e)
-                links = []
-
-            self.log(f"Found {len(links)} links.")
-            links_acc.extend(links)
-
-            if page >= self.max_pages:
-                break
-
-            try:
-                try:
-                    next_btn = self.driver.find_element(By.XPATH, '//a[@rel="nofollow next"]')
-                except:
-                    next_btn = self.driver.find_element(By.XPATH, '//a[@title="Selanjutnya"]')
-
-                self.driver.execute_script("arguments[0].click();", next_btn)
-                human_delay()
-            except Exception:
-                self.log("Next button not found — stopping.")
-                break
-
-        return links_acc
-
     def run(self):
+        sink = journal = seen = None
         try:
-            self.log("Starting driver...")
-            self.driver = create_driver()
-
             full_url = f"{self.base_url}{self.route}"
-            self.log("Visiting:", full_url)
-
-            self.safe_get(full_url)
-            human_delay()
-
-            links = self.collect_links_paginated()
-            self.log(f"Total collected links: {len(links)}")
-
-            # result lists
-            job_names = []
-            companies = []
-            work_types = []
-            salaries = []
-            link_list = []
-
-            for idx, link in enumerate(links, start=1):
-                if self.stop_event.is_set():
-                    break
-
-                self.log(f"[{idx}] Visiting {link}")
-                self.safe_get(link)
-                human_delay()
-
-                try:
-                    parsed = parse_job_detail(self.driver)
-                except:
-                    parsed = {"job_name": None, "company_name": None,
-                              "work_type": None, "salary_range": None}
-
-                job_names.append(parsed["job_name"])
-                companies.append(parsed["company_name"])
-                work_types.append(parsed["work_type"])
-                salaries.append(parsed["salary_range"])
-                link_list.append(link)
-
-                self.log(f"[{idx}] Scraped: {parsed}")
-
-                if idx % 50 == 0:
-                    self.log("Restarting driver...")
-                    self.safe_quit_driver()
-                    self.driver = create_driver()
-
-            # Save CSV
-            df = pd.DataFrame({
-                "Job Name": job_names,
-                "Company": companies,
-                "Work Type": work_types,
-                "Salary Range": salaries,
-                "Link": link_list,
-            })
-
-            os.makedirs(os.path.dirname(self.output_file) or ".", exist_ok=True)
-            df.to_csv(self.output_file, index=False, encoding="utf-8-sig")
-            self.log(f"Saved {len(df)} rows to {self.output_file}")
+            params = dict(full_url=full_url, list_only=self.list_only)
+
+            can_resume = resumable(self.output_file)
+            if self.resume:
+                journal = load_resumable(self.output_file, **params) if can_resume else None
+                self.log("Resuming previous run." if journal else "Nothing to resume, starting a new run.")
+
+            # rows are streamed to the output file as they are scraped
+            sink = open_sink(self.output_file, append=journal is not None)
+            if journal is None and can_resume:
+                journal = RunJournal.start(journal_path(self.output_file), **params)
+            if self.incremental:
+                seen = SeenIndex(default_index_path(self.output_file))
+
+            self.log(f"Starting {self.num_workers} worker(s)...")
+            with metrics.exporting():
+                count = crawl(self.base_url, full_url, sink, config.START_PAGE - 1 + self.max_pages,
+                              num_workers=self.num_workers, list_only=self.list_only, seen=seen,
+                              journal=journal, stop_event=self.stop_event, log=self.log,
+                              start_page=config.START_PAGE, progress=self.progress,
+                              log_jobs=config.GUI_LOG_EACH_JOB)
+            if metrics.enabled():
+                self.log("Metrics:", metrics.summary(), "→", config.METRICS_FILE)
+
+            sink.close()
+            self.log(f"Saved {count} rows to {self.output_file}")
+            finished = journal is None or journal.finished  # a resume appends to unfinished output
+            if config.DATASET_DIR and count and finished and not self.stop_event.is_set():
+                import dataset
+                run_id = journal.run_id if journal is not None else None
+                if dataset.append_output(self.output_file, config.COUNTRY_CODE, self.route.lstrip("/"),
+                                         run_id=run_id):
+                    self.log("Appended to dataset", config.DATASET_DIR)
 
         except Exception as e:
             self.log("ERROR:", repr(e))
             self.log(traceback.format_exc())
         finally:
-            self.safe_quit_driver()
+            if sink is not None:
+                # keeps whatever was scraped before an error
+                sink.close()
+            if journal is not None:
+                journal.close()
+            if seen is not None:
+                seen.close()
             self.log("Driver closed. Finished.")
 
 
@@ -181,6 +97,7 @@ class ScraperGUI:
         self.log_queue = queue.Queue()
         self.stop_event = threading.Event()
         self.worker = None
+        self._polls = 0
 
         self.build_ui()
         self.root.after(200, self.poll_log_queue)
@@ -201,19 +118,57 @@ class ScraperGUI:
         self.pages_var = tk.IntVar(value=config.MAX_PAGES_PER_RUN)
         ttk.Entry(frm, textvariable=self.pages_var, width=6).grid(row=1, column=2, sticky="w")
 
-        ttk.Label(frm, text="Output CSV").grid(row=2, column=0, sticky="w", pady=(10,0))
+        ttk.Label(frm, text="Workers").grid(row=0, column=3, sticky="w")
+        self.workers_var = tk.IntVar(value=config.NUM_WORKERS)
+        ttk.Entry(frm, textvariable=self.workers_var, width=6).grid(row=1, column=3, sticky="w")
+
+        ttk.Label(frm, text="Output file (.csv / .jsonl / .parquet)").grid(row=2, column=0, sticky="w", pady=(10,0))
         self.output_var = tk.StringVar(value=config.OUTPUT_CSV)
         ttk.Entry(frm, textvariable=self.output_var, width=40).grid(row=3, column=0, sticky="w")
 
         ttk.Button(frm, text="Browse...", command=self.browse_file).grid(row=3, column=1)
 
+        self.list_only_var = tk.BooleanVar(value=config.LIST_ONLY)
+        ttk.Checkbutton(frm, text="List only (skip detail pages when possible)",
+                        variable=self.list_only_var).grid(row=4, column=0, columnspan=2, sticky="w", pady=(10,0))
+
+        self.incremental_var = tk.BooleanVar(value=config.INCREMENTAL)
+        ttk.Checkbutton(frm, text="Skip already-seen jobs (incremental)",
+                        variable=self.incremental_var).grid(row=5, column=0, columnspan=2, sticky="w")
+
+        self.pipeline_var = tk.BooleanVar(value=config.PIPELINE)
+        ttk.Checkbutton(frm, text="Pipeline (scrape details while paginating)",
+                        variable=self.pipeline_var).grid(row=6, column=0, columnspan=2, sticky="w")
+
+        self.metrics_enabled_var = tk.BooleanVar(value=metrics.enabled())
+        ttk.Checkbutton(frm, text=f"Record stage metrics (→ {config.METRICS_FILE})",
+                        variable=self.metrics_enabled_var).grid(row=7, column=0, columnspan=2, sticky="w")
+
+        self.log_jobs_var = tk.BooleanVar(value=config.GUI_LOG_EACH_JOB)
+        ttk.Checkbutton(frm, text="Log every scraped job",
+                        variable=self.log_jobs_var).grid(row=8, column=0, columnspan=2, sticky="w")
+
         # buttons
         btn_frm = ttk.Frame(self.root, padding=10)
         btn_frm.pack(fill="x")
 
         ttk.Button(btn_frm, text="Start", command=self.on_start).grid(row=0, column=0, padx=5)
-        ttk.Button(btn_frm, text="Stop", command=self.on_stop).grid(row=0, column=1, padx=5)
-        ttk.Button(btn_frm, text="Clear Log", command=self.clear_log).grid(row=0, column=2, padx=5)
+        ttk.Button(btn_frm, text="Resume", command=self.on_resume).grid(row=0, column=1, padx=5)
+        ttk.Button(btn_frm, text="Stop", command=self.on_stop).grid(row=0, column=2, padx=5)
+        ttk.Button(btn_frm, text="Clear Log", command=self.clear_log).grid(row=0, column=3, padx=5)
+
+        # progress: pages, jobs done / known, rate, ETA
+        prog_frm = ttk.Frame(self.root, padding=(10, 0))
+        prog_frm.pack(fill="x")
+        self.progress_var = tk.StringVar(value="")
+        ttk.Label(prog_frm, textvariable=self.progress_var).pack(fill="x")
+        self.progress_bar = ttk.Progressbar(prog_frm, mode="determinate", maximum=1.0)
+        self.progress_bar.pack(fill="x", pady=(2, 4))
+
+        # live throughput / stage breakdown (metrics enabled only)
+        self.metrics_var = tk.StringVar(value="")
+        ttk.Label(self.root, textvariable=self.metrics_var, padding=(10, 0),
+                  wraplength=820, justify="left").pack(fill="x")
 
         # log
         log_frm = ttk.Frame(self.root, padding=10)
@@ -224,11 +179,15 @@ class ScraperGUI:
 
     def browse_file(self):
         f = filedialog.asksaveasfilename(defaultextension=".csv",
-                                         filetypes=[("CSV", "*.csv")])
+                                         filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl"),
+                                                    ("Parquet", "*.parquet")])
         if f:
             self.output_var.set(f)
 
-    def on_start(self):
+    def on_resume(self):
+        self.on_start(resume=True)
+
+    def on_start(self, resume: bool = False):
         if self.worker and self.worker.is_alive():
             messagebox.showinfo("Info", "Scraper already running.")
             return
@@ -250,7 +209,19 @@ class ScraperGUI:
             messagebox.showerror("Error", "Max Pages must be positive integer.")
             return
 
+        try:
+            num_workers = int(self.workers_var.get())
+            if num_workers <= 0:
+                raise ValueError()
+        except:
+            messagebox.showerror("Error", "Workers must be positive integer.")
+            return
+
         out_file = self.output_var.get().strip()
+        if resume and not resumable(out_file):
+            messagebox.showinfo("Resume", "Parquet runs cannot be resumed: a Parquet file cannot be "
+                                          "appended to. Use CSV or JSON Lines output to resume runs.")
+            return
 
         # update global config
         config.COUNTRY_CODE = country
@@ -259,6 +230,12 @@ class ScraperGUI:
         config.CLASSIFICATION_ROUTE = route
         config.FULL_CLASSIFICATION_ROUTE = full_url
         config.MAX_PAGES_PER_RUN = max_pages
+        config.NUM_WORKERS = num_workers
+        config.LIST_ONLY = bool(self.list_only_var.get())
+        config.INCREMENTAL = bool(self.incremental_var.get())
+        config.PIPELINE = bool(self.pipeline_var.get())
+        config.GUI_LOG_EACH_JOB = bool(self.log_jobs_var.get())
+        metrics.set_enabled(self.metrics_enabled_var.get())
         config.OUTPUT_CSV = out_file
 
         # clear states
@@ -266,10 +243,11 @@ class ScraperGUI:
         self.log_queue.queue.clear()
 
         self.worker = ScrapeWorker(base_url, route, max_pages, out_file,
-                                   self.log_queue, self.stop_event)
+                                   self.log_queue, self.stop_event, num_workers,
+                                   config.LIST_ONLY, config.INCREMENTAL, resume)
         self.worker.start()
 
-        self.log(f"Started: {full_url} pages={max_pages} → {out_file}")
+        self.log(f"Started: {full_url} pages={max_pages} workers={num_workers} → {out_file}")
 
     def on_stop(self):
         if not self.worker or not self.worker.is_alive():
@@ -287,18 +265,42 @@ class ScraperGUI:
     def log(self, *args):
         self.log_queue.put(" ".join(str(a) for a in args))
 
+    def append_log(self, lines):
+        """One insert for a batch of messages; only the last GUI_LOG_MAX_LINES lines are kept."""
+        text = "\n".join(lines) + "\n"
+        if config.GUI_LOG_FILE:
+            with open(config.GUI_LOG_FILE, "a", encoding="utf-8") as f:
+                f.write(text)
+
+        self.log_widget.config(state="normal")
+        self.log_widget.insert("end", text)
+        excess = int(self.log_widget.index("end-1c").split(".")[0]) - 1 - config.GUI_LOG_MAX_LINES
+        if excess > 0:
+            self.log_widget.delete("1.0", f"{excess + 1}.0")
+        self.log_widget.see("end")
+        self.log_widget.config(state="disabled")
+
     def poll_log_queue(self):
+        batch = []
         try:
-            while True:
-                msg = self.log_queue.get_nowait()
-                self.log_widget.config(state="normal")
-                self.log_widget.insert("end", msg + "\n")
-                self.log_widget.see("end")
-                self.log_widget.config(state="disabled")
+            while len(batch) < config.GUI_LOG_BATCH:
+                batch.append(self.log_queue.get_nowait())
         except queue.Empty:
             pass
+        if batch:
+            self.append_log(batch)
 
-        self.root.after(200, self.poll_log_queue)
+        if self.worker is not None:
+            progress = self.worker.progress
+            self.progress_var.set(progress.summary())
+            self.progress_bar["value"] = progress.fraction()
+
+        self._polls += 1
+        if self._polls % 5 == 0 and metrics.enabled() and self.worker is not None:
+            self.metrics_var.set(metrics.summary())
+
+        # a full batch means more is waiting: come back right away
+        self.root.after(10 if len(batch) == config.GUI_LOG_BATCH else 200, self.poll_log_queue)
 
 
 def main():
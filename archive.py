@@ -0,0 +1,170 @@
+# archive.py
+"""
+Raw HTML archive of job detail pages, for re-parsing without a browser.
+
+Every fetched detail page's page_source is compressed (gzip, or zstd with
+`pip install zstandard`) into a content-addressed object store:
+
+    ARCHIVE_DIR/objects/ab/abcdef....html.gz     (sha256 of the HTML)
+    ARCHIVE_DIR/archive.sqlite                   job_id, url, sha256, fetched_at
+
+Identical pages are stored once; every fetch of a job keeps its own index
+row. reparse() rebuilds an output file from the latest snapshot of every
+job with html_parser across a process pool.
+"""
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+import config
+from utils import job_id_from_url
+
+INDEX_FILENAME = "archive.sqlite"
+EXTENSIONS = {"gzip": ".html.gz", "zstd": ".html.zst"}
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def compress(data: bytes, method: str) -> bytes:
+    if method == "zstd":
+        import zstandard
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def read_object(path: str) -> str:
+    """HTML of one archived object (format from the extension)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if path.endswith(EXTENSIONS["zstd"]):
+        import zstandard
+        data = zstandard.ZstdDecompressor().decompress(data)
+    else:
+        data = gzip.decompress(data)
+    return data.decode("utf-8")
+
+
+class HtmlArchive:
+    def __init__(self, root: str = None, compression: str = None):
+        self.root = root or config.ARCHIVE_DIR
+        self.compression = compression or config.ARCHIVE_COMPRESSION
+        if self.compression not in EXTENSIONS:
+            raise ValueError(f"Unknown ARCHIVE_COMPRESSION {self.compression!r} (gzip or zstd)")
+        if self.compression == "zstd":
+            import zstandard  # noqa: F401  (fail at start, not on the first page)
+        os.makedirs(os.path.join(self.root, "objects"), exist_ok=True)
+        # pool workers archive pages from their own threads
+        self._conn = sqlite3.connect(os.path.join(self.root, INDEX_FILENAME), check_same_thread=False)
+        self._lock = threading.Lock()
+        self.pages = 0
+        self.stored_bytes = 0
+        with self._lock, self._conn:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS pages (
+                       job_id     TEXT NOT NULL,
+                       url        TEXT,
+                       sha256     TEXT NOT NULL,
+                       path       TEXT NOT NULL,
+                       fetched_at TEXT NOT NULL,
+                       PRIMARY KEY (job_id, sha256)
+                   )"""
+            )
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join("objects", digest[:2], digest + EXTENSIONS[self.compression])
+
+    def put(self, url: str, page_source: str) -> Optional[str]:
+        """Archive one detail page; returns its sha256 (None for non-job URLs)."""
+        job_id = job_id_from_url(url)
+        if not job_id or not page_source:
+            return None
+        data = page_source.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        rel = self.object_path(digest)
+        path = os.path.join(self.root, rel)
+        new_bytes = 0
+        if not os.path.exists(path):
+            blob = compress(data, self.compression)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(blob)
+            os.replace(tmp, path)
+            new_bytes = len(blob)
+        with self._lock, self._conn:
+            self._conn.execute(
+                """INSERT INTO pages (job_id, url, sha256, path, fetched_at) VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT(job_id, sha256) DO UPDATE SET fetched_at = excluded.fetched_at""",
+                (job_id, url, digest, rel, _now()),
+            )
+            self.pages += 1
+            self.stored_bytes += new_bytes
+        return digest
+
+    def latest(self) -> List[Tuple[str, str, str]]:
+        """(job_id, url, object path) of the newest snapshot of every job, by job id."""
+        with self._lock:
+            rows = self._conn.execute(
+                """SELECT job_id, url, path FROM (
+                       SELECT job_id, url, path, ROW_NUMBER() OVER (
+                           PARTITION BY job_id ORDER BY fetched_at DESC, rowid DESC) AS n
+                       FROM pages)
+                   WHERE n = 1 ORDER BY CAST(job_id AS INTEGER)"""
+            ).fetchall()
+        return [(job_id, url, os.path.join(self.root, path)) for job_id, url, path in rows]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(DISTINCT job_id) FROM pages").fetchone()[0]
+
+    def summary(self) -> str:
+        return f"{self.pages} pages archived ({self.stored_bytes / 1024:.0f} KB of new objects) in {self.root}"
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _parse_object(path: str) -> dict:
+    from html_parser import parse_job_detail_html
+
+    return parse_job_detail_html(read_object(path))
+
+
+def reparse(sink, root: str = None, processes: int = None, log=print) -> int:
+    """
+    Write the latest archived snapshot of every job to `sink`, parsed by
+    html_parser in `processes` worker processes (default: all cores).
+    Snapshots without a job title (block pages) are skipped. Returns the
+    number of rows written.
+    """
+    from records import JobRecord
+
+    archive = HtmlArchive(root)
+    try:
+        entries = archive.latest()
+    finally:
+        archive.close()
+    processes = processes or os.cpu_count()
+    log(f"Re-parsing {len(entries)} archived jobs with {processes} processes...")
+
+    chunksize = max(1, len(entries) // (processes * 4))
+    with ProcessPoolExecutor(max_workers=processes) as ex:
+        parsed_pages = ex.map(_parse_object, [path for _, _, path in entries], chunksize=chunksize)
+        skipped = 0
+        for (_, url, _), parsed in zip(entries, parsed_pages):
+            if not parsed.get("job_name"):
+                skipped += 1
+                continue
+            sink.write(JobRecord.from_parsed(url, parsed))
+    sink.flush()
+    if skipped:
+        log(f"Skipped {skipped} snapshots without a job title.")
+    return sink.count
@@ -0,0 +1,229 @@
+# batch.py
+"""
+Batch runs: many country × classification targets in one process.
+
+Targets come from a file or the CLI. Each target carries its own URLs,
+output file, journal and page window (nothing is written to `config`),
+and BATCH_CONCURRENCY of them crawl at once over one shared DriverManager,
+so browsers launched for one target are reused by the next. Targets are
+ordered round-robin across countries and every country has its own rate
+limiter, so one busy site never starves the others or gets hit by several
+targets at full speed.
+
+Outputs are partitioned as BATCH_OUTPUT_DIR/{country}/{classification}.{ext}.
+"""
+import os
+import threading
+from dataclasses import dataclass
+from itertools import zip_longest
+from typing import Dict, List
+
+import config
+from archive import HtmlArchive
+from crawler import crawl
+from driver_manager import DriverManager
+from journal import RunJournal, journal_path
+from seen_index import SeenIndex, default_index_path
+from sinks import open_sink, resumable
+from throttle import make_rate_limiter
+from utils import build_classification_url
+
+
+@dataclass
+class Target:
+    country: str
+    classification: str
+    base_url: str
+    full_url: str
+    output_file: str
+    status: str = "pending"
+    count: int = 0
+    error: str = None
+    run_id: str = None  # the journal's, for the dataset
+
+    @property
+    def name(self) -> str:
+        return f"{self.country}/{self.classification}"
+
+
+def make_target(country: str, classification: str, output_dir: str = None, fmt: str = None) -> Target:
+    """Validate one target and place its output in the country partition."""
+    country = country.strip().lower()
+    classification = classification.strip().lstrip("/")
+    base_url, route, full_url = build_classification_url(country, classification)
+    output_dir = output_dir or config.BATCH_OUTPUT_DIR
+    fmt = fmt or config.OUTPUT_FORMAT
+    output_file = os.path.join(output_dir, country, f"{route.lstrip('/')}.{fmt}")
+    return Target(country, route.lstrip("/"), base_url, full_url, output_file)
+
+
+def parse_target(spec: str):
+    """'id:jobs-in-accounting', 'id/jobs-in-accounting' or 'id jobs-in-accounting' → (country, classification)."""
+    for sep in (":", "/", ",", None):
+        parts = spec.strip().split(sep, 1)
+        if len(parts) == 2 and parts[0].strip() and parts[1].strip():
+            return parts[0].strip(), parts[1].strip()
+    raise ValueError(f"Bad target {spec!r}: expected COUNTRY:CLASSIFICATION, e.g. id:jobs-in-accounting")
+
+
+def read_targets_file(path: str) -> List[str]:
+    """One target per line; blank lines and # comments are skipped."""
+    with open(path, encoding="utf-8") as f:
+        lines = [line.split("#", 1)[0].strip() for line in f]
+    return [line for line in lines if line]
+
+
+def build_targets(specs: List[str], output_dir: str = None, fmt: str = None) -> List[Target]:
+    """Parse, de-duplicate and order targets round-robin across countries."""
+    by_country: Dict[str, List[Target]] = {}
+    seen = set()
+    for spec in specs:
+        target = make_target(*parse_target(spec), output_dir=output_dir, fmt=fmt)
+        if target.name in seen:
+            continue
+        seen.add(target.name)
+        by_country.setdefault(target.country, []).append(target)
+
+    # id, my, sg, id, my, sg, ... so concurrent slots spread over countries
+    ordered = []
+    for row in zip_longest(*by_country.values()):
+        ordered.extend(t for t in row if t is not None)
+    return ordered
+
+
+class BatchRunner:
+    """Runs targets BATCH_CONCURRENCY at a time over shared drivers."""
+
+    def __init__(self, targets: List[Target], concurrency: int = None, max_pages: int = None,
+                 start_page: int = None, resume: bool = False, stop_event: threading.Event = None,
+                 log=print):
+        self.targets = targets
+        self.concurrency = max(1, concurrency or config.BATCH_CONCURRENCY)
+        self.start_page = config.START_PAGE if start_page is None else start_page
+        self.max_pages = self.start_page - 1 + (max_pages or config.MAX_PAGES_PER_RUN)
+        self.resume = resume
+        self.stop_event = stop_event or threading.Event()
+        self.log = log
+        self.drivers = DriverManager(log=log, max_idle=config.DRIVER_SPARES
+                                     + self.concurrency * config.NUM_WORKERS)
+        self.limiters = {}   # country → rate limiter shared by its targets
+        self.seen = {}       # partition dir → SeenIndex (INCREMENTAL)
+        self.archive = HtmlArchive() if config.ARCHIVE_DIR else None
+        self._lock = threading.Lock()
+
+    def _take(self):
+        with self._lock:
+            # prefer a target whose country is not being crawled right now
+            busy = {t.country for t in self.targets if t.status == "running"}
+            pending = [t for t in self.targets if t.status == "pending"]
+            if not pending:
+                return None
+            target = next((t for t in pending if t.country not in busy), pending[0])
+            target.status = "running"
+            return target
+
+    def _shared(self, target: Target):
+        with self._lock:
+            limiter = self.limiters.get(target.country)
+            if limiter is None:
+                limiter = self.limiters[target.country] = make_rate_limiter()
+            seen = None
+            if config.INCREMENTAL:
+                path = default_index_path(target.output_file)
+                seen = self.seen.get(path)
+                if seen is None:
+                    seen = self.seen[path] = SeenIndex(path)
+            return limiter, seen
+
+    def run_target(self, target: Target):
+        """One target: its own sink and journal, the batch's drivers and country limiter."""
+        log = lambda *args: self.log(f"[{target.name}]", *args)
+        params = dict(full_url=target.full_url, list_only=config.LIST_ONLY)
+        journal = None
+        can_resume = resumable(target.output_file)
+
+        if self.resume and not can_resume:
+            log("Parquet output cannot be resumed, starting over.")
+        elif self.resume:
+            previous = RunJournal.load(journal_path(target.output_file))
+            if previous is not None and previous.matches(**params):
+                if previous.finished:
+                    previous.close()
+                    target.status = "skipped"
+                    log("Already finished in a previous run, skipping.")
+                    return
+                journal = previous
+                log("Resuming previous run.")
+            elif previous is not None:
+                previous.close()
+
+        limiter, seen = self._shared(target)
+        sink = open_sink(target.output_file, append=journal is not None)
+        if journal is None and can_resume:
+            journal = RunJournal.start(journal_path(target.output_file), **params)
+        try:
+            target.count = crawl(target.base_url, target.full_url, sink, self.max_pages,
+                                 num_workers=config.NUM_WORKERS, list_only=config.LIST_ONLY,
+                                 seen=seen, journal=journal, stop_event=self.stop_event, log=log,
+                                 start_page=self.start_page, rate_limiter=limiter,
+                                 drivers=self.drivers, archive=self.archive)
+            if self.stop_event.is_set():
+                target.status = "stopped"
+            else:  # pages or jobs left over (failed, retried out) are finished by a resume
+                target.status = "done" if journal is None or journal.finished else "partial"
+            target.run_id = journal.run_id if journal is not None else None
+            log(f"Saved {target.count} rows to {target.output_file}")
+        finally:
+            sink.close()
+            if journal is not None:
+                journal.close()
+
+    def _work(self):
+        while not self.stop_event.is_set():
+            target = self._take()
+            if target is None:
+                return
+            try:
+                self.run_target(target)
+            except Exception as e:
+                target.status, target.error = "failed", repr(e)
+                self.log(f"[{target.name}] ERROR:", repr(e))
+
+    def run(self) -> List[Target]:
+        self.log(f"Batch: {len(self.targets)} targets, {self.concurrency} at a time, "
+                 f"countries {', '.join(sorted({t.country for t in self.targets}))}")
+        threads = [threading.Thread(target=self._work, daemon=True)
+                   for _ in range(min(self.concurrency, len(self.targets)))]
+        try:
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            self.drivers.close()
+            for seen in self.seen.values():
+                seen.close()
+            if self.archive is not None:
+                self.archive.close()
+
+        self.log("Drivers:", self.drivers.summary())
+        if self.drivers.proxies is not None:
+            self.log("Proxies:", self.drivers.proxies.summary())
+        if self.archive is not None:
+            self.log("Archive:", self.archive.summary())
+        for country, limiter in sorted(self.limiters.items()):
+            self.log(f"Throttle [{country}]:", limiter.summary())
+        return self.targets
+
+
+def summary(targets: List[Target]) -> str:
+    lines = [f"{t.name:<60} {t.status:<8} {t.count:>6}  {t.error or t.output_file}" for t in targets]
+    total = sum(t.count for t in targets)
+    lines.append(f"{len(targets)} targets, {total} rows")
+    return "\n".join(lines)
+
+
+def run_batch(specs: List[str], output_dir: str = None, fmt: str = None, **kwargs) -> List[Target]:
+    """Build targets from specs and run them; returns the targets with status and counts."""
+    targets = build_targets(specs, output_dir=output_dir, fmt=fmt)
+    return BatchRunner(targets, **kwargs).run()
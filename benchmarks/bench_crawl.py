@@ -0,0 +1,157 @@
+# benchmarks/bench_crawl.py
+"""
+End-to-end crawl scenarios against the local stand-in, no browser, no
+delays: scrape_classification (CLI path) and ScrapeWorker (GUI path) with
+replay drivers plugged in through config.DRIVER_FACTORY (and the HTTP
+detail client through config.HTTP_SESSION_FACTORY).
+
+Per scenario: jobs/sec, WebDriver round trips per job, HTTP requests,
+peak Python memory (tracemalloc, which also slows the run a little),
+driver launches, the mean driver restart time and the cookieless first
+visits the stand-in held back (warm-ups, in the session scenarios).
+
+    python -m benchmarks.bench_crawl [pages] [round_trip_ms] [launch_ms]
+"""
+import contextlib
+import csv
+import io
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import config
+import metrics
+from benchmarks.replay_driver import ReplayFactory
+from benchmarks.standin_server import FIXTURE_ROUTE, StandIn
+
+CLASSIFICATION = FIXTURE_ROUTE.lstrip("/")
+
+ZERO_DELAYS = {
+    "DELAY_MIN": 0, "DELAY_MAX": 0, "SCROLL_PAUSE": 0, "GLOBAL_MIN_INTERVAL": 0,
+    "ADAPTIVE_THROTTLE": False, "INCREMENTAL": False, "START_PAGE": 1,
+}
+
+RESTART = {"PARSER_MODE": "js", "RESTART_EVERY": 5, "DELAY_MIN": 0.05, "DELAY_MAX": 0.05}
+
+# name, config overrides, runner, stand-in options, launch cost applies
+SCENARIOS = [
+    ("cli selenium", {"PARSER_MODE": "selenium"}, "cli", {}, False),
+    ("cli js", {"PARSER_MODE": "js"}, "cli", {}, False),
+    ("cli html", {"PARSER_MODE": "html"}, "cli", {}, False),
+    ("cli js, 2 workers", {"PARSER_MODE": "js", "NUM_WORKERS": 2}, "cli", {}, False),
+    ("cli js, pipeline", {"PARSER_MODE": "js", "NUM_WORKERS": 2, "PIPELINE": True}, "cli", {}, False),
+    ("cli url pages, list-only", {"PARSER_MODE": "js", "PAGINATION_MODE": "url", "LIST_ONLY": True},
+     "cli", {}, False),
+    ("gui worker js", {"PARSER_MODE": "js"}, "gui", {}, False),
+    # 50 ms per job so a spare has time to launch between restarts, as it would at real pace
+    ("restarts, cold", {**RESTART, "DRIVER_SPARES": 0}, "cli", {}, True),
+    ("restarts, warm spare", {**RESTART, "DRIVER_SPARES": 1}, "cli", {}, True),
+    # every fresh browser pays a 300 ms warm-up unless it starts with the saved session
+    ("restarts, cold sessions", {**RESTART, "DRIVER_SPARES": 1}, "cli", {"warmup_ms": 300}, True),
+    ("restarts, session reuse", {**RESTART, "DRIVER_SPARES": 1, "SESSION_REUSE": True}, "cli",
+     {"warmup_ms": 300}, True),
+    ("block pages (1 in 5)", {"PARSER_MODE": "js"}, "cli", {"block_every": 5}, False),
+    ("http details", {"PARSER_MODE": "js", "HTTP_DETAILS": True}, "cli", {}, False),
+    ("http details, pipeline", {"PARSER_MODE": "js", "HTTP_DETAILS": True, "PIPELINE": True},
+     "cli", {}, False),
+    ("http details, blocks (1 in 5)", {"PARSER_MODE": "js", "HTTP_DETAILS": True}, "cli",
+     {"block_every": 5}, False),
+]
+
+DEFAULTS = {key: getattr(config, key) for key in
+            set(ZERO_DELAYS) | {k for _, o, _, _, _ in SCENARIOS for k in o}
+            | {"MAX_PAGES_PER_RUN", "DRIVER_FACTORY", "PAGINATION_MODE", "PIPELINE", "LIST_ONLY",
+               "NUM_WORKERS", "RESTART_EVERY", "DRIVER_SPARES", "HTTP_DETAILS",
+               "HTTP_SESSION_FACTORY", "METRICS_FILE", "COOKIES_FILE"}}
+
+
+def run_cli(output_file: str) -> int:
+    from crawler import scrape_classification
+    from sinks import open_sink
+
+    with open_sink(output_file) as sink:
+        return scrape_classification("id", CLASSIFICATION, sink=sink)
+
+
+def run_gui(output_file: str) -> int:
+    from app_gui import ScrapeWorker
+    from utils import build_classification_url
+
+    base_url, route, _ = build_classification_url("id", CLASSIFICATION)
+    ScrapeWorker(base_url, route, config.MAX_PAGES_PER_RUN, output_file, queue.Queue(),
+                 threading.Event(), num_workers=config.NUM_WORKERS,
+                 list_only=config.LIST_ONLY).run()
+    with open(output_file, encoding="utf-8-sig", newline="") as f:
+        return sum(1 for _ in csv.DictReader(f))
+
+
+RUNNERS = {"cli": run_cli, "gui": run_gui}
+
+
+def run_scenario(name, overrides, runner, standin_options, pages, round_trip_ms, launch_ms):
+    for key, value in {**DEFAULTS, **ZERO_DELAYS, **overrides}.items():
+        setattr(config, key, value)
+    config.MAX_PAGES_PER_RUN = pages
+
+    with StandIn(pages=pages, **standin_options) as standin, tempfile.TemporaryDirectory() as tmp:
+        factory = ReplayFactory(standin.url, round_trip_ms=round_trip_ms,
+                                launch_seconds=launch_ms / 1000.0 if launch_ms else 0.0)
+        config.DRIVER_FACTORY = factory
+        config.HTTP_SESSION_FACTORY = factory.http_session
+        config.METRICS_FILE = os.path.join(tmp, "metrics.json")  # the run's export, not the repo's
+        config.COOKIES_FILE = os.path.join(tmp, "cookies.pkl")
+        metrics.reset()
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):  # the crawl's own log
+            jobs = RUNNERS[runner](os.path.join(tmp, "results.csv"))
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert jobs == standin.total_jobs, f"{name}: {jobs} jobs, expected {standin.total_jobs}"
+        restart = metrics.REGISTRY.snapshot()["timers"].get("driver_restart")
+        return {
+            "scenario": name,
+            "jobs": jobs,
+            "jobs_per_s": jobs / elapsed,
+            "rt_per_job": factory.round_trips / jobs,
+            "http": sum(n for kind, n in standin.requests.items() if kind != "warmup"),
+            "peak_mb": peak / 1024 / 1024,
+            "launches": factory.launches,
+            "restart_ms": restart["mean"] * 1000 if restart else 0.0,
+            "leaked": factory.leaked(),
+            "warmups": standin.requests.get("warmup", 0),
+        }
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    round_trip_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+    launch_ms = float(sys.argv[3]) if len(sys.argv) > 3 else 200.0
+
+    metrics.set_enabled(True)
+    print(f"{pages} list pages x 8 jobs, {round_trip_ms} ms per WebDriver round trip, "
+          f"{launch_ms:.0f} ms per driver launch in the restart scenarios\n")
+    print(f"{'scenario':<30} {'jobs':>5} {'jobs/s':>8} {'rt/job':>7} {'http':>5} "
+          f"{'peak MB':>8} {'launch':>6} {'restart ms':>10} {'warm-ups':>8}")
+    try:
+        for name, overrides, runner, standin_options, uses_launch in SCENARIOS:
+            row = run_scenario(name, overrides, runner, standin_options, pages, round_trip_ms,
+                               launch_ms if uses_launch else 0.0)
+            assert row["leaked"] == 0, f"{name}: {row['leaked']} drivers never quit"
+            print(f"{row['scenario']:<30} {row['jobs']:>5} {row['jobs_per_s']:>8.1f} "
+                  f"{row['rt_per_job']:>7.1f} {row['http']:>5} {row['peak_mb']:>8.2f} "
+                  f"{row['launches']:>6} {row['restart_ms']:>10.1f} {row['warmups']:>8}")
+    finally:
+        for key, value in DEFAULTS.items():
+            setattr(config, key, value)
+
+
+if __name__ == "__main__":
+    main()
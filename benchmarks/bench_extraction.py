@@ -0,0 +1,122 @@
+# benchmarks/bench_extraction.py
+"""
+Per-element vs single execute_script extraction, on a recording fake driver.
+
+Every WebDriver command on a real chromedriver is one HTTP round trip; the
+fake driver counts them and sleeps ROUND_TRIP_MS for each.
+
+    python -m benchmarks.bench_extraction [cards] [round_trip_ms]
+"""
+import json
+import sys
+import time
+
+from selenium.common.exceptions import NoSuchElementException
+
+import parser as job_parser
+
+ROUND_TRIP_MS = 1.5
+
+
+class RecordingElement:
+    def __init__(self, driver, text="", href=None, link=None):
+        self._driver = driver
+        self._text = text
+        self._href = href
+        self._link = link
+
+    @property
+    def text(self):
+        self._driver.record("element.text")
+        return self._text
+
+    def get_attribute(self, name):
+        self._driver.record("element.get_attribute")
+        return self._href if name == "href" else None
+
+    def find_element(self, by, value):
+        self._driver.record("element.find_element")
+        if self._link is None:
+            raise NoSuchElementException(value)
+        return self._link
+
+
+class RecordingFakeDriver:
+    """Fake WebDriver serving one list page and one detail page."""
+
+    def __init__(self, cards: int = 30, round_trip_ms: float = ROUND_TRIP_MS):
+        self.round_trip = round_trip_ms / 1000.0
+        self.calls = {}
+        self.hrefs = [f"/job/{80000000 + i}?type=standard" for i in range(cards)]
+        self.fields = {
+            "job_name": "  Senior Data Engineer ",
+            "company_name": "PT Contoh Teknologi",
+            "work_type": "Full time",
+            "salary_range": "Rp 8.000.000 – Rp 12.000.000 per month",
+        }
+
+    def record(self, command: str):
+        self.calls[command] = self.calls.get(command, 0) + 1
+        time.sleep(self.round_trip)
+
+    @property
+    def round_trips(self) -> int:
+        return sum(self.calls.values())
+
+    def reset(self):
+        self.calls = {}
+
+    def find_elements(self, by, value):
+        self.record("find_elements")
+        if value == job_parser.JOBCARD_XPATH:
+            return [RecordingElement(self, link=RecordingElement(self, href=h)) for h in self.hrefs]
+        return []
+
+    def find_element(self, by, value):
+        self.record("find_element")
+        for key, xpath in job_parser.DETAIL_FIELD_XPATHS.items():
+            if value == xpath:
+                return RecordingElement(self, text=self.fields[key])
+        raise NoSuchElementException(value)
+
+    def execute_script(self, script, *args):
+        self.record("execute_script")
+        if script == job_parser.LINKS_JS:
+            return json.dumps(self.hrefs)
+        if script == job_parser.DETAIL_JS:
+            return json.dumps(self.fields)
+        return None
+
+
+def measure(label: str, driver: RecordingFakeDriver, fn, repeat: int = 20):
+    driver.reset()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    trips = driver.round_trips / repeat
+    print(f"{label:<28} {trips:>8.0f} round trips {elapsed * 1000:>9.2f} ms/page")
+    return result
+
+
+def main():
+    cards = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    rtt = float(sys.argv[2]) if len(sys.argv) > 2 else ROUND_TRIP_MS
+    driver = RecordingFakeDriver(cards, rtt)
+    base_url = "https://id.jobstreet.com"
+
+    print(f"List page ({cards} cards, {rtt} ms per round trip)")
+    a = measure("  selenium per-element", driver,
+                lambda: job_parser.extract_links_from_list_page(driver, base_url))
+    b = measure("  js single round trip", driver,
+                lambda: job_parser.extract_links_js(driver, base_url))
+    assert a == b, "link extraction modes disagree"
+
+    print("Detail page")
+    a = measure("  selenium per-element", driver, lambda: job_parser.parse_job_detail(driver))
+    b = measure("  js single round trip", driver, lambda: job_parser.parse_job_detail_js(driver))
+    assert a == b, "detail extraction modes disagree"
+
+
+if __name__ == "__main__":
+    main()
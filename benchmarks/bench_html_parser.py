@@ -0,0 +1,87 @@
+# benchmarks/bench_html_parser.py
+"""
+lxml page_source backend vs the Selenium per-element path, plus bulk
+re-parsing of saved HTML serially vs across a process pool.
+
+    python -m benchmarks.bench_html_parser [pages] [processes]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import html_parser
+import parser as job_parser
+from benchmarks.bench_extraction import RecordingFakeDriver
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+BASE_URL = "https://id.jobstreet.com"
+
+EXPECTED_DETAIL = {
+    "job_name": "Senior Data Engineer",
+    "company_name": "PT Contoh Teknologi",
+    "work_type": "Full time",
+    "salary_range": "Rp 15.000.000 – Rp 22.000.000 per month",
+}
+
+
+def load_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def timed(fn, repeat: int = 1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat
+
+
+def check_fixtures():
+    list_html = load_fixture("list_page.html")
+    detail_html = load_fixture("detail_page.html")
+
+    links = html_parser.extract_links_from_html(list_html, BASE_URL)
+    assert len(links) == 8, links
+    assert links[0].startswith(BASE_URL + "/job/80112233"), links[0]
+
+    parsed = html_parser.parse_job_detail_html(detail_html)
+    assert parsed == EXPECTED_DETAIL, parsed
+    assert list(parsed) == list(job_parser.DETAIL_FIELD_XPATHS), "dict shape differs from parse_job_detail"
+    print("fixtures OK")
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    check_fixtures()
+
+    detail_html = load_fixture("detail_page.html")
+
+    # per page: Selenium pays one round trip per field, lxml one page_source transfer
+    driver = RecordingFakeDriver()
+    _, selenium_t = timed(lambda: job_parser.parse_job_detail(driver), repeat=50)
+    _, lxml_t = timed(lambda: html_parser.parse_job_detail_html(detail_html), repeat=200)
+    print(f"detail page  selenium per-element {selenium_t * 1000:8.2f} ms "
+          f"({driver.round_trips // 50} round trips)")
+    print(f"detail page  lxml over page_source {(lxml_t + driver.round_trip) * 1000:7.2f} ms "
+          f"(1 round trip + {lxml_t * 1000:.2f} ms parse)")
+
+    # bulk re-parse of saved HTML files (workers read the files themselves)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(pages):
+            path = os.path.join(tmp, f"{i}.html")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(detail_html)
+            paths.append(path)
+
+        serial, serial_t = timed(lambda: [html_parser._parse_detail_file(p) for p in paths])
+        pooled, pooled_t = timed(lambda: html_parser.parse_detail_files_parallel(paths, processes=processes))
+    assert serial == pooled
+    print(f"{pages} pages serial          {serial_t:8.2f} s  ({pages / serial_t:8.0f} pages/s)")
+    print(f"{pages} pages {processes} processes     {pooled_t:8.2f} s  ({pages / pooled_t:8.0f} pages/s)")
+
+
+if __name__ == "__main__":
+    main()
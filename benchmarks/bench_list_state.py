@@ -0,0 +1,63 @@
+# benchmarks/bench_list_state.py
+"""
+List-only mode against the saved list-page fixture: state parsing cost and
+page loads for a run compared with visiting every detail page.
+
+    python -m benchmarks.bench_list_state [pages]
+"""
+import sys
+import time
+
+import config
+import list_state
+from benchmarks.bench_html_parser import BASE_URL, load_fixture
+from crawler import extract_jobs
+
+
+class PageSourceDriver:
+    """Driver stand-in whose JS context has no state, forcing the HTML path."""
+
+    def __init__(self, page_source: str):
+        self.page_source = page_source
+
+    def execute_script(self, script, *args):
+        return None
+
+
+def check_fixture(list_html: str):
+    jobs = extract_jobs(PageSourceDriver(list_html), BASE_URL)
+    assert len(jobs) == 8, jobs
+    assert jobs[0] == {
+        "job_name": "Senior Data Engineer",
+        "company_name": "PT Contoh Teknologi",
+        "work_type": "Full time",
+        "salary_range": "Rp 15.000.000 – Rp 22.000.000 per month",
+        "link": BASE_URL + "/job/80112233",
+    }, jobs[0]
+    assert list_state.total_count(list_state.extract_state(list_html)) == 160
+    print("fixture OK")
+    return jobs
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    list_html = load_fixture("list_page.html")
+    jobs = check_fixture(list_html)
+
+    start = time.perf_counter()
+    for _ in range(200):
+        list_state.jobs_from_state(list_state.extract_state(list_html), BASE_URL)
+    per_page = (time.perf_counter() - start) / 200
+
+    incomplete = [j for j in jobs if list_state.missing_fields(j, config.LIST_ONLY_REQUIRED_FIELDS)]
+    detail_loads = pages + pages * len(jobs)
+    list_only_loads = pages + pages * len(incomplete)
+
+    print(f"state parse: {per_page * 1000:.3f} ms per list page")
+    print(f"{pages} pages x {len(jobs)} cards, {len(incomplete)} per page need a detail visit")
+    print(f"page loads  detail mode {detail_loads:6d}")
+    print(f"page loads  list-only   {list_only_loads:6d}  ({detail_loads / list_only_loads:.1f}x fewer)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# benchmarks/bench_nav_policy.py
+"""
+Navigation policy against the local stand-in: hung detail pages with and
+without a page-load timeout, pages that hang for good, and removed
+postings, each crawled twice (the second run starts from the first run's
+dead letters). Removed postings are dead-lettered right away; a page that
+timed out in one run only is retried by the next (DEAD_LETTER_TIMEOUT_RUNS).
+
+Per scenario: rows written, wall time, detail requests, retries and
+dead-lettered pages of the first run, then the second run's detail
+requests.
+
+    python -m benchmarks.bench_nav_policy [pages] [stall_s]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import config
+import metrics
+from benchmarks.bench_crawl import DEFAULTS, ZERO_DELAYS, run_cli
+from benchmarks.replay_driver import ReplayFactory
+from benchmarks.standin_server import StandIn, job_id
+from nav_policy import DeadLetters, dead_letter_path
+
+SETTINGS = {"PARSER_MODE": "js", "NUM_WORKERS": 2, "RETRY_BACKOFF": 0.1, "DEAD_LETTERS": True}
+SAVED = ("PAGE_LOAD_TIMEOUT", "RETRY_BACKOFF", "DEAD_LETTERS")
+
+# name, page-load timeout, stalled visits per affected job, closed postings
+SCENARIOS = [
+    ("hung once, no timeout", 60.0, 1, False),
+    ("hung once, 0.5 s timeout", 0.5, 1, False),
+    ("hung for good, 0.5 s timeout", 0.5, 10 ** 6, False),
+    ("removed postings", 60.0, 0, True),
+]
+
+
+def crawl_once(standin, tmp: str) -> dict:
+    factory = ReplayFactory(standin.url)
+    config.DRIVER_FACTORY = factory
+    before = standin.requests.get("detail", 0) + standin.requests.get("closed", 0)
+    metrics.reset()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        rows = run_cli(os.path.join(tmp, "results.csv"))
+    elapsed = time.perf_counter() - start
+    assert factory.leaked() == 0
+    counters = metrics.REGISTRY.snapshot()["counters"]
+    return {"rows": rows, "seconds": elapsed,
+            "requests": standin.requests.get("detail", 0) + standin.requests.get("closed", 0) - before,
+            "retries": sum(n for name, n in counters.items() if name.startswith("retries_"))}
+
+
+def run(pages: int, stall: float, timeout: float, stalls: int, closed: bool) -> dict:
+    for key, value in {**DEFAULTS, **ZERO_DELAYS, **SETTINGS}.items():
+        setattr(config, key, value)
+    config.MAX_PAGES_PER_RUN = pages
+    config.PAGE_LOAD_TIMEOUT = timeout
+
+    with StandIn(pages=pages) as standin, tempfile.TemporaryDirectory() as tmp:
+        config.METRICS_FILE = os.path.join(tmp, "metrics.json")
+        affected = [job_id(page, 3) for page in range(1, pages + 1)]  # one job per list page
+        standin.stall_seconds = stall
+        if stalls:
+            standin.stalled_jobs = {jid: stalls for jid in affected}
+        if closed:
+            standin.closed_jobs = set(affected)
+
+        first = crawl_once(standin, tmp)
+        standin.stalled_jobs = {}  # the second run would not hit them anymore
+        second = crawl_once(standin, tmp)
+        first["dead"] = len(DeadLetters(dead_letter_path(os.path.join(tmp, "results.csv"))))
+        first["second_requests"] = second["requests"]
+        return first
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    stall = float(sys.argv[2]) if len(sys.argv) > 2 else 3.0
+    saved = {key: getattr(config, key) for key in SAVED}
+    metrics.set_enabled(True)
+    print(f"{pages} list pages x 8 jobs, 1 affected job per page, hung pages answer after {stall:g} s\n")
+    print(f"{'scenario':<30} {'rows':>5} {'seconds':>8} {'requests':>9} {'retries':>8} "
+          f"{'dead':>5} {'2nd run requests':>17}")
+    try:
+        for name, timeout, stalls, closed in SCENARIOS:
+            r = run(pages, stall, timeout, stalls, closed)
+            print(f"{name:<30} {r['rows']:>5} {r['seconds']:>8.1f} {r['requests']:>9} "
+                  f"{r['retries']:>8} {r['dead']:>5} {r['second_requests']:>17}")
+    finally:
+        for key, value in {**DEFAULTS, **saved}.items():
+            setattr(config, key, value)
+
+
+if __name__ == "__main__":
+    main()
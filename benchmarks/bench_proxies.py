@@ -0,0 +1,90 @@
+# benchmarks/bench_proxies.py
+"""
+Proxy rotation against the local stand-in, through forwarding-proxy
+stand-ins: one fast proxy with auth, one slow, one whose exit IP is banned
+(job pages come back as block pages).
+
+The crawl runs with health-weighted selection (proxy_pool) and with a
+uniform draw (every weight 1, quarantine off) for comparison. Per mode:
+jobs scraped (a job still blocked after one session rotation is skipped),
+jobs/s, block pages hit, driver launches, and requests through each proxy.
+
+    python -m benchmarks.bench_proxies [pages] [slow_ms]
+"""
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from unittest import mock
+
+import config
+import proxy_pool
+from benchmarks.bench_crawl import DEFAULTS, ZERO_DELAYS, run_cli
+from benchmarks.proxy_standin import ProxyStandIn
+from benchmarks.replay_driver import ReplayFactory
+from benchmarks.standin_server import StandIn
+
+SETTINGS = {
+    "PARSER_MODE": "js", "NUM_WORKERS": 3, "DRIVER_SPARES": 1, "RESTART_EVERY": 4,  # many launches
+    "PROXY_MAX_SESSIONS": 2, "PROXY_MIN_INTERVAL": 0.0, "PROXY_MAX_FAILURES": 3,
+    "PROXY_QUARANTINE_SECONDS": 60,
+}
+SAVED = ("PROXIES", "PROXY_MAX_SESSIONS", "PROXY_MIN_INTERVAL", "PROXY_MAX_FAILURES",
+         "PROXY_QUARANTINE_SECONDS")
+
+
+def run(pages: int, slow_ms: float, weighted: bool) -> dict:
+    for key, value in {**DEFAULTS, **ZERO_DELAYS, **SETTINGS}.items():
+        setattr(config, key, value)
+    config.MAX_PAGES_PER_RUN = pages
+    if not weighted:
+        config.PROXY_MAX_FAILURES = 10 ** 9
+
+    with StandIn(pages=pages) as standin, \
+            ProxyStandIn(username="scraper", password="s3cret") as fast, \
+            ProxyStandIn(latency_ms=slow_ms) as slow, \
+            ProxyStandIn(banned=True) as banned, \
+            tempfile.TemporaryDirectory() as tmp:
+        config.PROXIES = [fast.spec, slow.spec, banned.spec]
+        factory = ReplayFactory(standin.url)
+        config.DRIVER_FACTORY = factory
+        config.HTTP_SESSION_FACTORY = factory.http_session
+
+        uniform = mock.patch.object(proxy_pool.Proxy, "weight", lambda self: 1.0)
+        patch = contextlib.nullcontext() if weighted else uniform
+        random.seed(0)
+        start = time.perf_counter()
+        with patch, contextlib.redirect_stdout(io.StringIO()):
+            jobs = run_cli(os.path.join(tmp, "results.csv"))
+        elapsed = time.perf_counter() - start
+
+        assert fast.auth_failures == 0, "proxy auth was not sent"
+        assert factory.leaked() == 0
+        return {"jobs": f"{jobs}/{standin.total_jobs}", "jobs_per_s": jobs / elapsed,
+                "blocks": standin.requests.get("block", 0), "launches": factory.launches,
+                "through": (fast.requests, slow.requests, banned.requests)}
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    slow_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 40.0
+    saved = {key: getattr(config, key) for key in SAVED}
+    print(f"{pages} list pages x 8 jobs, 3 proxies: fast (auth), slow (+{slow_ms:.0f} ms), banned\n")
+    print(f"{'selection':<16} {'jobs':>6} {'jobs/s':>7} {'blocks':>7} {'launches':>9} "
+          f"{'fast/slow/banned requests':>26}")
+    try:
+        for name, weighted in (("health-weighted", True), ("uniform", False)):
+            r = run(pages, slow_ms, weighted)
+            through = "/".join(str(n) for n in r["through"])
+            print(f"{name:<16} {r['jobs']:>6} {r['jobs_per_s']:>7.1f} {r['blocks']:>7} "
+                  f"{r['launches']:>9} {through:>26}")
+    finally:
+        for key, value in {**DEFAULTS, **saved}.items():
+            setattr(config, key, value)
+
+
+if __name__ == "__main__":
+    main()
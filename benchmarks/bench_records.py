@@ -0,0 +1,95 @@
+# benchmarks/bench_records.py
+"""
+Memory and conversion cost of holding scraped jobs, per layout:
+
+- list of row dicts: one {column: value} dict per job (the old sink batch
+  and make_row output)
+- parallel lists: five lists of values (the old in-memory result)
+- list of JobRecord: one slotted record per job
+- RecordBatch: one list per column (what the sinks buffer now)
+
+Memory is what each container adds on top of the value strings (shared by
+all layouts), measured with tracemalloc. Conversion is to an Arrow table
+and a pandas DataFrame.
+
+    python -m benchmarks.bench_records [records]
+"""
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+import pyarrow as pa
+
+from records import COLUMNS, JobRecord, RecordBatch
+
+
+def make_values(n: int):
+    """Distinct strings per job, like scraped pages give."""
+    return [(f"Data Engineer {i}", f"PT Contoh {i % 500}", "Full time",
+             f"Rp {5 + i % 20}.000.000 – Rp {10 + i % 30}.000.000 per month",
+             f"https://id.jobstreet.com/job/{81000000 + i}") for i in range(n)]
+
+
+def as_dicts(values):
+    return [dict(zip(COLUMNS, v)) for v in values]
+
+
+def as_parallel_lists(values):
+    columns = {col: [] for col in COLUMNS}
+    for v in values:
+        for col, x in zip(COLUMNS, v):
+            columns[col].append(x)
+    return columns
+
+
+def as_records(values):
+    return [JobRecord(*v) for v in values]
+
+
+def as_batch(values):
+    batch = RecordBatch()
+    for v in values:
+        batch.append(JobRecord(*v))
+    return batch
+
+
+LAYOUTS = [
+    ("list of row dicts", as_dicts, lambda rows: pa.Table.from_pylist(rows), lambda rows: pd.DataFrame(rows)),
+    ("parallel lists", as_parallel_lists, lambda cols: pa.Table.from_pydict(cols), lambda cols: pd.DataFrame(cols)),
+    ("list of JobRecord", as_records, None, None),
+    ("RecordBatch", as_batch, lambda batch: batch.to_arrow(), lambda batch: batch.to_pandas()),
+]
+
+
+def measure(build, values):
+    tracemalloc.start()
+    held = build(values)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return held, size
+
+
+def timed(fn, arg):
+    start = time.perf_counter()
+    fn(arg)
+    return time.perf_counter() - start
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    values = make_values(n)
+    payload = sum(sys.getsizeof(x) for v in values for x in v)
+    print(f"{n:,} records, value strings {payload / 1024 / 1024:.1f} MB (not counted below)\n")
+    print(f"{'layout':<20} {'MB':>7} {'bytes/rec':>10} {'to arrow ms':>12} {'to pandas ms':>13}")
+
+    for name, build, to_arrow, to_pandas in LAYOUTS:
+        held, size = measure(build, values)
+        arrow_ms = f"{timed(to_arrow, held) * 1000:.1f}" if to_arrow else "-"
+        pandas_ms = f"{timed(to_pandas, held) * 1000:.1f}" if to_pandas else "-"
+        print(f"{name:<20} {size / 1024 / 1024:>7.1f} {size / n:>10.0f} {arrow_ms:>12} {pandas_ms:>13}")
+        del held
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# benchmarks/bench_salary.py
+"""
+Salary normalization over synthetic salary labels in the formats seen on
+id/my/sg/ph listings:
+
+- row by row: one regex pass per row in Python (what df.apply would do)
+- vectorized: salary.parse_labels over every row
+- vectorized + factorize: salary.normalize_salaries (each distinct label once)
+
+The row-by-row reference must agree with the vectorized output.
+
+    python -m benchmarks.bench_salary [rows] [distinct_labels]
+"""
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import salary
+
+TEMPLATES = [
+    "Rp {lo:,.0f} – Rp {hi:,.0f} per month",
+    "Rp {lo_m:g} jt – Rp {hi_m:g} jt per month",
+    "Rp {lo_m:g} – {hi_m:g} jt",
+    "RM {lo_k:,.0f} - RM {hi_k:,.0f} per month",
+    "RM{lo_k:,.0f} – RM{hi_k:,.0f} monthly",
+    "S$ {lo_k:,.0f} - {hi_k:,.0f}",
+    "₱{lo_k:,.0f} – ₱{hi_k:,.0f} per month",
+    "${lo_h} - ${hi_h} per hour",
+    "${lo_y}k – ${hi_y}k per year",
+    "Up to RM {hi_k:,.0f}",
+    "Rp {lo:,.0f} per month",
+]
+
+_NUMBER = re.compile(salary.NUMBER_RE)
+_THOUSANDS = re.compile(salary.THOUSANDS_RE)
+_UP_TO = re.compile(salary.UP_TO_RE)
+_FROM = re.compile(salary.FROM_RE)
+_CURRENCY = [(re.compile(p), v) for p, v in salary.CURRENCY_PATTERNS]
+_PERIOD = [(re.compile(p), v) for p, v in salary.PERIOD_PATTERNS]
+
+
+def make_labels(rows: int, distinct: int, seed: int = 7) -> pd.Series:
+    """`rows` labels drawn from `distinct` generated ones (Indonesian thousands dots)."""
+    rng = np.random.default_rng(seed)
+    labels = []
+    for i in range(distinct):
+        lo_m = int(rng.integers(3, 300))
+        hi_m = lo_m + int(rng.integers(1, 15))
+        values = dict(lo=lo_m * 1e6, hi=hi_m * 1e6, lo_m=lo_m, hi_m=hi_m, lo_k=lo_m * 500,
+                      hi_k=hi_m * 500, lo_h=lo_m + 10, hi_h=hi_m + 10, lo_y=lo_m * 5, hi_y=hi_m * 5)
+        label = TEMPLATES[i % len(TEMPLATES)].format(**values)
+        if label.startswith("Rp"):
+            label = label.replace(",", ".")
+        labels.append(label)
+    labels.append(None)  # no salary shown
+    picks = rng.integers(0, len(labels), rows)
+    return pd.Series(np.array(labels, dtype=object)[picks])
+
+
+def _first(text, patterns):
+    for pattern, value in patterns:
+        if pattern.search(text):
+            return value
+    return None
+
+
+def _number(number, suffix):
+    value = float(_THOUSANDS.sub("", number).replace(",", "."))
+    return value * salary.MULTIPLIERS.get(suffix, 1.0)
+
+
+def parse_label(label, country=None):
+    """Row-by-row reference with the same rules as salary.parse_labels."""
+    if not isinstance(label, str):
+        return (np.nan, np.nan, None, None)
+    text = label.lower()
+    found = _NUMBER.findall(text)[:2]
+    low = high = np.nan
+    if found:
+        low = _number(*found[0])
+    if len(found) > 1:
+        high = _number(*found[1])
+        scale = salary.MULTIPLIERS.get(found[1][1], 1.0)
+        if not found[0][1] and scale > 1 and low * scale <= high:
+            low *= scale
+    if np.isnan(high):
+        high = low
+    if _UP_TO.search(text) and not np.isnan(high) and low == high:
+        low = np.nan
+    if _FROM.search(text) and low == high:
+        high = np.nan
+    currency = _first(text, _CURRENCY)
+    if currency == "$":
+        currency = salary.COUNTRY_DOLLAR.get(country, "USD")
+    if currency is None and country in salary.COUNTRY_CURRENCY and not (np.isnan(low) and np.isnan(high)):
+        currency = salary.COUNTRY_CURRENCY[country]
+    return (low, high, currency, _first(text, _PERIOD))
+
+
+def row_by_row(labels: pd.Series) -> pd.DataFrame:
+    return pd.DataFrame([parse_label(label) for label in labels], columns=salary.SALARY_COLUMNS)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - start
+
+
+def check(reference: pd.DataFrame, result: pd.DataFrame):
+    for col in salary.SALARY_COLUMNS[:2]:
+        assert np.allclose(reference[col], result[col], equal_nan=True), col
+    for col in salary.SALARY_COLUMNS[2:]:
+        expected = reference[col].astype(object).fillna("")
+        assert (expected == result[col].astype(object).fillna("")).all(), col
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    distinct = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    labels = make_labels(rows, distinct)
+    print(f"{rows:,} rows, {labels.nunique():,} distinct labels")
+
+    reference, t_rows = timed(row_by_row, labels)
+    plain, t_plain = timed(salary.parse_labels, labels)
+    factorized, t_fact = timed(salary.normalize_salaries, labels)
+    check(reference, plain)
+    check(reference, factorized)
+    print("results agree")
+
+    print(f"{'method':<26} {'seconds':>8} {'rows/s':>12} {'speedup':>8}")
+    for name, seconds in [("row by row", t_rows), ("vectorized", t_plain),
+                          ("vectorized + factorize", t_fact)]:
+        print(f"{name:<26} {seconds:>8.2f} {rows / seconds:>12,.0f} {t_rows / seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
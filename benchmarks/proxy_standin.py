@@ -0,0 +1,120 @@
+# benchmarks/proxy_standin.py
+"""
+Local forwarding HTTP proxy for proxy_pool tests: plain-HTTP requests with
+an absolute URL are forwarded as they are (redirects and error pages passed
+through), optionally behind Basic proxy auth.
+
+Knobs, settable while it runs:
+- latency_ms: added to every request (a slow exit)
+- banned: every job page is answered with the target's /blocked page (an
+  exit IP the site has blocked)
+- down: every request gets a 502
+
+    with ProxyStandIn(username="u", password="p") as proxy:
+        config.PROXIES = [proxy.spec]
+"""
+import base64
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, urlunsplit
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None  # hand 3xx back to the client
+
+
+_OPENER = urllib.request.build_opener(urllib.request.ProxyHandler({}), _NoRedirect)
+
+
+class ProxyStandIn:
+    """Threaded forwarding proxy on 127.0.0.1; use as a context manager."""
+
+    def __init__(self, username: str = None, password: str = None, latency_ms: float = 0.0,
+                 banned: bool = False, down: bool = False, port: int = 0):
+        self.username = username
+        self.password = password
+        self.latency = latency_ms / 1000.0
+        self.banned = banned
+        self.down = down
+        self.requests = 0
+        self.auth_failures = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def spec(self) -> str:
+        """config.PROXIES entry for this proxy."""
+        host, port = self._server.server_address
+        auth = f"{self.username}:{self.password}@" if self.username is not None else ""
+        return f"{auth}{host}:{port}"
+
+    def start(self) -> "ProxyStandIn":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def authorized(self, header: str) -> bool:
+        if self.username is None:
+            return True
+        token = base64.b64encode(f"{self.username}:{self.password}".encode()).decode()
+        return header == f"Basic {token}"
+
+    def _handler(self):
+        proxy = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if not proxy.authorized(self.headers.get("Proxy-Authorization", "")):
+                    with proxy._lock:
+                        proxy.auth_failures += 1
+                    self.send_response(407)
+                    self.send_header("Proxy-Authenticate", 'Basic realm="proxy"')
+                    self.send_header("Content-Length", "0")
+                    return self.end_headers()
+                with proxy._lock:
+                    proxy.requests += 1
+                if proxy.latency:
+                    time.sleep(proxy.latency)
+                if proxy.down:
+                    return self.send_error(502)
+
+                url = self.path
+                parts = urlsplit(url)
+                if proxy.banned and parts.path.startswith("/job/"):
+                    url = urlunsplit((parts.scheme, parts.netloc, "/blocked", "", ""))
+                try:
+                    resp = _OPENER.open(url, timeout=30)
+                except urllib.error.HTTPError as e:
+                    resp = e
+                except OSError:
+                    return self.send_error(502)
+                with resp:
+                    body = resp.read()
+                    self.send_response(resp.status if hasattr(resp, "status") else resp.code)
+                    for name in ("Content-Type", "Location"):
+                        if resp.headers.get(name):
+                            self.send_header(name, resp.headers[name])
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+        return Handler
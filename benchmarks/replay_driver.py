@@ -0,0 +1,297 @@
+# benchmarks/replay_driver.py
+"""
+Replay WebDriver: a browser-free stand-in for undetected-chromedriver.
+
+Every navigation is a real HTTP request, with any host rewritten to the
+local stand-in (benchmarks/standin_server.py), so `current_url` and the
+links the crawler builds keep their jobstreet.com form. The page is
+parsed with lxml and XPath lookups, element reads and the scripts the
+crawler runs (parser, list_state, anti_ban, browser) are answered from
+the parsed tree. Each WebDriver command is counted as one round trip and
+can sleep `round_trip_ms`, like a chromedriver HTTP call would.
+
+Plug it in through the browser hook (and the HTTP client hook for
+HTTP_DETAILS, whose requests are rewritten the same way):
+
+    factory = ReplayFactory(standin.url)
+    config.DRIVER_FACTORY = factory
+    config.HTTP_SESSION_FACTORY = factory.http_session
+"""
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.cookies import SimpleCookie
+from typing import Dict, List
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+import requests
+from lxml import html as lxml_html
+from requests.adapters import HTTPAdapter
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
+
+import browser
+import list_state
+import parser as job_parser
+from anti_ban import BLOCK_CHECK_JS, is_block_html
+
+
+def _text(node) -> str:
+    return " ".join(node.text_content().split())
+
+
+class ReplayElement:
+    def __init__(self, driver: "ReplayDriver", node):
+        self._driver = driver
+        self._node = node
+
+    @property
+    def text(self) -> str:
+        self._driver.record("element.text")
+        return _text(self._node)
+
+    def get_attribute(self, name: str):
+        self._driver.record("element.get_attribute")
+        value = self._node.get(name)
+        if name == "href" and value is not None:
+            return urljoin(self._driver.current_url, value)
+        return value
+
+    def find_element(self, by, value):
+        self._driver.record("element.find_element")
+        found = self._node.xpath(value)
+        if not found:
+            raise NoSuchElementException(value)
+        return ReplayElement(self._driver, found[0])
+
+    def find_elements(self, by, value):
+        self._driver.record("element.find_elements")
+        return [ReplayElement(self._driver, node) for node in self._node.xpath(value)]
+
+
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) ReplayDriver/1.0"
+
+
+def _rewrite(target_url: str, url: str) -> str:
+    """Any host → the stand-in, path and query kept."""
+    target, parts = urlsplit(target_url), urlsplit(url)
+    return urlunsplit((target.scheme, target.netloc, parts.path, parts.query, ""))
+
+
+class StandInAdapter(HTTPAdapter):
+    """requests transport adapter that sends every request to the stand-in."""
+
+    def __init__(self, target_url: str, **kwargs):
+        super().__init__(**kwargs)
+        self.target_url = target_url
+
+    def send(self, request, **kwargs):
+        request.url = _rewrite(self.target_url, request.url)
+        return super().send(request, **kwargs)
+
+
+class ReplayDriver:
+    def __init__(self, target_url: str, round_trip_ms: float = 0.0, launch_seconds: float = 0.0,
+                 proxy=None):
+        if launch_seconds:
+            time.sleep(launch_seconds)  # what a UC launch would cost
+        self.target_url = target_url
+        # behind a proxy_pool.Proxy every page goes through it, like --proxy-server
+        self.proxy = proxy
+        self._open = urllib.request.urlopen if proxy is None else urllib.request.build_opener(
+            urllib.request.ProxyHandler({"http": proxy.url, "https": proxy.url})).open
+        self.round_trip = round_trip_ms / 1000.0
+        self.calls: Dict[str, int] = {}
+        self.current_url = "about:blank"
+        self._source = "<html><head></head><body></body></html>"
+        self._doc = lxml_html.fromstring(self._source)
+        self._load_ms = 0
+        self.closed = False
+        self.page_load_timeout = 30.0
+        # one cookie jar per browser, sent with every page like Chrome's
+        self.cookies: Dict[str, dict] = {}
+        self.user_agent = USER_AGENT
+
+    def record(self, command: str):
+        self.calls[command] = self.calls.get(command, 0) + 1
+        if self.round_trip:
+            time.sleep(self.round_trip)
+
+    @property
+    def round_trips(self) -> int:
+        return sum(self.calls.values())
+
+    # --- navigation ---
+
+    def get(self, url: str):
+        self.record("get")
+        if self.closed:
+            raise WebDriverException("driver was quit")
+        if url == "about:blank":
+            self.current_url, self._source = url, "<html><head></head><body></body></html>"
+        else:
+            started = time.perf_counter()
+            headers = {"User-Agent": self.user_agent}
+            if self.cookies:
+                headers["Cookie"] = "; ".join(f"{c['name']}={c['value']}" for c in self.cookies.values())
+            request = urllib.request.Request(_rewrite(self.target_url, url), headers=headers)
+            try:
+                with self._open(request, timeout=self.page_load_timeout) as resp:
+                    self._source = resp.read().decode("utf-8")
+                    final_url = resp.geturl()
+                    self._store_cookies(url, resp.headers)
+            except urllib.error.HTTPError as e:  # a browser renders error pages too
+                self._source = e.read().decode("utf-8")
+                final_url = e.geturl()
+                self._store_cookies(url, e.headers)
+            except (TimeoutError, urllib.error.URLError) as e:
+                if isinstance(e, TimeoutError) or isinstance(e.reason, TimeoutError):
+                    raise TimeoutException(f"page load timed out: {url}") from e
+                raise WebDriverException(f"unknown error: net::ERR_CONNECTION_FAILED {url}") from e
+            self._load_ms = round((time.perf_counter() - started) * 1000)
+            # after a redirect the browser shows the new address on the original host
+            self.current_url = _rewrite(url, final_url)
+        self._doc = lxml_html.fromstring(self._source)
+
+    def _store_cookies(self, url: str, headers):
+        for header in headers.get_all("Set-Cookie") or []:
+            for morsel in SimpleCookie(header).values():
+                self.cookies[morsel.key] = {"name": morsel.key, "value": morsel.value,
+                                            "domain": urlsplit(url).hostname, "path": morsel["path"] or "/"}
+
+    @property
+    def page_source(self) -> str:
+        self.record("page_source")
+        return self._source
+
+    @property
+    def title(self) -> str:
+        self.record("title")
+        found = self._doc.xpath("//title")
+        return _text(found[0]) if found else ""
+
+    # --- elements ---
+
+    def find_element(self, by, value):
+        self.record("find_element")
+        found = self._doc.xpath(value)
+        if not found:
+            raise NoSuchElementException(value)
+        return ReplayElement(self, found[0])
+
+    def find_elements(self, by, value) -> List[ReplayElement]:
+        self.record("find_elements")
+        return [ReplayElement(self, node) for node in self._doc.xpath(value)]
+
+    # --- scripts the crawler runs ---
+
+    def execute_script(self, script: str, *args):
+        self.record("execute_script")
+        if script == job_parser.LINKS_JS:
+            hrefs = []
+            for card in self._doc.xpath(args[0]):
+                links = card.xpath(args[1])
+                if links and links[0].get("href"):
+                    hrefs.append(urljoin(self.current_url, links[0].get("href")))
+            return json.dumps(hrefs)
+        if script == job_parser.DETAIL_JS:
+            out = {}
+            for key, xpath in args[0].items():
+                found = self._doc.xpath(xpath)
+                out[key] = _text(found[0]) if found else None
+            return json.dumps(out)
+        if script == list_state.STATE_JS:
+            state = list_state.extract_state(self._source)
+            return json.dumps(state) if state is not None else None
+        if script == BLOCK_CHECK_JS:
+            return is_block_html(self._source)
+        if script == browser.READY_JS:
+            return True
+        if script == "return navigator.userAgent":
+            return self.user_agent
+        if script == browser.PAGE_STATS_JS:
+            return {"url": self.current_url, "bytes": len(self._source.encode("utf-8")),
+                    "requests": 1, "load_ms": self._load_ms}
+        if "click()" in script and args:
+            self.get(args[0].get_attribute("href"))
+            return None
+        if "scrollHeight" in script:
+            return 3000
+        if "innerWidth" in script:
+            return 1366
+        if "innerHeight" in script:
+            return 768
+        return None
+
+    def execute_cdp_cmd(self, cmd: str, params: dict):
+        self.record("execute_cdp_cmd")
+        if cmd == "Network.setCookies":
+            for c in params["cookies"]:
+                self.cookies[c["name"]] = {"name": c["name"], "value": c["value"],
+                                           "domain": c.get("domain"), "path": c.get("path", "/")}
+        elif cmd == "Network.setUserAgentOverride":
+            self.user_agent = params["userAgent"]
+        return {}
+
+    # --- session ---
+
+    def get_cookies(self):
+        self.record("get_cookies")
+        return [dict(c) for c in self.cookies.values()]
+
+    def add_cookie(self, cookie: dict):
+        self.record("add_cookie")
+        self.cookies[cookie["name"]] = dict(cookie)
+
+    def delete_all_cookies(self):
+        self.record("delete_all_cookies")
+        self.cookies.clear()
+
+    def set_page_load_timeout(self, seconds: float):
+        self.record("set_page_load_timeout")
+        self.page_load_timeout = seconds
+
+    def set_script_timeout(self, seconds: float):
+        self.record("set_script_timeout")
+
+    def quit(self):
+        self.record("quit")
+        self.closed = True
+
+
+class ReplayFactory:
+    """config.DRIVER_FACTORY value: creates ReplayDrivers and keeps them for the stats."""
+
+    def __init__(self, target_url: str, round_trip_ms: float = 0.0, launch_seconds: float = 0.0):
+        self.target_url = target_url
+        self.round_trip_ms = round_trip_ms
+        self.launch_seconds = launch_seconds
+        self.drivers: List[ReplayDriver] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, proxy=None, profile_dir: str = None) -> ReplayDriver:
+        driver = ReplayDriver(self.target_url, self.round_trip_ms, self.launch_seconds, proxy=proxy)
+        with self._lock:
+            self.drivers.append(driver)
+        return driver
+
+    def http_session(self) -> requests.Session:
+        """config.HTTP_SESSION_FACTORY value: a session that talks to the stand-in."""
+        session = requests.Session()
+        adapter = StandInAdapter(self.target_url, pool_maxsize=16)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    @property
+    def launches(self) -> int:
+        return len(self.drivers)
+
+    @property
+    def round_trips(self) -> int:
+        return sum(d.round_trips for d in self.drivers)
+
+    def leaked(self) -> int:
+        """Drivers never quit (should be 0 after a run)."""
+        return sum(1 for d in self.drivers if not d.closed)
@@ -0,0 +1,219 @@
+# benchmarks/standin_server.py
+"""
+Local JobStreet stand-in: serves the saved list/detail fixtures over HTTP so
+crawls can be measured without touching the live site.
+
+    /<classification>?page=N   list page N (8 cards, next link, embedded state,
+                               totalJobsCount); past the last page: no cards
+    /job/<id>                  detail page for that card
+    /blocked                   block/challenge page
+
+Job ids are unique per page (JOB_ID_BASE + page * 100 + card). With
+block_every=K the first visit to every K-th job gets the block page.
+Postings can be changed while the server runs: ids in `edited_jobs` get a
+different title, `closed_jobs` a 404 not-found page and `moved_jobs` a
+redirect to the first list page. `stalled_jobs` maps ids to a number of
+visits answered only after `stall_seconds` (a hung page).
+With warmup_ms, a request without the stand-in's session cookie (a fresh
+browser) is held that long and answered with the cookie, like the first
+visit a real site puts through its checks.
+
+    python -m benchmarks.standin_server [port] [pages]
+"""
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.bench_html_parser import load_fixture
+
+JOB_ID_BASE = 81000000
+CARDS_PER_PAGE = 8
+FIXTURE_FIRST_ID = 80112233
+FIXTURE_ROUTE = "/jobs-in-information-communication-technology"
+
+SESSION_COOKIE = "standin_session"
+
+_FIXTURE_ID_RE = re.compile(r"801122(3[3-9]|40)")
+NOT_FOUND_HTML = ("<html><head><title>Page not found | Jobstreet</title></head>"
+                  "<body><h2>This job is no longer advertised</h2></body></html>")
+
+_NEXT_RE = re.compile(r'<a rel="nofollow next"[^>]*>.*?</a>', re.S)
+_CARD_RE = re.compile(r'\s*<article data-card-type="JobCard".*?</article>', re.S)
+
+
+class _Server(ThreadingHTTPServer):
+    # every request is a new connection (HTTP/1.0); the default backlog of 5
+    # drops connects once browsers and HTTP workers overlap (1 s SYN retry)
+    request_queue_size = 128
+
+
+def job_id(page: int, card: int) -> int:
+    return JOB_ID_BASE + page * 100 + card
+
+
+class StandIn:
+    """Threaded HTTP server on 127.0.0.1; use as a context manager."""
+
+    def __init__(self, pages: int = 5, latency_ms: float = 0.0, block_every: int = 0,
+                 warmup_ms: float = 0.0, port: int = 0):
+        self.pages = pages
+        self.latency = latency_ms / 1000.0
+        self.block_every = block_every
+        self.warmup = warmup_ms / 1000.0
+        self.requests = {}
+        self._blocked_once = set()
+        self.edited_jobs = set()
+        self.closed_jobs = set()
+        self.moved_jobs = set()
+        self.stalled_jobs = {}
+        self.stall_seconds = 5.0
+        self._lock = threading.Lock()
+        self._list_html = load_fixture("list_page.html")
+        self._detail_html = load_fixture("detail_page.html")
+        self._block_html = load_fixture("block_page.html")
+        self._server = _Server(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    @property
+    def total_jobs(self) -> int:
+        return self.pages * CARDS_PER_PAGE
+
+    def start(self) -> "StandIn":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def count(self, kind: str):
+        with self._lock:
+            self.requests[kind] = self.requests.get(kind, 0) + 1
+
+    # --- pages ---
+
+    def list_page(self, route: str, page: int) -> str:
+        html = self._list_html.replace(FIXTURE_ROUTE, route)
+        if page > self.pages:
+            return _NEXT_RE.sub("", _CARD_RE.sub("", html))
+
+        html = _FIXTURE_ID_RE.sub(
+            lambda m: str(job_id(page, int(m.group(0)) - FIXTURE_FIRST_ID)), html)
+        html = html.replace('"totalCount": 160', f'"totalCount": {self.total_jobs}')
+        html = html.replace('data-automation="totalJobsCount">160<',
+                            f'data-automation="totalJobsCount">{self.total_jobs}<')
+        if page >= self.pages:
+            return _NEXT_RE.sub("", html)
+        return html.replace(f"{route}?page=2", f"{route}?page={page + 1}")
+
+    def detail_page(self, jid: int) -> str:
+        title = f"Senior Data Engineer #{jid}" + (" (updated)" if jid in self.edited_jobs else "")
+        return self._detail_html.replace(">Senior Data Engineer</h1>", f">{title}</h1>")
+
+    def should_block(self, jid: int) -> bool:
+        if not self.block_every or jid % self.block_every:
+            return False
+        with self._lock:
+            if jid in self._blocked_once:
+                return False
+            self._blocked_once.add(jid)
+            return True
+
+    def stall(self, jid: int) -> bool:
+        with self._lock:
+            if self.stalled_jobs.get(jid, 0) <= 0:
+                return False
+            self.stalled_jobs[jid] -= 1
+            return True
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if standin.latency:
+                    time.sleep(standin.latency)
+                self.new_session = bool(standin.warmup) and \
+                    SESSION_COOKIE not in self.headers.get("Cookie", "")
+                if self.new_session:
+                    standin.count("warmup")
+                    time.sleep(standin.warmup)
+                parts = urlsplit(self.path)
+                m = re.fullmatch(r"/job/(\d+)", parts.path)
+                if parts.path == "/blocked":
+                    standin.count("block")
+                    return self.send_html(standin._block_html)
+                if m:
+                    jid = int(m.group(1))
+                    if jid in standin.closed_jobs:
+                        standin.count("closed")
+                        return self.send_html(NOT_FOUND_HTML, status=404)
+                    if standin.stall(jid):
+                        standin.count("stalled")
+                        time.sleep(standin.stall_seconds)
+                    if jid in standin.moved_jobs:
+                        standin.count("moved")
+                        self.send_response(302)
+                        self.send_header("Location", FIXTURE_ROUTE)
+                        self.send_header("Content-Length", "0")
+                        return self.end_headers()
+                    if standin.should_block(jid):
+                        standin.count("block")
+                        return self.send_html(standin._block_html)
+                    standin.count("detail")
+                    return self.send_html(standin.detail_page(jid))
+                if parts.path.startswith("/jobs"):
+                    page = int(parse_qs(parts.query).get("page", ["1"])[0])
+                    standin.count("list")
+                    return self.send_html(standin.list_page(parts.path, page))
+                standin.count("not_found")
+                self.send_error(404)
+
+            def send_html(self, html: str, status: int = 200):
+                body = html.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                if self.new_session:
+                    self.send_header("Set-Cookie", f"{SESSION_COOKIE}=1; Path=/; Max-Age=86400")
+                self.send_header("Content-Length", str(len(body)))
+                try:
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # the client timed out (stalled page)
+
+        return Handler
+
+
+def main():
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    pages = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    standin = StandIn(pages=pages, port=port)
+    print(f"JobStreet stand-in on {standin.url}{FIXTURE_ROUTE} ({pages} pages), Ctrl+C to stop")
+    try:
+        standin._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
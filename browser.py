@@ -1,9 +1,69 @@
 import undetected_chromedriver as uc
+from selenium.common.exceptions import SessionNotCreatedException, TimeoutException
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.support.ui import WebDriverWait
 import config
+import importlib
+import os
 import random
+import shutil
+import threading
 
-def create_driver():
+# Network.setBlockedURLs matches URL patterns only, so resource types map to extensions
+RESOURCE_TYPE_PATTERNS = {
+    "image": ("*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*"),
+    "font": ("*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*"),
+    "media": ("*.mp4*", "*.webm*", "*.mp3*", "*.m4a*"),
+    "stylesheet": ("*.css*",),
+}
+
+def create_driver(proxy=None, profile_dir: str = None):
+    """
+    A new browser, behind `proxy` (a proxy_pool.Proxy) and on the persistent
+    Chrome profile `profile_dir` when given.
+    """
+    if config.DRIVER_FACTORY is not None:
+        options = {name: value for name, value in (("proxy", proxy), ("profile_dir", profile_dir))
+                   if value is not None}
+        return driver_factory()(**options)
+
+    kwargs = {}
+    if config.CHROMEDRIVER_CACHE:
+        kwargs["driver_executable_path"] = patched_chromedriver()
+        patched = _file_stamp(kwargs["driver_executable_path"])
+
+    try:
+        # Buat driver dengan UC (tanpa experimental_options lama)
+        driver = uc.Chrome(options=chrome_options(proxy, profile_dir), **kwargs)
+    except Exception as e:
+        if not kwargs or not chromedriver_outdated(e):
+            raise
+        # the cached binary no longer matches the installed Chrome → re-patch once
+        discard_patched_chromedriver(kwargs["driver_executable_path"], patched)
+        driver = uc.Chrome(options=chrome_options(proxy, profile_dir),
+                           driver_executable_path=patched_chromedriver())
+
+    if config.LEAN_BROWSING:
+        block_resources(driver)
+
+    return driver
+
+
+def load_factory(factory):
+    """A factory setting as a callable (it may be given as "module:function")."""
+    if isinstance(factory, str):
+        module, _, name = factory.partition(":")
+        factory = getattr(importlib.import_module(module), name)
+    return factory
+
+
+def driver_factory():
+    """config.DRIVER_FACTORY as a callable."""
+    return load_factory(config.DRIVER_FACTORY)
+
+
+def chrome_options(proxy=None, profile_dir: str = None):
+    """Fresh UC options (UC refuses to reuse an options object)."""
     # Mulai dengan options default UC (lebih aman)
     options = uc.ChromeOptions()
 
@@ -26,7 +86,173 @@ def create_driver():
     options.add_argument("--disable-infobars")
     options.add_argument("--disable-notifications")
 
-    # Buat driver dengan UC (tanpa experimental_options lama)
-    driver = uc.Chrome(options=options)
+    # Lean browsing: don't wait for subresources, optionally never fetch images
+    options.page_load_strategy = config.PAGE_LOAD_STRATEGY
+    if config.DISABLE_IMAGES:
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
 
-    return driver
+    # UC keeps a given --user-data-dir instead of making a temporary profile
+    if profile_dir:
+        options.add_argument(f"--user-data-dir={profile_dir}")
+
+    if proxy is not None:
+        options.add_argument(f"--proxy-server={proxy.server}")
+        if proxy.username is not None:
+            from proxy_pool import auth_extension
+            options.add_argument(f"--load-extension={auth_extension(proxy)}")
+            # branded Chrome ignores --load-extension unless this is switched off
+            options.add_argument("--disable-features=DisableLoadExtensionCommandLineSwitch")
+
+    return options
+
+
+_patch_lock = threading.Lock()
+# chromedriver's "session not created" message when Chrome was updated under it
+CHROMEDRIVER_MISMATCH_MARKERS = ("only supports chrome version", "current browser version is")
+
+
+def patched_chromedriver() -> str:
+    """
+    Path of a UC-patched chromedriver kept in CHROMEDRIVER_CACHE. Without it
+    UC downloads and patches a fresh binary on every launch; with it later
+    launches only check the patch.
+    """
+    path = os.path.abspath(config.CHROMEDRIVER_CACHE)
+    with _patch_lock:
+        if not os.path.exists(path):
+            patcher = uc.Patcher()
+            patcher.auto()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            shutil.copy2(patcher.executable_path, path)
+    return path
+
+
+def chromedriver_outdated(error: Exception) -> bool:
+    """Whether a launch failed because the chromedriver does not match the installed Chrome."""
+    text = str(error).lower()
+    return isinstance(error, SessionNotCreatedException) or any(
+        marker in text for marker in CHROMEDRIVER_MISMATCH_MARKERS)
+
+
+def _file_stamp(path: str):
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def discard_patched_chromedriver(path: str, stamp):
+    """
+    Delete the cached chromedriver so the next patched_chromedriver() call
+    re-patches it, unless another launch has already replaced it since
+    `stamp` (or deleted it).
+    """
+    with _patch_lock:
+        if _file_stamp(path) != stamp:
+            return
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def blocked_url_patterns():
+    patterns = []
+    for kind in config.BLOCKED_RESOURCE_TYPES:
+        patterns.extend(RESOURCE_TYPE_PATTERNS.get(kind, ()))
+    patterns.extend(config.BLOCKED_URL_PATTERNS)
+    return patterns
+
+
+def block_resources(driver, patterns=None):
+    """Drop matching requests inside Chrome (CDP), before they hit the network."""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns or blocked_url_patterns())})
+
+
+# Under the eager/none page-load strategies driver.get() returns before the
+# page is complete; wait_ready polls for the element we are about to read.
+# mark_page tags the outgoing document so "none" can't match the old page.
+MARK_PAGE_JS = "window.__scraperPrevPage = true;"
+
+READY_JS = """
+if (window.__scraperPrevPage) { return false; }
+var node = document.evaluate(arguments[0], document, null,
+                             XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+return !!node || document.readyState === 'complete';
+"""
+
+
+def mark_page(driver):
+    if config.PAGE_LOAD_STRATEGY == "none":
+        try:
+            driver.execute_script(MARK_PAGE_JS)
+        except Exception:
+            pass
+
+
+def wait_ready(driver, xpath: str, timeout: float = None) -> bool:
+    """Wait until `xpath` is present (or the page finished loading without it)."""
+    if config.PAGE_LOAD_STRATEGY == "normal":
+        return True
+    timeout = config.PAGE_READY_TIMEOUT if timeout is None else timeout
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+            lambda d: d.execute_script(READY_JS, xpath))
+        return True
+    except TimeoutException:
+        return False
+
+
+# Navigation Timing / Resource Timing of the current document. Blocked
+# requests never start, so they do not show up here.
+PAGE_STATS_JS = """
+var nav = performance.getEntriesByType('navigation')[0] || {};
+var res = performance.getEntriesByType('resource');
+var bytes = nav.transferSize || 0;
+for (var i = 0; i < res.length; i++) { bytes += res[i].transferSize || 0; }
+return {url: location.href, bytes: bytes, requests: res.length + 1,
+        load_ms: Math.round((nav.domContentLoadedEventEnd || nav.responseEnd || 0) - (nav.startTime || 0))};
+"""
+
+
+def page_stats(driver):
+    """Bytes transferred, request count and DOMContentLoaded time of the current page."""
+    try:
+        stats = driver.execute_script(PAGE_STATS_JS)
+    except Exception:
+        return None
+    if not stats or not str(stats.get("url", "")).startswith("http"):
+        return None
+    return stats
+
+
+class PageStats:
+    """Per-page transfer/load totals, shared by every driver of a crawl."""
+
+    def __init__(self, log=None):
+        self.log = log
+        self.pages = 0
+        self.bytes = 0
+        self.requests = 0
+        self.load_ms = 0
+        self._lock = threading.Lock()
+
+    def add(self, stats):
+        if not stats:
+            return
+        with self._lock:
+            self.pages += 1
+            self.bytes += stats["bytes"]
+            self.requests += stats["requests"]
+            self.load_ms += stats["load_ms"]
+        if self.log:
+            self.log(f"[page] {stats['bytes'] / 1024:.0f} KB, {stats['requests']} requests, "
+                     f"{stats['load_ms']} ms  {stats['url']}")
+
+    def summary(self) -> str:
+        if not self.pages:
+            return "no pages measured"
+        return (f"{self.pages} pages, {self.bytes / 1024 / self.pages:.0f} KB and "
+                f"{self.requests / self.pages:.0f} requests per page, "
+                f"{self.load_ms / self.pages:.0f} ms avg DOMContentLoaded")
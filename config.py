@@ -1,4 +1,5 @@
 # config.py
+import os
 from typing import List
 
 # --- Defaults (user can override from GUI) ---
@@ -14,22 +15,176 @@ FULL_CLASSIFICATION_ROUTE = f"{BASE_URL}{CLASSIFICATION_ROUTE}"
 
 # Scraper behavior
 MAX_PAGES_PER_RUN = 2  # safe default for testing; GUI will override
+START_PAGE = 1  # first results page to collect
+
+# Pagination: "click" the next button (natural) or load "url" pages directly
+# (?page=N; allows prefetching list pages with several drivers, falls back to
+# clicking if the listing does not paginate by URL)
+PAGINATION_MODE = "click"
+LIST_PREFETCH_WORKERS = 1
 HEADLESS = False
 WINDOW_SIZE = (1366, 768)
 
+# Parallel detail scraping (each worker owns its own browser)
+NUM_WORKERS = 1
+# Pipeline: detail workers start on page 1's links while pagination goes on;
+# pagination blocks once PIPELINE_QUEUE_SIZE links are waiting (not in LIST_ONLY)
+PIPELINE = False
+PIPELINE_QUEUE_SIZE = 60
+# Driver lifecycle: DRIVER_SPARES browsers are launched in the background so a
+# recycled driver is swapped instantly. A driver is recycled on measured
+# health: RECYCLE_MAX_ERRORS failed jobs, page loads RECYCLE_LATENCY_DRIFT x
+# slower than over its first RECYCLE_WARMUP_PAGES, or renderer memory above
+# RECYCLE_MAX_RSS_MB (checked every RECYCLE_RSS_CHECK_EVERY jobs, needs psutil)
+DRIVER_SPARES = 1
+RESTART_EVERY = 0  # optional hard cap on jobs per driver (0 = health only)
+RECYCLE_MAX_ERRORS = 3
+RECYCLE_LATENCY_DRIFT = 2.0
+RECYCLE_WARMUP_PAGES = 5
+RECYCLE_MAX_RSS_MB = 1500
+RECYCLE_RSS_CHECK_EVERY = 10
+# Replaces undetected-chromedriver in create_driver: a callable or "module:function"
+# returning a WebDriver-like object, called with proxy=proxy_pool.Proxy when
+# PROXIES is set and profile_dir= with SESSION_PROFILE_DIR (benchmarks use a
+# replay driver)
+DRIVER_FACTORY = None
+# Patched chromedriver reused across launches (None = UC re-downloads every launch)
+CHROMEDRIVER_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "jobstreet-scraper", "chromedriver")
+GLOBAL_MIN_INTERVAL = 1.0  # min seconds between navigations across all workers
+
+# Adaptive throttle (AIMD): the navigation rate creeps up by THROTTLE_INCREASE
+# per clean page, is multiplied by THROTTLE_DECREASE on a block page and
+# pauses for THROTTLE_PAUSE_SECONDS after THROTTLE_PAUSE_AFTER blocks in a row.
+# Starts at 1 / GLOBAL_MIN_INTERVAL; human_delay shrinks while pages stay clean.
+ADAPTIVE_THROTTLE = False
+THROTTLE_MIN_RATE = 0.2   # navigations per second
+THROTTLE_MAX_RATE = 2.0
+THROTTLE_INCREASE = 0.05
+THROTTLE_DECREASE = 0.5
+THROTTLE_SLOW_PAGE = 8.0  # seconds; slower page loads count as a backoff signal
+THROTTLE_PAUSE_AFTER = 3
+THROTTLE_PAUSE_SECONDS = 120
+THROTTLE_MIN_DELAY_SCALE = 0.3
+
+# Lean browsing: Chrome drops images/fonts/media and tracker scripts before
+# they are requested (CDP Network.setBlockedURLs)
+LEAN_BROWSING = False
+BLOCKED_RESOURCE_TYPES = ("image", "font", "media")  # also: "stylesheet"
+BLOCKED_URL_PATTERNS = (
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*hotjar.com*", "*nr-data.net*", "*bat.bing.com*",
+)
+DISABLE_IMAGES = False  # Chrome content setting, images never load
+# "normal" waits for every subresource; "eager" returns at DOMContentLoaded and
+# "none" right away, then the scraper waits for the element it needs
+PAGE_LOAD_STRATEGY = "normal"
+PAGE_READY_TIMEOUT = 10  # seconds to wait for that element
+PAGE_STATS = False  # log bytes, requests and load time of every page
+
+# Stage timers / counters (metrics.py). METRICS_FILE ending in .prom or .txt is
+# written as Prometheus text, anything else as JSON; rewritten every
+# METRICS_EXPORT_INTERVAL seconds during a run (0 = only at the end)
+METRICS_ENABLED = False
+METRICS_FILE = "metrics.json"
+METRICS_EXPORT_INTERVAL = 30
+
+# GUI log view: messages are inserted in one batch per poll (at most
+# GUI_LOG_BATCH), only the last GUI_LOG_MAX_LINES lines stay in the widget;
+# GUI_LOG_FILE (None = off) keeps the full log. GUI_LOG_EACH_JOB logs every
+# scraped row, otherwise the progress panel shows counts, rate and ETA
+GUI_LOG_MAX_LINES = 2000
+GUI_LOG_BATCH = 500
+GUI_LOG_FILE = None
+GUI_LOG_EACH_JOB = False
+
+# Hybrid detail pages: the browser paginates and passes challenges, then its
+# cookies and user agent go to a keep-alive HTTP client that fetches detail
+# pages HTTP_WORKERS at a time (still under GLOBAL_MIN_INTERVAL / the throttle)
+# and parses them with lxml. Block pages and errors fall back to the browser;
+# HTTP_MAX_BLOCKS block pages in a row switch the rest of the run to the browser
+HTTP_DETAILS = False
+HTTP_WORKERS = 8
+HTTP_MAX_BLOCKS = 3
+# Replaces requests.Session in http_fetch: callable or "module:function"
+# (benchmarks point it at the local stand-in)
+HTTP_SESSION_FACTORY = None
+
+# Extraction: "selenium" (one find_element per field), "js" (one execute_script
+# per page) or "html" (lxml over page_source, needs `pip install lxml`)
+PARSER_MODE = "selenium"
+
+# List-only mode: take job rows from the list page's embedded state JSON and
+# visit a detail page only when one of these fields is missing there. Pages are
+# loaded by URL whatever PAGINATION_MODE says (a click leaves the state stale)
+LIST_ONLY = False
+LIST_ONLY_REQUIRED_FIELDS = ("job_name", "company_name", "work_type")
+
+# Incremental crawls: skip jobs recorded in the seen-jobs index (a SQLite
+# file next to OUTPUT_CSV) and stop at the first list page with no new jobs
+INCREMENTAL = False
+STOP_ON_SEEN_PAGE = True
+
+# Recrawl (main.py --recrawl, recrawl.py; needs INCREMENTAL, whose runs record
+# the jobs): revisit at most RECRAWL_BUDGET known jobs per run, highest score first:
+#   days since last check x (1 + RECRAWL_CHANGE_WEIGHT x past change rate)
+# jobs checked within RECRAWL_MIN_AGE_HOURS wait for a later run
+RECRAWL_BUDGET = 200
+RECRAWL_CHANGE_WEIGHT = 4.0
+RECRAWL_MIN_AGE_HOURS = 24
+
 # Delays (anti-ban)
 DELAY_MIN = 1.2
 DELAY_MAX = 2.4
 SCROLL_PAUSE = 0.4
 
-# Retry & timeout
+# Retry & timeout (nav_policy.py). REQUEST_TIMEOUT: HTTP requests (HTTP_DETAILS);
+# PAGE_LOAD_TIMEOUT / SCRIPT_TIMEOUT are set on every driver, so a hung page
+# fails instead of stalling its worker
 REQUEST_TIMEOUT = 10
+PAGE_LOAD_TIMEOUT = 30
+SCRIPT_TIMEOUT = 15
+# Retries per failure class: timeouts on the same driver, crashes on a
+# relaunched one, block pages on a rotated session, job pages without a title
+# (not rendered, unknown challenge) by loading them again; 404 / expired postings never
 RETRY_LIMIT = 3
+RETRY_LIMITS = {"timeout": RETRY_LIMIT, "crash": RETRY_LIMIT, "blocked": 1, "gone": 0, "empty": 1}
+# Seconds before the first timeout/crash retry, doubled per attempt (half of it jitter)
 RETRY_BACKOFF = 2
+RETRY_BACKOFF_MAX = 60
+# Circuit breaker: when CIRCUIT_FAILURE_RATE of the last CIRCUIT_WINDOW
+# navigations failed, every worker pauses CIRCUIT_PAUSE_SECONDS (0 = off)
+CIRCUIT_WINDOW = 20
+CIRCUIT_FAILURE_RATE = 0.5
+CIRCUIT_PAUSE_SECONDS = 60
+# Job pages whose posting is gone go to <output>.dead.jsonl and are skipped by
+# later runs (delete entries from the file to retry them); so do pages that
+# timed out in DEAD_LETTER_TIMEOUT_RUNS runs (0 = never). Crashed and blocked
+# jobs stay pending in the run journal and are retried by the next run.
+DEAD_LETTERS = True
+DEAD_LETTER_TIMEOUT_RUNS = 2
 
 # Storage
-OUTPUT_JSON = "results.json"
+OUTPUT_FORMAT = "csv"  # "csv", "jsonl" or "parquet" (main.py)
+OUTPUT_JSON = "results.jsonl"
 OUTPUT_CSV = "results.csv"
+OUTPUT_PARQUET = "results.parquet"
+# main.py: add Salary Min / Salary Max / Salary Currency / Salary Period
+# (parsed from "Salary Range", salary.py) to the output file after a run
+NORMALIZE_SALARY = False
+# Append every finished run to a Parquet dataset partitioned by country,
+# classification and scrape date (dataset.py, needs pyarrow); None = off
+DATASET_DIR = None
+# Keep every detail page's HTML, compressed ("gzip", or "zstd" with
+# `pip install zstandard`), to re-parse later without a browser
+# (archive.py, main.py --reparse); None = off
+ARCHIVE_DIR = None
+ARCHIVE_COMPRESSION = "gzip"
+
+# Batch runs (main.py --target / --targets-file): targets crawled at once over
+# shared drivers, outputs written to BATCH_OUTPUT_DIR/{country}/{classification}.{ext}
+BATCH_CONCURRENCY = 2
+BATCH_OUTPUT_DIR = "output"
+SINK_BATCH_SIZE = 50  # rows buffered before each write/flush
 COOKIES_FILE = "cookies.pkl"
 
 USER_AGENTS = [
@@ -42,8 +197,35 @@ USER_AGENTS = [
 PROXIES: List[str] = [
     # "username:password@1.2.3.4:8000",
 ]
+# Proxy rotation (proxy_pool.py), on when PROXIES is not empty: every browser
+# launches behind one proxy, picked by success rate and latency; HTTP_DETAILS
+# requests use the proxy of the browser whose cookies they carry.
+# PROXY_MAX_FAILURES blocks/errors in a row quarantine a proxy for
+# PROXY_QUARANTINE_SECONDS (doubling on every repeat)
+PROXY_MAX_SESSIONS = 2  # browsers at once per proxy
+PROXY_MIN_INTERVAL = 1.0  # seconds between navigations through one proxy
+PROXY_MAX_FAILURES = 3
+PROXY_QUARANTINE_SECONDS = 300
+PROXY_WAIT_TIMEOUT = 300  # max wait for a free proxy before a launch fails
+# Generated Chrome extensions answering proxy auth (user:pass@host:port)
+PROXY_AUTH_EXTENSION_DIR = os.path.join(os.path.expanduser("~"), ".cache", "jobstreet-scraper", "proxy-auth")
+
+# Session reuse (session_store.py): after a clean page load a driver's cookies,
+# localStorage and user agent are saved to COOKIES_FILE (one session per proxy,
+# at most every SESSION_SAVE_INTERVAL seconds) and loaded into every new driver
+# and HTTP client, so restarts skip the cookieless warm-up. Sessions older than
+# SESSION_MAX_AGE_HOURS, or whose cookies met a block page, are dropped.
+# SESSION_PROFILE_DIR: persistent Chrome profiles, one browser at a time each
+# (None = a fresh temporary profile per launch)
+SESSION_REUSE = False
+SESSION_MAX_AGE_HOURS = 12
+SESSION_SAVE_INTERVAL = 600
+SESSION_PROFILE_DIR = None
 
-# Login
+# Login: the main browser signs in before the crawl (kept in the saved session
+# with SESSION_REUSE); LOGIN_TIMEOUT leaves time to finish a code or captcha by hand
 ENABLE_LOGIN = False
 LOGIN_EMAIL = "your@email.com"
 LOGIN_PASSWORD = "yourpassword"
+LOGIN_PATH = "/oauth/login"
+LOGIN_TIMEOUT = 300
@@ -1,123 +1,644 @@
 # crawler.py
+import math
+import queue
+import threading
+from typing import Optional, Tuple
+
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.remote.webdriver import WebDriver
 
 import config
+import metrics
 from anti_ban import human_delay, small_random_scroll
-from parser import extract_links_from_list_page, parse_job_detail
-from browser import create_driver
-from utils import build_classification_url
+from archive import HtmlArchive
+from parser import extract_links
+from browser import PageStats
+from driver_manager import DriverManager
+from driver_pool import DriverPool, DriverSlot, scrape_details
+from journal import RunJournal, journal_path
+from progress import Progress
+from nav_policy import DeadLetters, dead_letter_path
+from records import JobRecord
+from sinks import MemorySink, ResultSink, resumable
+from seen_index import SeenIndex, default_index_path, filter_new, fingerprint
+from session_store import ensure_login
+from throttle import make_rate_limiter
+from list_state import (DETAIL_FIELDS, extract_state_from_driver, jobs_from_state, missing_fields,
+                        total_count, total_count_from_text)
+from page_selectors import JOBCARD_XPATH, TOTAL_COUNT_XPATH
+from utils import build_classification_url, build_page_url, job_id_from_url
+
+
+def extract_jobs(driver: WebDriver, base_url: str):
+    """
+    List-only extraction: card data from the embedded state, bare links as
+    fallback. The state is the server-rendered payload and goes stale when
+    the next-page click routes client-side, so it is only used for the job
+    ids actually on the page's cards.
+    """
+    links = extract_links(driver, base_url)
+    card_ids = {job_id_from_url(link) for link in links} - {None}
+    jobs = jobs_from_state(extract_state_from_driver(driver), base_url)
+    fresh = [job for job in jobs if job_id_from_url(job["link"]) in card_ids]
+    if fresh and {job_id_from_url(job["link"]) for job in fresh} == card_ids:
+        return fresh
+    if jobs:
+        metrics.count("stale_list_state")
+    return [{"link": link} for link in links]
+
+
+def click_next_page(driver: WebDriver) -> bool:
+    """Click the NEXT PAGE button; False if there is none."""
+    try:
+        next_btn = driver.find_element(By.XPATH, '//a[@rel="nofollow next"]')
+    except NoSuchElementException:
+        try:
+            next_btn = driver.find_element(By.XPATH, '//a[@title="Selanjutnya"]')
+        except NoSuchElementException:
+            return False
 
+    with metrics.timer("navigation"):
+        driver.execute_script("arguments[0].click();", next_btn)
+    return True
 
-def collect_all_links(driver: WebDriver, base_url: str, max_pages: int):
+
+def collect_all_links(driver: WebDriver, base_url: str, max_pages: int, extract=extract_links,
+                      seen: SeenIndex = None, start_page: int = 1, journal: RunJournal = None,
+                      stop_event: threading.Event = None, log=print, on_page=None):
+    """
+    Paginate and collect canonical job links (or list-only job rows), without
+    duplicates. With a SeenIndex, known jobs are skipped and pagination stops
+    at the first page made only of known jobs. With a journal, every page is
+    recorded together with the URL pagination continues from. on_page(links)
+    is called with each page's new links.
+    """
     all_links = []
+    run_ids = journal.known_ids() if journal else set()
 
-    for page in range(1, max_pages + 1):
-        print(f"\n--- Collecting page {page} ---")
+    for page in range(start_page, max_pages + 1):
+        if stop_event is not None and stop_event.is_set():
+            log("Stop detected during pagination.")
+            return all_links
 
-        small_random_scroll(driver)
+        log(f"\n--- Collecting page {page} ---")
+
+        try:
+            small_random_scroll(driver)
+        except Exception:
+            pass
         human_delay()
 
-        links = extract_links_from_list_page(driver, base_url)
-        print(f"Found {len(links)} links on page {page}.")
+        try:
+            with metrics.timer("parse_list"):
+                found = extract(driver, base_url)
+        except Exception as e:
+            log("Failed to extract links:", e)
+            found = []
+
+        links, page_all_known = filter_new(found, base_url, run_ids, seen)
+        metrics.count("list_pages")
+        log(f"Found {len(found)} links on page {page}, {len(links)} new.")
         all_links.extend(links)
 
+        last_page = True
         if page >= max_pages:
-            print("Reached max pages limit.")
+            log("Reached max pages limit.")
+        elif page_all_known and config.STOP_ON_SEEN_PAGE:
+            log("Whole page already seen → stopping pagination.")
+        elif not click_next_page(driver):
+            log("Next button not found → stopping pagination.")
+        else:
+            log("Clicking NEXT PAGE...")
+            human_delay()
+            last_page = False
+
+        if journal is not None:
+            journal.record_page(page, links, None if last_page else driver.current_url)
+        if on_page is not None:
+            on_page(links)
+        if last_page:
             break
 
-        # Find NEXT PAGE button
-        try:
-            next_btn = driver.find_element(By.XPATH, '//a[@rel="nofollow next"]')
-        except NoSuchElementException:
-            try:
-                next_btn = driver.find_element(By.XPATH, '//a[@title="Selanjutnya"]')
-            except NoSuchElementException:
-                print("Next button not found → stopping pagination.")
-                break
+    if journal is not None:
+        journal.pagination_finished()
+    return all_links
+
+
+def detect_total_jobs(driver: WebDriver):
+    """Total search results from the embedded state, else from the results counter."""
+    total = total_count(extract_state_from_driver(driver))
+    if total is not None:
+        return total
+    try:
+        return total_count_from_text(driver.find_element(By.XPATH, TOTAL_COUNT_XPATH).text)
+    except NoSuchElementException:
+        return None
 
-        print("Clicking NEXT PAGE...")
-        driver.execute_script("arguments[0].click();", next_btn)
-        human_delay()
 
+def fetch_list_page(slot: DriverSlot, url: str, extract, base_url: str):
+    """Load one list page by URL on a pool driver and extract it."""
+    slot.get(url, ready_xpath=JOBCARD_XPATH)
+    try:
+        small_random_scroll(slot.driver)
+    except Exception:
+        pass
+    slot.delay()
+    with metrics.timer("parse_list"):
+        return extract(slot.driver, base_url)
+
+
+def collect_links_by_url(slot: DriverSlot, base_url: str, full_url: str, max_pages: int,
+                         extract=extract_links, seen: SeenIndex = None, start_page: int = 1,
+                         journal: RunJournal = None, stop_event: threading.Event = None,
+                         log=print, prefetch: int = None, on_page=None):
+    """
+    URL-addressed pagination: page N is build_page_url(full_url, N), so a run
+    can start at any page and, with prefetch > 1, list pages are fetched in
+    parallel by their own drivers. The last page is derived from the total
+    result count, so no request is issued past the end. `slot` holds the main
+    driver, already on start_page. Returns None if this listing does not
+    paginate by URL; the caller then falls back to clicking.
+    """
+    stop_event = stop_event or threading.Event()
+    prefetch = config.LIST_PREFETCH_WORKERS if prefetch is None else prefetch
+    all_links = []
+    run_ids = journal.known_ids() if journal else set()
+
+    # first page on the main driver: also tells us the page size and total
+    log(f"\n--- Collecting page {start_page} (by URL) ---")
+    try:
+        small_random_scroll(slot.driver)
+    except Exception:
+        pass
+    human_delay()
+    with metrics.timer("parse_list"):
+        found = extract(slot.driver, base_url)
+    if not found:
+        log("No jobs on the first URL page.")
+        return None
+
+    last_page = max_pages
+    total = detect_total_jobs(slot.driver)
+    if total is not None:
+        last_page = min(max_pages, math.ceil(total / len(found)))
+        log(f"{total} jobs in total → last page {last_page}.")
+
+    done = threading.Event()  # stop fetching further pages
+    failed = threading.Event()  # a page failed: stop, but pagination is not finished
+
+    def take_page(page: int, found: list) -> bool:
+        """Record one page; False once pagination should end."""
+        links, page_all_known = filter_new(found, base_url, run_ids, seen)
+        metrics.count("list_pages")
+        log(f"Found {len(found)} links on page {page}, {len(links)} new.")
+        all_links.extend(links)
+
+        more = True
+        if page >= last_page:
+            log("Reached last page.")
+            more = False
+        elif not found:
+            log("Empty page → end of results.")
+            more = False
+        elif page_all_known and config.STOP_ON_SEEN_PAGE:
+            log("Whole page already seen → stopping pagination.")
+            more = False
+
+        if journal is not None:
+            journal.record_page(page, links, build_page_url(full_url, page + 1) if more else None)
+        if on_page is not None:
+            on_page(links)
+        return more
+
+    if take_page(start_page, found) and not stop_event.is_set():
+        pages = range(start_page + 1, last_page + 1)
+
+        def fetch(slot, page):
+            if stop_event.is_set():
+                done.set()
+            if done.is_set():
+                return None
+            return fetch_list_page(slot, build_page_url(full_url, page), extract, base_url)
+
+        def on_fetched(index, page, found):
+            if done.is_set():
+                return
+            if found is None:
+                # the journal's next_url still points at this page, so a resume retries it
+                log(f"List page {page} failed → stopping pagination here.")
+                failed.set()
+                done.set()
+            elif not take_page(page, found):
+                done.set()
+
+        if prefetch > 1:
+            log(f"Prefetching {len(pages)} list pages with {prefetch} drivers...")
+            slot.pool.spawn(num_workers=prefetch, stop_event=done).map(fetch, pages, on_result=on_fetched)
+        else:
+            for index, page in enumerate(pages):
+                try:
+                    found = fetch(slot, page)
+                except Exception as e:  # as the prefetch pool does
+                    log(f"[worker {slot.worker_id}] failed on {page}: {e!r}")
+                    found = None
+                on_fetched(index, page, found)
+                if done.is_set():
+                    break
+
+    if journal is not None and not stop_event.is_set() and not failed.is_set():
+        journal.pagination_finished()
     return all_links
 
 
-def safe_get(driver: WebDriver, url: str):
-    """Retry loading URL once if UC crashes"""
+def complete_jobs(jobs, on_result, num_workers: int = None, stop_event=None,
+                  log=print, first_driver: WebDriver = None, parent: DriverPool = None):
+    """
+    List-only mode: emit jobs harvested from list pages in order, visiting
+    detail pages only for jobs missing one of LIST_ONLY_REQUIRED_FIELDS.
+    """
+    incomplete = [i for i, job in enumerate(jobs)
+                  if missing_fields(job, config.LIST_ONLY_REQUIRED_FIELDS)]
+    log(f"{len(jobs) - len(incomplete)} jobs complete from list pages, "
+        f"{len(incomplete)} need a detail visit.")
+
+    fetched = {}
+    if incomplete:
+        def on_detail(index, link, parsed):
+            fetched[incomplete[index]] = parsed
+
+        scrape_details([jobs[i]["link"] for i in incomplete], num_workers=num_workers,
+                       on_result=on_detail, stop_event=stop_event, log=log,
+                       first_driver=first_driver, parent=parent)
+    elif first_driver is not None:
+        if parent is not None:
+            parent.drivers.release(first_driver)
+        else:
+            first_driver.quit()
+
+    for index, job in enumerate(jobs):
+        parsed = {key: job.get(key) for key in DETAIL_FIELDS}
+        detail = fetched.get(index) or {}
+        for key in DETAIL_FIELDS:
+            if not parsed[key]:
+                parsed[key] = detail.get(key)
+        on_result(index, job["link"], parsed)
+
+
+_END_OF_LINKS = object()
+
+
+def paginate(main: DriverSlot, base_url: str, full_url: str, max_pages: int, extract=extract_links,
+             seen: SeenIndex = None, journal: RunJournal = None, stop_event: threading.Event = None,
+             log=print, start_page: int = 1, on_page=None):
+    """
+    STEP 1 of a crawl: collect links with the configured PAGINATION_MODE,
+    resuming from the journal if it holds progress. on_page(links) receives
+    each page's new links as soon as the page is parsed. List-only always
+    loads pages by URL: a click routes client-side and leaves page 1's
+    embedded state in place, so later pages would yield bare links.
+    """
+    if journal is not None and journal.page and not journal.next_url:
+        journal.pagination_done = True
+
+    if journal is not None and journal.pagination_done:
+        log(f"Resuming: {len(journal.links)} links already collected.")
+        return []
+
+    url = build_page_url(full_url, start_page)
+    if journal is not None and journal.page:
+        start_page, url = journal.page + 1, journal.next_url
+        log(f"Resuming pagination at page {start_page}.")
+
+    log("Visiting:", url)
+    main.get(url, ready_xpath=JOBCARD_XPATH)
+    main.delay()
+
+    if config.PAGINATION_MODE == "url" or extract is extract_jobs:
+        links = collect_links_by_url(main, base_url, full_url, max_pages, extract=extract,
+                                     seen=seen, start_page=start_page, journal=journal,
+                                     stop_event=stop_event, log=log, on_page=on_page)
+        if links is not None:
+            return links
+        log("URL pagination not available → falling back to clicking.")
+
+    return collect_all_links(main.driver, base_url, max_pages, extract=extract, seen=seen,
+                             start_page=start_page, journal=journal, stop_event=stop_event,
+                             log=log, on_page=on_page)
+
+
+def crawl(base_url: str, full_url: str, sink: ResultSink, max_pages: int,
+          num_workers: int = None, list_only: bool = False, seen: SeenIndex = None,
+          journal: RunJournal = None, stop_event: threading.Event = None, log=print,
+          start_page: int = 1, rate_limiter=None, drivers: DriverManager = None,
+          progress: Progress = None, log_jobs: bool = True, archive: HtmlArchive = None) -> int:
+    """
+    The crawl engine shared by scrape_classification, the GUI worker and
+    batch runs: paginate from start_page up to page max_pages and scrape
+    every collected job into `sink`. With PIPELINE the two stages overlap;
+    otherwise pagination finishes first. A journal that already holds
+    progress is resumed. Batch runs pass a shared rate_limiter, driver
+    manager and HTML archive (ARCHIVE_DIR); the GUI passes a Progress and log_jobs=False instead of a log
+    line per scraped row. Returns the number of rows written.
+    """
+    stop_event = stop_event or threading.Event()
+    # every pool of the crawl (pagination, prefetch, details) is spawned from
+    # this one: one rate limiter, one page-stats collector, one driver manager
+    limiter = rate_limiter or make_rate_limiter()
+    stats = PageStats(log) if config.PAGE_STATS else None
+    own_archive = HtmlArchive() if archive is None and config.ARCHIVE_DIR else None
+    dead_letters = DeadLetters(dead_letter_path(getattr(sink, "path", None))) if config.DEAD_LETTERS else None
+    main_pool = DriverPool(num_workers=1, rate_limiter=limiter, log=log, page_stats=stats,
+                           drivers=drivers, archive=archive or own_archive, dead_letters=dead_letters)
+    main = DriverSlot(main_pool, 0)
     try:
-        driver.get(url)
-        return driver
-    except Exception as e:
-        print("Navigation error → restarting driver...", e)
-        driver.quit()
-        driver = create_driver()
-        driver.get(url)
-        return driver
+        main.start()
+        if config.ENABLE_LOGIN:
+            ensure_login(main, base_url, main_pool.drivers.sessions, log=log)
+        crawl_stages(main, base_url, full_url, sink, max_pages, num_workers=num_workers,
+                     list_only=list_only, seen=seen, journal=journal, stop_event=stop_event,
+                     log=log, start_page=start_page, progress=progress or Progress(),
+                     log_jobs=log_jobs)
+    finally:
+        main.hand_back()
+        main_pool.close()
+        if own_archive is not None:
+            own_archive.close()
+
+    if rate_limiter is None:
+        log("Throttle:", limiter.summary())
+    if drivers is None:
+        log("Drivers:", main_pool.drivers.summary())
+        if main_pool.drivers.proxies is not None:
+            log("Proxies:", main_pool.drivers.proxies.summary())
+    if stats is not None:
+        log("Page stats:", stats.summary())
+    if own_archive is not None:
+        log("Archive:", own_archive.summary())
+    if main_pool.breaker.trips:
+        log("Circuit:", main_pool.breaker.summary())
+    if dead_letters is not None and dead_letters.added:
+        log("Dead letters:", dead_letters.summary())
+    if journal is not None and not stop_event.is_set():
+        pending = journal.pending_indices()
+        if journal.pagination_done and not pending:
+            sink.flush()  # the last rows first: finished means every row is in the file
+            journal.finish()
+        else:
+            unpaginated = "" if journal.pagination_done else ", pagination unfinished"
+            log(f"Journal: {len(pending)} jobs still pending{unpaginated} → resume the run to continue.")
+    return sink.count
+
 
+def crawl_stages(main: DriverSlot, base_url: str, full_url: str, sink: ResultSink, max_pages: int,
+                 num_workers: int = None, list_only: bool = False, seen: SeenIndex = None,
+                 journal: RunJournal = None, stop_event: threading.Event = None, log=print,
+                 start_page: int = 1, progress: Progress = None, log_jobs: bool = True):
+    """Pagination and detail scraping of crawl(), on the main slot's pool."""
+    progress = progress or Progress()
+    extract = extract_jobs if list_only else extract_links
 
-def scrape_classification(country: str = None, classification: str = None):
+    # indices[k] = frontier position of the k-th job handed to the workers
+    indices = []
+    unflushed = []  # seen-index marks of rows still in the sink's buffer
+    dead_letters = main.pool.dead_letters
+
+    def on_result(index, link, parsed):
+        if parsed is None:
+            metrics.count("jobs_skipped")
+            progress.job_done(ok=False)
+            log(f"[{indices[index] + 1}] Skipped {link}")
+            if journal is not None and dead_letters is not None and link in dead_letters:
+                journal.job_done(indices[index])  # failed for good; anything else stays pending
+            return
+
+        # buffered before the write: the write may flush this very row
+        if seen is not None:
+            unflushed.append((job_id_from_url(link), link, fingerprint(parsed)))
+        if journal is not None:
+            journal.job_done(indices[index])
+        sink.write(JobRecord.from_parsed(link, parsed))
+        metrics.count("jobs_scraped")
+
+        progress.job_done()
+        if log_jobs:
+            log(f"[{indices[index] + 1}] Scraped:", parsed)
+
+    def on_flush():
+        # a job only counts as done (and seen) once its row has reached the output file
+        if journal is not None:
+            journal.commit()
+        if seen is not None:
+            marks, unflushed[:] = list(unflushed), []
+            seen.mark_many(marks)
+
+    sink.on_flush = on_flush
+
+    http = None
+    if config.HTTP_DETAILS and not list_only:
+        from http_fetch import HttpFetcher
+        http = HttpFetcher(main.pool, log=log)
+
+    if config.PIPELINE and not list_only:
+        crawl_pipelined(main, base_url, full_url, max_pages, on_result, indices,
+                        num_workers=num_workers, seen=seen, journal=journal,
+                        stop_event=stop_event, log=log, start_page=start_page,
+                        progress=progress, http=http)
+    else:
+        # STEP 1: collect all links (list-only: whole job rows from the embedded state)
+        links = paginate(main, base_url, full_url, max_pages, extract=extract, seen=seen,
+                         journal=journal, stop_event=stop_event, log=log, start_page=start_page,
+                         on_page=lambda page_links: progress.page_done(len(page_links)))
+
+        links = journal.links if journal is not None else links
+        indices.extend(journal.pending_indices() if journal is not None else range(len(links)))
+        pending = [links[i] for i in indices]
+        progress.set_total(len(pending))
+        log(f"\nTotal collected links: {len(links)} ({len(pending)} to scrape)")
+
+        # STEP 2: visit each job (the pagination driver is reused by worker 0)
+        if list_only:
+            complete_jobs(pending, on_result, num_workers=num_workers, stop_event=stop_event,
+                          log=log, first_driver=main.driver, parent=main.pool)
+            main.driver = None  # handed over to worker 0
+        elif http is not None:
+            from http_fetch import scrape_details_http
+            sync_http(main, http, full_url)
+            if scrape_details_http(pending, http, on_result, num_workers=num_workers,
+                                   stop_event=stop_event, log=log, first_driver=main.driver,
+                                   parent=main.pool):
+                main.driver = None  # handed over to the fallback pool
+        else:
+            scrape_details(pending, num_workers=num_workers, on_result=on_result,
+                           stop_event=stop_event, log=log, first_driver=main.driver,
+                           parent=main.pool)
+            main.driver = None  # handed over to worker 0
+
+    if http is not None:
+        http.close()
+        log("HTTP:", http.summary())
+    sink.flush()
+
+
+def sync_http(main: DriverSlot, http, url: str):
     """
-    Main function: country + classification → URL → scraping
+    Copy the main driver's session into the HTTP client, loading url (the
+    listing) first when the driver has not been on the site yet (a resumed run).
     """
+    if not (main.driver.current_url or "").startswith("http"):
+        main.get(url)
+    http.sync(main.driver)
 
-    # Build final URL
-    country = country or config.COUNTRY_CODE
-    classification = classification or config.JOB_CLASSIFICATION
 
-    base_url, route, full_url = build_classification_url(country, classification)
+def crawl_pipelined(main: DriverSlot, base_url: str, full_url: str, max_pages: int, on_result,
+                    indices: list, num_workers: int = None, seen: SeenIndex = None,
+                    journal: RunJournal = None, stop_event: threading.Event = None,
+                    log=print, start_page: int = 1, progress: Progress = None, http=None):
+    """
+    Producer/consumer crawl: pagination runs on the main driver in its own
+    thread and pushes each page's links into a bounded queue while the
+    detail workers (their own drivers) scrape them. A full queue blocks
+    pagination (backpressure); the stop event drains both stages, and
+    pagination stops queueing once the workers are gone.
+    """
+    links_queue = queue.Queue(maxsize=config.PIPELINE_QUEUE_SIZE)
+    resumed = [] if journal is None else journal.pending_indices()
+    frontier = list(journal.links) if journal is not None else []
+    next_index = len(frontier)
+    progress = progress or Progress()
+    progress.set_total(len(resumed), final=False)
+    consumers_done = threading.Event()  # nobody takes from the queue anymore
+    if http is not None and (resumed or (journal is not None and journal.pagination_done)):
+        sync_http(main, http, full_url)  # the workers start before the first new list page
 
-    # Update config
-    config.COUNTRY_CODE = country
-    config.BASE_URL = base_url
-    config.CLASSIFICATION_ROUTE = route
-    config.FULL_CLASSIFICATION_ROUTE = full_url
+    def put(item) -> bool:
+        while not stop_event.is_set() and not consumers_done.is_set():
+            try:
+                links_queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
 
-    print("Visiting:", full_url)
+    def on_page(links):
+        progress.page_done(len(links))
+        if http is not None and not http.synced:
+            http.sync(main.driver)  # between two navigations of this thread
+        for link in links:
+            if not put(link):
+                return
 
-    driver = create_driver()
-    driver.get(full_url)
-    human_delay()
+    def produce():
+        try:
+            paginate(main, base_url, full_url, max_pages, seen=seen, journal=journal,
+                     stop_event=stop_event, log=log, start_page=start_page, on_page=on_page)
+        except Exception as e:
+            log("Pagination failed:", repr(e))
+        finally:
+            main.hand_back()
+            progress.set_total(progress.total)
+            put(_END_OF_LINKS)
 
-    # STEP 1: collect all links
-    links = collect_all_links(driver, base_url, config.MAX_PAGES_PER_RUN)
-    print("\nTotal collected links:", len(links))
+    def consume():
+        nonlocal next_index
+        for i in resumed:
+            indices.append(i)
+            yield frontier[i]
+        while True:
+            try:
+                item = links_queue.get(timeout=0.5)
+            except queue.Empty:
+                if stop_event.is_set():
+                    return
+                continue
+            if item is _END_OF_LINKS:
+                return
+            indices.append(next_index)
+            next_index += 1
+            yield item
 
-    job_names = []
-    company_names = []
-    work_types = []
-    salary_ranges = []
-    link_list = []
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        if http is not None:
+            from http_fetch import scrape_details_http
+            scrape_details_http(consume(), http, on_result, num_workers=num_workers,
+                                stop_event=stop_event, log=log, parent=main.pool)
+        else:
+            scrape_details(consume(), num_workers=num_workers, on_result=on_result,
+                           stop_event=stop_event, log=log, parent=main.pool)
+    finally:
+        consumers_done.set()
+    producer.join()
+    log(f"\nPipeline finished: {len(indices)} jobs handed to workers.")
 
-    # STEP 2: visit each job
-    for idx, link in enumerate(links, start=1):
-        print(f"\n[{idx}] Visiting {link}")
 
-        driver = safe_get(driver, link)
-        human_delay()
+def load_resumable(output_file: str, **params):
+    """The unfinished journal of a previous run with the same params, or None."""
+    journal = RunJournal.load(journal_path(output_file))
+    if journal is None:
+        return None
+    if journal.finished or not journal.matches(**params):
+        journal.close()
+        return None
+    return journal
 
-        parsed = parse_job_detail(driver)
 
-        job_names.append(parsed.get("job_name"))
-        company_names.append(parsed.get("company_name"))
-        work_types.append(parsed.get("work_type"))
-        salary_ranges.append(parsed.get("salary_range"))
-        link_list.append(link)
+def last_run(output_file: str) -> Tuple[bool, Optional[str]]:
+    """
+    (finished, run id) of the last run writing output_file, by its journal.
+    Only a finished file may be rewritten (salary columns) or recorded
+    (dataset): a resume appends rows to it. Outputs without a journal
+    (Parquet) count as finished and have no run id.
+    """
+    if not resumable(output_file):
+        return True, None
+    journal = RunJournal.load(journal_path(output_file))
+    if journal is None:
+        return True, None
+    try:
+        return journal.finished, journal.run_id
+    finally:
+        journal.close()
 
-        print(f"[{idx}] Scraped:", parsed)
 
-        if idx % 50 == 0:
-            print("Restarting driver (stability)...")
-            driver.quit()
-            driver = create_driver()
+def scrape_classification(country: str = None, classification: str = None, sink: ResultSink = None,
+                          journal: RunJournal = None):
+    """
+    Main function: country + classification → URL → scraping
+
+    Rows are streamed into `sink` as they are scraped and the row count is
+    returned. Without a sink the rows are kept in memory and returned as
+    {column: values}. Pass a journal from load_resumable() to resume an
+    interrupted run (open the sink with append=True).
+    """
 
-    driver.quit()
+    # Build final URL
+    country = country or config.COUNTRY_CODE
+    classification = classification or config.JOB_CLASSIFICATION
+
+    base_url, route, full_url = build_classification_url(country, classification)
+
+    memory = MemorySink() if sink is None else None
+    sink = sink or memory
+
+    # rows kept in memory (or in a Parquet file) cannot be resumed, so only
+    # appendable file sinks get a journal
+    if journal is None and getattr(sink, "path", None) and sink.resumable:
+        journal = RunJournal.start(journal_path(sink.path), full_url=full_url,
+                                   list_only=config.LIST_ONLY)
+
+    seen = SeenIndex(default_index_path(getattr(sink, "path", None))) if config.INCREMENTAL else None
+    try:
+        count = crawl(base_url, full_url, sink, config.START_PAGE - 1 + config.MAX_PAGES_PER_RUN,
+                      num_workers=config.NUM_WORKERS, list_only=config.LIST_ONLY,
+                      seen=seen, journal=journal, start_page=config.START_PAGE)
+    finally:
+        if journal is not None:
+            journal.close()
+        if seen is not None:
+            seen.close()
 
-    return {
-        "Job Name": job_names,
-        "Company": company_names,
-        "Work Type": work_types,
-        "Salary Range": salary_ranges,
-        "Link": link_list,
-    }
+    if memory is not None:
+        return memory.columns
+    return count
@@ -0,0 +1,192 @@
+# dataset.py
+"""
+Partitioned Parquet dataset of every run (needs `pip install pyarrow`).
+
+    DATASET_DIR/country=id/classification=jobs-in-accounting/scrape_date=2026-10-18/part-*.parquet
+
+A finished run's output file is appended as one new file in its partition:
+nothing already written is read or rewritten. Appended runs are listed by
+run id in DATASET_DIR/_runs.jsonl (skipped by pyarrow), so a run is never
+appended twice. Rows carry a Job ID (from the
+link), the scrape time and the numeric salary columns. Company, Work Type,
+Salary Currency and Salary Period are dictionary-encoded (each distinct
+string stored once per file, read back as pandas categoricals).
+
+compact() merges the files of each partition into one and keeps the latest
+row per Job ID; read_dataset() loads only the partitions and columns a
+query needs.
+"""
+import json
+import os
+import uuid
+from datetime import datetime
+from typing import List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+import config
+import salary
+from sinks import COLUMNS
+
+PARTITION_SCHEMA = pa.schema(
+    [("country", pa.string()), ("classification", pa.string()), ("scrape_date", pa.string())]
+)
+PARTITIONING = ds.partitioning(PARTITION_SCHEMA, flavor="hive")
+
+_DICT = pa.dictionary(pa.int32(), pa.string())
+
+SCHEMA = pa.schema(
+    [("Job ID", pa.string()),
+     ("Job Name", pa.string()),
+     ("Company", _DICT),
+     ("Work Type", _DICT),
+     ("Salary Range", pa.string()),
+     ("Salary Min", pa.float64()),
+     ("Salary Max", pa.float64()),
+     ("Salary Currency", _DICT),
+     ("Salary Period", _DICT),
+     ("Link", pa.string()),
+     ("Scraped At", pa.timestamp("s"))]
+)
+DATASET_SCHEMA = pa.unify_schemas([SCHEMA, PARTITION_SCHEMA])
+
+JOB_ID_RE = r"/job/(\d+)"
+RUNS_FILE = "_runs.jsonl"
+
+
+def partition_dir(root: str, country: str, classification: str, scrape_date: str) -> str:
+    return os.path.join(root, f"country={country}", f"classification={classification.lstrip('/')}",
+                        f"scrape_date={scrape_date}")
+
+
+def to_table(df: pd.DataFrame, scraped_at: datetime = None, country: str = None) -> pa.Table:
+    """Output rows (COLUMNS) → a table in SCHEMA."""
+    df = df[COLUMNS].copy()
+    df = salary.add_salary_columns(df, country=country)
+    df.insert(0, "Job ID", df["Link"].str.extract(JOB_ID_RE, expand=False))
+    df["Scraped At"] = pd.Timestamp(scraped_at or datetime.now()).floor("s")
+    for name in SCHEMA.names:
+        if pa.types.is_dictionary(SCHEMA.field(name).type) or SCHEMA.field(name).type == pa.string():
+            df[name] = df[name].astype(object).where(df[name].notna(), None)
+    return pa.Table.from_pandas(df[SCHEMA.names], schema=SCHEMA, preserve_index=False)
+
+
+def _write(table: pa.Table, directory: str, prefix: str = "part") -> str:
+    """Write one file atomically (pyarrow skips the dot-prefixed temp file)."""
+    os.makedirs(directory, exist_ok=True)
+    name = f"{prefix}-{datetime.now():%H%M%S}-{uuid.uuid4().hex[:8]}.parquet"
+    tmp = os.path.join(directory, f".{name}.tmp")
+    pq.write_table(table, tmp)
+    path = os.path.join(directory, name)
+    os.replace(tmp, path)
+    return path
+
+
+def appended_runs(root: str = None) -> set:
+    """Run ids already appended to the dataset."""
+    path = os.path.join(root or config.DATASET_DIR, RUNS_FILE)
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {json.loads(line)["run_id"] for line in f if line.endswith("\n")}
+
+
+def append_output(output_file: str, country: str, classification: str, root: str = None,
+                  scrape_date: str = None, run_id: str = None) -> int:
+    """
+    Append a finished run's output file to the dataset; returns the row
+    count, 0 if run_id was already appended.
+    """
+    root = root or config.DATASET_DIR
+    if run_id is not None and run_id in appended_runs(root):
+        return 0
+    now = datetime.now()
+    scrape_date = scrape_date or f"{now:%Y-%m-%d}"
+    table = to_table(salary.read_output(output_file), scraped_at=now, country=country)
+    if table.num_rows:
+        _write(table, partition_dir(root, country, classification, scrape_date))
+    if run_id is not None:
+        os.makedirs(root, exist_ok=True)
+        record = {"run_id": run_id, "output_file": output_file, "country": country,
+                  "classification": classification, "scrape_date": scrape_date, "rows": table.num_rows}
+        with open(os.path.join(root, RUNS_FILE), "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+    return table.num_rows
+
+
+def _latest(df: pd.DataFrame) -> pd.DataFrame:
+    """Latest row per Job ID (by Scraped At, then file order); rows without an ID are kept."""
+    has_id = df["Job ID"].notna()
+    newest = df[has_id].sort_values("Scraped At", kind="stable").drop_duplicates("Job ID", keep="last")
+    return pd.concat([newest, df[~has_id]]).sort_index()
+
+
+def _partition_dirs(root: str) -> List[str]:
+    return sorted(dirpath for dirpath, _, files in os.walk(root)
+                  if os.path.basename(dirpath).startswith("scrape_date=")
+                  and any(f.endswith(".parquet") for f in files))
+
+
+def compact(root: str = None, log=print) -> int:
+    """
+    Merge each partition's files into one, keeping the latest row per Job
+    ID (rows without one are all kept). Returns the rows dropped.
+    """
+    root = root or config.DATASET_DIR
+    dropped = 0
+    for directory in _partition_dirs(root):
+        files = sorted((os.path.join(directory, f) for f in os.listdir(directory) if f.endswith(".parquet")),
+                       key=os.path.getmtime)
+        table = ds.dataset(files, schema=SCHEMA, format="parquet").to_table()
+        df = _latest(table.to_pandas())
+        if len(files) == 1 and len(df) == table.num_rows:
+            continue
+        _write(pa.Table.from_pandas(df, schema=SCHEMA, preserve_index=False), directory, prefix="compacted")
+        for f in files:
+            os.remove(f)
+        dropped += table.num_rows - len(df)
+        log(f"Compacted {os.path.relpath(directory, root)}: {len(files)} files, "
+            f"{table.num_rows} → {len(df)} rows")
+    return dropped
+
+
+def read_dataset(root: str = None, columns: Optional[List[str]] = None, country=None,
+                 classification=None, since: str = None, until: str = None,
+                 latest: bool = False) -> pd.DataFrame:
+    """
+    Load part of the dataset. country / classification take one value or a
+    list, since / until are inclusive YYYY-MM-DD dates; partitions outside
+    the filter are never opened and only `columns` are read (partition
+    columns can be requested too). latest=True keeps the most recent row per
+    Job ID across scrape dates.
+    """
+    root = root or config.DATASET_DIR
+    dataset = ds.dataset(root, schema=DATASET_SCHEMA, format="parquet", partitioning=PARTITIONING)
+
+    conditions = []
+    for field, value in (("country", country), ("classification", classification)):
+        if value is not None:
+            values = [value] if isinstance(value, str) else list(value)
+            conditions.append(pc.field(field).isin(values))
+    if since is not None:
+        conditions.append(pc.field("scrape_date") >= since)
+    if until is not None:
+        conditions.append(pc.field("scrape_date") <= until)
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+
+    read = list(columns) if columns is not None else None
+    if latest and read is not None:
+        read += [c for c in ("Job ID", "Scraped At") if c not in read]
+    df = dataset.to_table(columns=read, filter=expression).to_pandas()
+
+    if latest:
+        df = _latest(df)
+        if columns is not None:
+            df = df[list(columns)]
+    return df.reset_index(drop=True)
@@ -0,0 +1,282 @@
+# driver_manager.py
+"""
+Driver lifecycle: warm spares and health-based recycling.
+
+A UC launch takes seconds. DriverManager keeps DRIVER_SPARES browsers
+launched in the background, so swapping a worker's driver is instant, old
+drivers are quit off the crawl's thread and healthy drivers handed back by
+a finished pool are reused by the next one. DriverHealth decides when a
+driver should be swapped, from what it actually measures (renderer memory,
+page-load latency drift and errors) instead of a fixed job count.
+With PROXIES set, every launch takes a proxy from the manager's ProxyPool
+and gives it back when the driver is quit; with SESSION_REUSE a new driver
+starts from the saved session (and on a leased persistent profile).
+"""
+import queue
+import threading
+import time
+from typing import Callable, Optional
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+import config
+import metrics
+from browser import create_driver
+from nav_policy import apply_timeouts
+from proxy_pool import ProxyPool, proxy_of
+from session_store import SessionStore
+
+
+class DriverManager:
+    """Hands out drivers, keeping spares warm; shared by every pool of a crawl."""
+
+    def __init__(self, spares: int = None, log: Callable = print, factory: Callable = None,
+                 max_idle: int = None, proxies: ProxyPool = None, sessions: SessionStore = None):
+        self.spares = config.DRIVER_SPARES if spares is None else spares
+        # drivers handed back by finished pools are kept (up to max_idle) for the next one
+        self.max_idle = self.spares + config.NUM_WORKERS if max_idle is None else max_idle
+        self.log = log
+        self.factory = factory or create_driver
+        self.proxies = proxies or (ProxyPool(log=log) if config.PROXIES else None)
+        self.sessions = sessions or (SessionStore(log=log) if config.SESSION_REUSE else None)
+        self.closed = False
+        self.launches = 0
+        self.warm_hits = 0
+        self.launch_seconds = 0.0
+        self._ready = queue.Queue()
+        self._pending = 0  # spare launches under way
+        self._claimed = 0  # acquire() calls waiting for one of them
+        self._lock = threading.Lock()
+        self._launch_lock = threading.Lock()
+        self._threads = []
+
+    def _launch(self) -> WebDriver:
+        proxy = self.proxies.acquire() if self.proxies is not None else None
+        profile = self.sessions.lease_profile(proxy) if self.sessions is not None else None
+        options = {name: value for name, value in (("proxy", proxy), ("profile_dir", profile))
+                   if value is not None}
+        try:
+            # UC patches the chromedriver binary on launch; concurrent launches race
+            with self._launch_lock:
+                started = time.monotonic()
+                driver = self.factory(**options)
+        except Exception:
+            if proxy is not None:
+                self.proxies.release(proxy)
+            SessionStore.release_profile(profile)
+            raise
+        apply_timeouts(driver)
+        if proxy is not None:
+            driver.scraper_proxy = proxy
+        if profile is not None:
+            driver.scraper_profile = profile
+        if self.sessions is not None:
+            try:
+                self.sessions.restore(driver, proxy)
+            except Exception as e:
+                self.log("Session restore failed:", repr(e))
+        elapsed = time.monotonic() - started
+        with self._lock:
+            self.launches += 1
+            self.launch_seconds += elapsed
+        metrics.count("driver_launches")
+        metrics.observe("driver_launch_seconds", elapsed)
+        return driver
+
+    def _launch_spare(self) -> Optional[WebDriver]:
+        try:
+            driver = self._launch()
+        except Exception as e:
+            if not self.closed:
+                self.log("Spare driver launch failed:", repr(e))
+            driver = None
+        if self.closed and driver is not None:
+            _quit(driver)
+            driver = None
+        return driver
+
+    def _background(self, target, *args):
+        t = threading.Thread(target=target, args=args, daemon=True)
+        t.start()
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()] + [t]
+
+    def warm(self):
+        """Start background launches until `spares` drivers are ready or on the way."""
+        with self._lock:
+            missing = self.spares - self._ready.qsize() - self._pending + self._claimed
+            if self.closed or missing <= 0:
+                return
+            self._pending += missing
+        for _ in range(missing):
+            self._background(self._spare_then_count)
+
+    def _spare_then_count(self):
+        driver = self._launch_spare()
+        with self._lock:  # one step, so acquire() never counts it twice
+            self._pending -= 1
+            self._ready.put(driver)
+
+    def acquire(self) -> WebDriver:
+        """
+        A ready spare if there is one, else one already launching that no
+        other acquire() is waiting for, else a cold launch.
+        """
+        driver, wait = None, False
+        with self._lock:
+            if self._ready.qsize() > self._claimed:  # the first ones are the waiters'
+                driver = self._ready.get_nowait()
+            elif self._ready.qsize() + self._pending > self._claimed:
+                self._claimed += 1
+                wait = True
+        if wait:
+            driver = self._ready.get()
+            with self._lock:
+                self._claimed -= 1
+        if driver is not None:
+            with self._lock:
+                self.warm_hits += 1
+        else:
+            driver = self._launch()
+        self.warm()
+        return driver
+
+    def release(self, driver: Optional[WebDriver]):
+        """Quit a driver in the background (its proxy is free at once)."""
+        if driver is not None:
+            if self.proxies is not None:
+                self.proxies.release(proxy_of(driver))
+            self._background(_quit, driver)
+
+    def page_loaded(self, driver: Optional[WebDriver], blocked: bool):
+        """
+        After a navigation: save the session of a clean page; drop the
+        session (and the driver's cookies) that met a block page.
+        """
+        if self.sessions is None or driver is None:
+            return
+        try:
+            if not blocked:
+                self.sessions.save(driver, proxy_of(driver))
+                return
+            self.sessions.invalidate(proxy_of(driver))
+            driver.delete_all_cookies()  # a persistent profile would keep them
+        except Exception as e:
+            self.log("Session update failed:", repr(e))
+
+    def record(self, driver: Optional[WebDriver], latency: float = None, blocked: bool = False,
+               error: bool = False):
+        """Feed a page outcome to the health stats of the driver's proxy."""
+        if self.proxies is not None:
+            self.proxies.record(proxy_of(driver), latency, blocked=blocked, error=error)
+
+    def give_back(self, driver: Optional[WebDriver]):
+        """Keep a healthy driver for the next acquire(), or quit it if enough are idle."""
+        if driver is None:
+            return
+        with self._lock:
+            keep = not self.closed and self._ready.qsize() < self.max_idle
+            if keep:
+                self._ready.put(driver)
+        if not keep:
+            self.release(driver)
+
+    def close(self):
+        """Quit the spares and wait for pending launches and quits."""
+        self.closed = True
+        if self.proxies is not None:
+            self.proxies.close()  # launches waiting for a proxy give up
+        with self._lock:
+            threads = list(self._threads)
+        for t in threads:
+            t.join()
+        while not self._ready.empty():
+            driver = self._ready.get_nowait()
+            if self.proxies is not None:
+                self.proxies.release(proxy_of(driver))
+            _quit(driver)
+
+    def summary(self) -> str:
+        avg = self.launch_seconds / self.launches if self.launches else 0.0
+        text = f"{self.launches} driver launches ({avg:.1f}s avg), {self.warm_hits} warm swaps"
+        if self.sessions is not None:
+            text += f", {self.sessions.summary()}"
+        return text
+
+
+def _quit(driver: Optional[WebDriver]):
+    try:
+        if driver is not None:
+            driver.quit()
+    except Exception:
+        pass
+    # the profile is free once its browser has exited
+    SessionStore.release_profile(getattr(driver, "scraper_profile", None))
+
+
+def renderer_rss_mb(driver: WebDriver) -> Optional[float]:
+    """Resident memory of the browser's renderer processes (needs `pip install psutil`)."""
+    try:
+        import psutil
+    except ImportError:
+        return None
+
+    pid = getattr(driver, "browser_pid", None)
+    if pid is None:
+        try:
+            pid = driver.service.process.pid
+        except AttributeError:
+            return None
+    try:
+        total = 0
+        for child in psutil.Process(pid).children(recursive=True):
+            try:
+                if "--type=renderer" in " ".join(child.cmdline()):
+                    total += child.memory_info().rss
+            except psutil.Error:
+                continue
+        return total / (1024 * 1024)
+    except psutil.Error:
+        return None
+
+
+class DriverHealth:
+    """Per-driver signals that decide when it is recycled."""
+
+    def __init__(self, max_jobs: int = None):
+        self.max_jobs = config.RESTART_EVERY if max_jobs is None else max_jobs
+        self.jobs = 0
+        self.errors = 0
+        self.baseline = None  # mean latency over the first RECYCLE_WARMUP_PAGES
+        self.recent = None    # EWMA of latency since then
+        self._warmup = []
+
+    def record_latency(self, latency: float):
+        if len(self._warmup) < config.RECYCLE_WARMUP_PAGES:
+            self._warmup.append(latency)
+            if len(self._warmup) == config.RECYCLE_WARMUP_PAGES:
+                self.baseline = sum(self._warmup) / len(self._warmup)
+            return
+        self.recent = latency if self.recent is None else 0.8 * self.recent + 0.2 * latency
+
+    def record_job(self, ok: bool = True):
+        self.jobs += 1
+        if not ok:
+            self.errors += 1
+
+    def recycle_reason(self, driver: WebDriver) -> Optional[str]:
+        """Why this driver should be replaced now, or None if it is healthy."""
+        if self.max_jobs and self.jobs >= self.max_jobs:
+            return f"{self.jobs} jobs"
+        if self.errors >= config.RECYCLE_MAX_ERRORS:
+            return f"{self.errors} errors"
+        proxy = proxy_of(driver)
+        if proxy is not None and proxy.quarantined():
+            return f"proxy {proxy} quarantined"
+        if self.baseline and self.recent and self.recent > self.baseline * config.RECYCLE_LATENCY_DRIFT:
+            return f"page loads {self.recent:.1f}s vs {self.baseline:.1f}s at start"
+        if config.RECYCLE_MAX_RSS_MB and self.jobs % config.RECYCLE_RSS_CHECK_EVERY == 0:
+            rss = renderer_rss_mb(driver)
+            if rss is not None and rss > config.RECYCLE_MAX_RSS_MB:
+                return f"renderer memory {rss:.0f} MB"
+        return None
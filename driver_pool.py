@@ -0,0 +1,369 @@
+# driver_pool.py
+import threading
+import time
+from collections import Counter
+from typing import Callable, Iterable, List, Optional
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+import config
+import metrics
+from anti_ban import detect_captcha_or_block, human_delay
+from browser import PageStats, mark_page, page_stats, wait_ready
+from driver_manager import DriverHealth, DriverManager
+from nav_policy import (BLOCKED, CRASH, DEAD_LETTER, EMPTY, GONE, TIMEOUT, CircuitBreaker, DeadLetters,
+                        NavigationError, backoff_delay, classify_error, gone_reason, retry_limit)
+from page_selectors import DETAIL_FIELD_XPATHS
+from parser import parse_detail
+from proxy_pool import proxy_of
+from throttle import ROTATE, RateLimiter, make_rate_limiter
+
+
+class DriverSlot:
+    """One pool worker and the browser it owns."""
+
+    def __init__(self, pool: "DriverPool", worker_id: int, driver: Optional[WebDriver] = None):
+        self.pool = pool
+        self.worker_id = worker_id
+        self.driver = driver
+        self.health = DriverHealth(pool.restart_every)
+
+    def start(self):
+        if self.driver is None:
+            self.driver = self.pool.drivers.acquire()
+
+    def launch(self, restart: bool = False) -> bool:
+        """
+        start() (or restart()) retried like a crashed navigation; False when
+        every launch failed or the pool was stopped, the worker then quits.
+        """
+        for attempt in range(1, retry_limit(CRASH) + 2):
+            try:
+                if restart and attempt == 1:
+                    self.restart()
+                else:
+                    self.start()
+                return True
+            except Exception as e:
+                metrics.count("launch_failures")
+                self.pool.log(f"[worker {self.worker_id}] Driver launch failed "
+                              f"({attempt}/{retry_limit(CRASH) + 1}): {e!r}")
+            if attempt > retry_limit(CRASH) or self.pool.stop_event.wait(backoff_delay(attempt)):
+                return False
+        return False
+
+    def get(self, url: str, ready_xpath: str = None):
+        """
+        Rate-limited navigation under the navigation policy (nav_policy):
+        failures are classified and retried per class, a crashed driver is
+        relaunched and a block page rotates the session. Under an eager/none
+        PAGE_LOAD_STRATEGY it waits for ready_xpath. Raises NavigationError
+        once the retries are spent.
+        """
+        pool = self.pool
+        if pool.dead_letters is not None and url in pool.dead_letters:
+            raise NavigationError(url, DEAD_LETTER)
+        attempts = Counter()
+        while True:
+            kind, error = self.navigate(url, ready_xpath)
+            pool.breaker.record(kind is None)
+            if kind is None:
+                return
+            attempts[kind] += 1
+            if pool.stop_event.is_set():
+                raise NavigationError(url, kind, sum(attempts.values()), error)
+            if attempts[kind] > retry_limit(kind):
+                self.fail(url, kind, sum(attempts.values()), error)
+            metrics.count(f"retries_{kind}")
+            if kind == BLOCKED:
+                pool.log(f"[worker {self.worker_id}] Block page on {url} → rotating session "
+                         f"(rate {pool.rate_limiter.rate * 60:.1f}/min)")
+            else:
+                pool.log(f"[worker {self.worker_id}] Navigation {kind} on {url} → retry "
+                         f"{attempts[kind]}/{retry_limit(kind)}: {error!r}")
+            if kind != TIMEOUT:
+                self.restart()  # relaunch the crashed driver / rotate the blocked session
+            if kind != BLOCKED:  # block pages are paced by the rate limiter
+                pool.stop_event.wait(backoff_delay(attempts[kind]))
+
+    def navigate(self, url: str, ready_xpath: str = None):
+        """One attempt: (failure class, error), (None, None) when the page loaded clean."""
+        self.pool.breaker.wait(self.pool.stop_event)
+        self.record_page_stats()
+        self.pool.rate_limiter.wait()
+        proxy = proxy_of(self.driver)
+        if proxy is not None:
+            proxy.limiter.wait()
+        mark_page(self.driver)
+        started = time.monotonic()
+        metrics.count("navigations")
+        try:
+            with metrics.timer("navigation"):
+                self.driver.get(url)
+            if ready_xpath:
+                with metrics.timer("page_ready"):
+                    wait_ready(self.driver, ready_xpath)
+        except Exception as e:
+            self.pool.drivers.record(self.driver, error=True)
+            return classify_error(e), e
+        if self.after_navigation(started) == ROTATE:
+            return BLOCKED, None
+        return None, None
+
+    def check_gone(self, url: str):
+        """Fail (class gone, not retried) if the job page at url shows a removed posting."""
+        reason = gone_reason(self.driver, url)
+        if reason:
+            self.fail(url, GONE, 1, RuntimeError(reason))
+
+    def fail(self, url: str, kind: str, attempts: int, error: Exception = None):
+        """Give up on url: report it to the dead letters and raise NavigationError."""
+        metrics.count("navigation_failures")
+        if self.pool.dead_letters is not None:
+            self.pool.dead_letters.add(url, kind, attempts, error)
+        raise NavigationError(url, kind, attempts, error)
+
+    def after_navigation(self, started: float) -> str:
+        """Feed page-load latency and the block check into the rate limiter."""
+        latency = time.monotonic() - started
+        self.health.record_latency(latency)
+        blocked = detect_captcha_or_block(self.driver)
+        self.pool.drivers.record(self.driver, latency, blocked=blocked)
+        self.pool.drivers.page_loaded(self.driver, blocked)
+        return self.pool.rate_limiter.record(latency, blocked)
+
+    def record_page_stats(self):
+        """Measure the page we are leaving (its late subresources included)."""
+        if self.pool.page_stats is not None and self.driver is not None:
+            self.pool.page_stats.add(page_stats(self.driver))
+
+    def delay(self):
+        """human_delay scaled by the rate limiter (shorter while the site is healthy)."""
+        human_delay(self.pool.rate_limiter.delay_scale)
+
+    def restart(self):
+        """Swap in a fresh driver (a warm spare when one is ready)."""
+        metrics.count("driver_restarts")
+        with metrics.timer("driver_restart"):
+            self.quit()
+            self.driver = self.pool.drivers.acquire()
+        self.health = DriverHealth(self.pool.restart_every)
+
+    def quit(self):
+        self.record_page_stats()
+        self.pool.drivers.release(self.driver)
+        self.driver = None
+
+    def hand_back(self):
+        """Done with the driver but it is healthy: return it to the manager for reuse."""
+        self.record_page_stats()
+        if self.driver is not None:
+            try:
+                self.driver.get("about:blank")
+            except Exception:
+                self.quit()
+                return
+        self.pool.drivers.give_back(self.driver)
+        self.driver = None
+
+
+class OrderedEmitter:
+    """Releases results to a callback in the original item order."""
+
+    def __init__(self, on_result: Callable):
+        self.on_result = on_result
+        self.next_index = 0
+        self.pending = {}
+        self.lock = threading.Lock()
+
+    def put(self, index: int, item, result):
+        with self.lock:
+            self.pending[index] = (item, result)
+            while self.next_index in self.pending:
+                item, result = self.pending.pop(self.next_index)
+                self.on_result(self.next_index, item, result)
+                self.next_index += 1
+
+    def drain(self):
+        """Flush what is left after an early stop, skipping the gaps."""
+        with self.lock:
+            for index in sorted(self.pending):
+                item, result = self.pending[index]
+                self.on_result(index, item, result)
+            self.pending.clear()
+
+
+class DriverPool:
+    """
+    N workers, each owning its own undetected-chromedriver, draining a
+    shared item source under one global rate limit. Drivers come from a
+    DriverManager and are recycled when their DriverHealth says so.
+    """
+
+    def __init__(self, num_workers: int = None, rate_limiter: RateLimiter = None,
+                 restart_every: int = None, stop_event: threading.Event = None,
+                 log: Callable = print, first_driver: Optional[WebDriver] = None,
+                 page_stats: PageStats = None, drivers: DriverManager = None, archive=None,
+                 breaker: CircuitBreaker = None, dead_letters: DeadLetters = None):
+        self.num_workers = max(1, num_workers or config.NUM_WORKERS)
+        # pass one limiter to several pools to pace them together
+        self.rate_limiter = rate_limiter or make_rate_limiter()
+        self.page_stats = page_stats  # PAGE_STATS collector, None = not measured
+        self.archive = archive  # archive.HtmlArchive for detail pages, None = not kept
+        self.breaker = breaker or CircuitBreaker(log=log)
+        self.dead_letters = dead_letters  # nav_policy.DeadLetters, None = not kept
+        self.restart_every = config.RESTART_EVERY if restart_every is None else restart_every
+        self.stop_event = stop_event or threading.Event()
+        self.log = log
+        # an already running driver (e.g. the one used for pagination) is
+        # handed over to worker 0 and closed together with the pool
+        self.first_driver = first_driver
+        # a pool without a shared manager owns (and closes) its own
+        self._owns_drivers = drivers is None
+        self.drivers = drivers or DriverManager(log=log)
+
+    def spawn(self, num_workers: int = None, stop_event: threading.Event = None,
+              first_driver: Optional[WebDriver] = None) -> "DriverPool":
+        """
+        A pool sharing this one's rate limiter, page stats, driver manager,
+        archive, circuit breaker and dead letters.
+        """
+        return DriverPool(num_workers=num_workers, rate_limiter=self.rate_limiter,
+                          restart_every=self.restart_every, stop_event=stop_event, log=self.log,
+                          first_driver=first_driver, page_stats=self.page_stats,
+                          drivers=self.drivers, archive=self.archive, breaker=self.breaker,
+                          dead_letters=self.dead_letters)
+
+    def close(self):
+        if self._owns_drivers:
+            self.drivers.close()
+
+    def map(self, fn: Callable, items: Iterable, on_result: Callable = None) -> Optional[List]:
+        """
+        Run fn(slot, item) for every item. on_result(index, item, result) is
+        called in the original item order; without it the results are
+        returned as a list. A failed item yields result None.
+        """
+        collected = [] if on_result is None else None
+        if on_result is None:
+            on_result = lambda index, item, result: collected.append(result)
+
+        emitter = OrderedEmitter(on_result)
+        source = enumerate(items)
+        source_lock = threading.Lock()
+
+        def next_item():
+            with source_lock:
+                return next(source, None)
+
+        def work(slot: DriverSlot):
+            try:
+                while not self.stop_event.is_set():
+                    entry = next_item()
+                    if entry is None:
+                        break
+                    index, item = entry
+
+                    if slot.driver is None and not slot.launch():
+                        emitter.put(index, item, None)  # the other workers take the rest
+                        break
+                    try:
+                        result = fn(slot, item)
+                    except NavigationError as e:
+                        self.log(f"[worker {slot.worker_id}] gave up on {item}: {e}")
+                        result = None
+                        if e.kind != DEAD_LETTER:  # skipped without a navigation
+                            # a removed posting is not the driver's fault
+                            slot.health.record_job(ok=e.kind == GONE)
+                    except Exception as e:
+                        self.log(f"[worker {slot.worker_id}] failed on {item}: {e!r}")
+                        result = None
+                        slot.health.record_job(ok=False)
+                        self.drivers.record(slot.driver, error=True)
+                    else:
+                        slot.health.record_job()
+                    emitter.put(index, item, result)
+
+                    reason = slot.health.recycle_reason(slot.driver)
+                    if reason:
+                        self.log(f"[worker {slot.worker_id}] Recycling driver ({reason})...")
+                        if not slot.launch(restart=True):
+                            break
+            finally:
+                slot.hand_back()
+
+        slots = [DriverSlot(self, i) for i in range(self.num_workers)]
+        if self.first_driver is not None:
+            slots[0].driver = self.first_driver
+            self.first_driver = None
+
+        threads = [threading.Thread(target=work, args=(slot,), daemon=True) for slot in slots]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.close()
+
+        emitter.drain()
+        return collected
+
+
+def scrape_job(slot: DriverSlot, link: str):
+    """
+    Visit one job detail page and parse it. A page without a title is a
+    removed posting (dead-lettered) or else loaded again; one that stays
+    untitled raises NavigationError (class empty), so the job stays pending.
+    """
+    attempts = 0
+    while True:
+        slot.get(link, ready_xpath=DETAIL_FIELD_XPATHS["job_name"])
+        slot.delay()
+        parsed = parse_job_page(slot, link)
+        if parsed.get("job_name"):
+            return parsed
+        slot.check_gone(link)
+        attempts += 1
+        if attempts > retry_limit(EMPTY) or slot.pool.stop_event.is_set():
+            slot.fail(link, EMPTY, attempts)
+        metrics.count(f"retries_{EMPTY}")
+        slot.pool.log(f"[worker {slot.worker_id}] No job title on {link} → retry "
+                      f"{attempts}/{retry_limit(EMPTY)}")
+
+
+def parse_job_page(slot: DriverSlot, link: str):
+    """
+    Parse the detail page the slot is on. When the pool keeps an archive,
+    the page is archived once it parsed with a title, so a block or removed
+    page never becomes a job's latest snapshot.
+    """
+    if slot.pool.archive is None:
+        with metrics.timer("parse"):
+            return parse_detail(slot.driver)
+
+    # one page_source transfer serves the archive and, in html mode, the parser
+    page_source = slot.driver.page_source
+    with metrics.timer("parse"):
+        if config.PARSER_MODE == "html":
+            from html_parser import parse_job_detail_html
+            parsed = parse_job_detail_html(page_source)
+        else:
+            parsed = parse_detail(slot.driver)
+    if parsed.get("job_name"):
+        with metrics.timer("archive"):
+            slot.pool.archive.put(link, page_source)
+    return parsed
+
+
+def scrape_details(links: List[str], num_workers: int = None, on_result: Callable = None,
+                   stop_event: threading.Event = None, log: Callable = print,
+                   first_driver: Optional[WebDriver] = None, parent: DriverPool = None):
+    """
+    Scrape job detail pages with a DriverPool, results in link order.
+    With `parent` the workers share its rate limiter, stats and drivers.
+    """
+    if parent is not None:
+        pool = parent.spawn(num_workers=num_workers, stop_event=stop_event, first_driver=first_driver)
+    else:
+        pool = DriverPool(num_workers=num_workers, stop_event=stop_event, log=log,
+                          first_driver=first_driver)
+    return pool.map(scrape_job, links, on_result=on_result)
@@ -0,0 +1,83 @@
+# html_parser.py
+"""
+Offline parsing backend over page_source (lxml).
+
+Mirrors parser.py: one driver.page_source transfer per page instead of one
+WebDriver call per field. Has no selenium dependency, so the functions can
+run in worker processes to re-parse saved HTML in bulk.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional
+
+from lxml import etree, html as lxml_html
+
+from page_selectors import JOBCARD_XPATH, JOBCARD_LINK_XPATH, DETAIL_FIELD_XPATHS
+
+# Precompiled once per process
+_JOBCARDS = etree.XPath(JOBCARD_XPATH)
+_JOBCARD_LINK = etree.XPath(JOBCARD_LINK_XPATH)
+_DETAIL_FIELDS = {key: etree.XPath(xpath) for key, xpath in DETAIL_FIELD_XPATHS.items()}
+
+
+def _document(page_source: str):
+    return lxml_html.fromstring(page_source)
+
+
+def _text(node) -> str:
+    # close to WebElement.text for inline elements: collapsed whitespace
+    return " ".join(node.text_content().split())
+
+
+def extract_links_from_html(page_source: str, base_url: str) -> List[str]:
+    """extract_links_from_list_page over raw HTML."""
+    doc = _document(page_source)
+
+    links = []
+    for jobcard in _JOBCARDS(doc):
+        found = _JOBCARD_LINK(jobcard)
+        if not found:
+            continue
+        href = found[0].get("href")
+        if not href:
+            continue
+        links.append(base_url + href if href.startswith("/") else href)
+
+    return links
+
+
+def parse_job_detail_html(page_source: str) -> dict:
+    """parse_job_detail over raw HTML; same dict shape."""
+    doc = _document(page_source)
+
+    parsed = {}
+    for key, xpath in _DETAIL_FIELDS.items():
+        found = xpath(doc)
+        parsed[key] = _text(found[0]) if found else None
+    return parsed
+
+
+def _parse_detail_file(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return parse_job_detail_html(f.read())
+
+
+def _chunksize(items: list, processes: int) -> int:
+    # large chunks keep pickling overhead below the parse cost
+    return max(1, len(items) // (processes * 4))
+
+
+def parse_details_parallel(pages: Iterable[str], processes: Optional[int] = None) -> List[dict]:
+    """parse_job_detail_html over many HTML strings, across CPU cores."""
+    pages = list(pages)
+    processes = processes or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=processes) as ex:
+        return list(ex.map(parse_job_detail_html, pages, chunksize=_chunksize(pages, processes)))
+
+
+def parse_detail_files_parallel(paths: Iterable[str], processes: Optional[int] = None) -> List[dict]:
+    """Like parse_details_parallel, reading saved HTML files inside the workers."""
+    paths = list(paths)
+    processes = processes or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=processes) as ex:
+        return list(ex.map(_parse_detail_file, paths, chunksize=_chunksize(paths, processes)))
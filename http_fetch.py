@@ -0,0 +1,206 @@
+# http_fetch.py
+"""
+Browserless fast path for job detail pages (HTTP_DETAILS).
+
+The browser paginates and gets past challenges; its user agent and cookies
+are then copied into a keep-alive requests.Session that fetches detail
+pages HTTP_WORKERS at a time under the crawl's rate limiter, parsed with
+html_parser. A block page, an HTTP error or a page without a job title
+sends the job back to the browser pool, and after HTTP_MAX_BLOCKS block
+pages in a row the rest of the crawl uses the browser only. With PROXIES the session goes
+out through the proxy of the browser it was synced from, so cookies and IP
+stay together.
+"""
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import config
+import metrics
+from anti_ban import is_block_html
+from browser import load_factory
+from driver_pool import DriverPool, OrderedEmitter, scrape_details
+from proxy_pool import proxy_of
+
+BLOCK_STATUS = (403, 429, 503)
+
+
+def make_session(workers: int) -> requests.Session:
+    """Keep-alive session with a connection per worker (or HTTP_SESSION_FACTORY's)."""
+    if config.HTTP_SESSION_FACTORY:
+        return load_factory(config.HTTP_SESSION_FACTORY)()
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=workers, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class HttpFetcher:
+    def __init__(self, pool: DriverPool, workers: int = None, log: Callable = print):
+        self.workers = max(1, workers or config.HTTP_WORKERS)
+        self.rate_limiter = pool.rate_limiter
+        self.archive = pool.archive
+        self.dead_letters = pool.dead_letters
+        self.proxies = pool.drivers.proxies
+        self.proxy = None  # the synced driver's proxy
+        self.log = log
+        self.session = make_session(self.workers)
+        self.session.headers.update({"Accept-Language": "en-US,en;q=0.9"})
+        if pool.drivers.sessions is not None:
+            pool.drivers.sessions.apply(self.session)  # until sync() brings the live session
+        self.synced = False
+        self.disabled = False
+        self.fetched = 0
+        self.fallbacks = 0
+        self._blocks_in_row = 0
+        self._lock = threading.Lock()
+
+    def sync(self, driver):
+        """Copy the driver's user agent, cookies and proxy into the session."""
+        user_agent = driver.execute_script("return navigator.userAgent")
+        if user_agent:
+            self.session.headers["User-Agent"] = user_agent
+        for cookie in driver.get_cookies():
+            self.session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain"),
+                                     path=cookie.get("path", "/"))
+        self.proxy = proxy_of(driver)
+        if self.proxy is not None:
+            self.session.proxies.update(self.proxy.requests_proxies)
+        self.synced = True
+
+    def fetch(self, url: str) -> Optional[str]:
+        """Page HTML, or None when the browser has to take over."""
+        if self.disabled or (self.dead_letters is not None and url in self.dead_letters):
+            return None  # the browser pool skips dead letters
+        self.rate_limiter.wait()
+        if self.proxy is not None:
+            self.proxy.limiter.wait()
+        started = time.monotonic()
+        try:
+            with metrics.timer("http_fetch"):
+                resp = self.session.get(url, timeout=config.REQUEST_TIMEOUT)
+        except requests.RequestException as e:
+            self.record_proxy(error=True)
+            self.log(f"[http] {url}: {e!r} → browser")
+            return None
+        blocked = resp.status_code in BLOCK_STATUS or is_block_html(resp.text)
+        latency = time.monotonic() - started
+        self.rate_limiter.record(latency, blocked)
+        self.record_proxy(latency, blocked=blocked)
+        metrics.count("http_pages")
+
+        with self._lock:
+            self._blocks_in_row = self._blocks_in_row + 1 if blocked else 0
+            if self._blocks_in_row >= config.HTTP_MAX_BLOCKS and not self.disabled:
+                self.disabled = True
+                self.log(f"[http] {self._blocks_in_row} block pages in a row → browser only from now on")
+        if blocked or resp.status_code != 200:
+            return None
+        return resp.text
+
+    def record_proxy(self, latency: float = None, blocked: bool = False, error: bool = False):
+        if self.proxies is not None:
+            self.proxies.record(self.proxy, latency, blocked=blocked, error=error)
+
+    def scrape(self, url: str) -> Optional[dict]:
+        """fetch + parse; None sends the job to the browser."""
+        from html_parser import parse_job_detail_html
+
+        html = self.fetch(url)
+        parsed = None
+        if html is not None:
+            with metrics.timer("parse"):
+                parsed = parse_job_detail_html(html)
+        if parsed is None or not parsed.get("job_name"):
+            # no page, or one without a title (a removed posting, an unknown challenge)
+            with self._lock:
+                self.fallbacks += 1
+            metrics.count("http_fallbacks")
+            return None
+        if self.archive is not None:
+            with metrics.timer("archive"):
+                self.archive.put(url, html)
+        with self._lock:
+            self.fetched += 1
+        return parsed
+
+    def summary(self) -> str:
+        state = ", disabled after repeated blocks" if self.disabled else ""
+        return f"{self.fetched} detail pages over HTTP, {self.fallbacks} sent to the browser{state}"
+
+    def close(self):
+        self.session.close()
+
+
+def scrape_details_http(links: Iterable[str], fetcher: HttpFetcher, on_result: Callable,
+                        num_workers: int = None, stop_event: threading.Event = None,
+                        log: Callable = print, first_driver=None, parent: DriverPool = None) -> bool:
+    """
+    scrape_details over HTTP: fetcher.workers requests in flight, on_result
+    called in link order. Jobs the client could not get go to a browser
+    pool that starts with the first of them and runs alongside (first_driver
+    and parent as in scrape_details); their results take their place in the
+    order. Returns True if first_driver was handed to that pool.
+    """
+    stop_event = stop_event or threading.Event()
+    emitter = OrderedEmitter(on_result)
+    in_flight = deque()
+    fallback = queue.Queue()  # (index, link), None = no more
+    fallback_indices = []  # browser pool position → link index
+    browser = None
+
+    def browser_links():
+        while True:
+            entry = fallback.get()
+            if entry is None:
+                return
+            fallback_indices.append(entry[0])
+            yield entry[1]
+
+    def run_browser():
+        try:
+            scrape_details(browser_links(), num_workers=num_workers,
+                           on_result=lambda i, link, parsed: emitter.put(fallback_indices[i], link, parsed),
+                           stop_event=stop_event, log=log, first_driver=first_driver, parent=parent)
+        except Exception as e:
+            log(f"Browser fallback failed: {e!r}")
+
+    def emit(limit: int):
+        nonlocal browser
+        while len(in_flight) > limit:
+            index, link, future = in_flight.popleft()
+            try:
+                parsed = future.result()
+            except Exception as e:
+                log(f"[http] {link}: {e!r} → browser")
+                parsed = None
+            if parsed is not None:
+                emitter.put(index, link, parsed)
+                continue
+            if browser is None:
+                log("Sending detail pages the HTTP client could not get to the browser.")
+                browser = threading.Thread(target=run_browser, daemon=True)
+                browser.start()
+            fallback.put((index, link))
+
+    try:
+        with ThreadPoolExecutor(max_workers=fetcher.workers) as ex:
+            for index, link in enumerate(links):
+                if stop_event.is_set():
+                    break
+                in_flight.append((index, link, ex.submit(fetcher.scrape, link)))
+                emit(fetcher.workers * 2)
+            emit(0)
+    finally:
+        fallback.put(None)
+        if browser is not None:
+            browser.join()
+        emitter.drain()  # only gaps left by a stop
+    return browser is not None
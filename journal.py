@@ -0,0 +1,154 @@
+# journal.py
+"""
+Crash-safe run journal.
+
+An append-only JSON Lines event log next to the output file records the
+collected link frontier page by page, where pagination stopped and which
+jobs are already written, so an interrupted run can resume exactly where it
+stopped. A torn last line (crash mid-write) is ignored on load.
+"""
+import json
+import os
+import threading
+import uuid
+from typing import List, Optional, Set
+
+from utils import job_id_from_url
+
+JOURNAL_SUFFIX = ".journal.jsonl"
+
+
+def journal_path(output_file: str) -> str:
+    return output_file + JOURNAL_SUFFIX
+
+
+class RunJournal:
+    def __init__(self, path: str):
+        self.path = path
+        self.params = {}
+        self.run_id: Optional[str] = None
+        self.links: List = []
+        self.page = 0
+        self.next_url: Optional[str] = None
+        self.pagination_done = False
+        self.done: Set[int] = set()
+        self.finished = False
+        self._pending_done: List[int] = []
+        self._f = None
+        # pagination (record_page) and the sink's flushes (commit) may run on different threads
+        self._lock = threading.Lock()
+
+    # --- lifecycle ---
+
+    @classmethod
+    def start(cls, path: str, **params) -> "RunJournal":
+        """Begin a fresh journal (truncates any previous one) with a new run id."""
+        journal = cls(path)
+        journal.params = params
+        journal.run_id = uuid.uuid4().hex[:12]
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        journal._f = open(path, "w", encoding="utf-8")
+        journal._append({"event": "start", "run_id": journal.run_id, **params}, sync=True)
+        return journal
+
+    @classmethod
+    def load(cls, path: str) -> Optional["RunJournal"]:
+        """Replay an existing journal; None if there is none."""
+        if not os.path.exists(path):
+            return None
+
+        journal = cls(path)
+        good_end = 0
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn write at the crash point
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    break
+                journal._apply(event)
+                good_end += len(line)
+
+        # drop the torn tail so new events start on a clean line
+        with open(path, "r+b") as f:
+            f.truncate(good_end)
+
+        journal._f = open(path, "a", encoding="utf-8")
+        return journal
+
+    def matches(self, **params) -> bool:
+        return all(self.params.get(k) == v for k, v in params.items())
+
+    def close(self):
+        if self._f:
+            self.commit()
+            self._f.close()
+            self._f = None
+
+    # --- recording ---
+
+    def record_page(self, page: int, links: list, next_url: Optional[str]):
+        """One list page collected; next_url is where pagination continues."""
+        event = {"event": "page", "page": page, "links": links, "next_url": next_url}
+        self._append(event, sync=True)
+        self._apply(event)
+
+    def pagination_finished(self):
+        self._append({"event": "pagination_done"}, sync=True)
+        self.pagination_done = True
+
+    def job_done(self, index: int):
+        """Buffered until commit(), i.e. until the row has reached the output file."""
+        self.done.add(index)
+        self._pending_done.append(index)
+
+    def commit(self):
+        """Persist buffered job_done marks (hook this to the sink's flush)."""
+        indices, self._pending_done = self._pending_done, []
+        if indices and self._f:
+            self._append({"event": "done", "indices": indices}, sync=True)
+
+    def finish(self):
+        self.commit()
+        self._append({"event": "finished"}, sync=True)
+        self.finished = True
+
+    # --- queries ---
+
+    def known_ids(self) -> Set[str]:
+        ids = set()
+        for item in self.links:
+            job_id = job_id_from_url(item["link"] if isinstance(item, dict) else item)
+            if job_id:
+                ids.add(job_id)
+        return ids
+
+    def pending_indices(self) -> List[int]:
+        return [i for i in range(len(self.links)) if i not in self.done]
+
+    # --- internals ---
+
+    def _apply(self, event: dict):
+        kind = event.get("event")
+        if kind == "start":
+            self.run_id = event.get("run_id")
+            self.params = {k: v for k, v in event.items() if k not in ("event", "run_id")}
+        elif kind == "page":
+            self.page = event["page"]
+            self.links.extend(event["links"])
+            self.next_url = event.get("next_url")
+        elif kind == "pagination_done":
+            self.pagination_done = True
+        elif kind == "done":
+            self.done.update(event["indices"])
+        elif kind == "finished":
+            self.finished = True
+
+    def _append(self, event: dict, sync: bool = False):
+        line = json.dumps(event, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._f.write(line)
+            self._f.flush()
+            if sync:
+                os.fsync(self._f.fileno())
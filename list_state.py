@@ -0,0 +1,118 @@
+# list_state.py
+"""
+Job data from the app state JSON embedded in JobStreet list pages.
+
+The server-rendered search page ships `window.SEEK_REDUX_DATA = {...};`
+with every card's title, advertiser, work type and salary, so a list page
+alone can fill the parse_job_detail fields without visiting the jobs.
+"""
+import json
+import re
+from typing import List, Optional
+
+STATE_MARKER = "window.SEEK_REDUX_DATA"
+_STATE_START = re.compile(re.escape(STATE_MARKER) + r"\s*=\s*")
+
+STATE_JS = "return JSON.stringify(window.SEEK_REDUX_DATA || null);"
+
+DETAIL_FIELDS = ("job_name", "company_name", "work_type", "salary_range")
+
+
+def extract_state(page_source: str) -> Optional[dict]:
+    """Parse the embedded state object out of raw list-page HTML."""
+    m = _STATE_START.search(page_source)
+    if not m:
+        return None
+
+    decoder = json.JSONDecoder()
+    try:
+        state, _ = decoder.raw_decode(page_source, m.end())
+        return state
+    except ValueError:
+        pass
+
+    # the state is a JS literal and may contain `undefined`
+    end = page_source.find("</script>", m.end())
+    literal = page_source[m.end():end if end != -1 else None]
+    try:
+        state, _ = decoder.raw_decode(re.sub(r"\bundefined\b", "null", literal))
+        return state
+    except ValueError:
+        return None
+
+
+def extract_state_from_driver(driver) -> Optional[dict]:
+    """Read the state straight from the page's JS context (one round trip)."""
+    try:
+        raw = driver.execute_script(STATE_JS)
+    except Exception:
+        raw = None
+    if raw:
+        return json.loads(raw)
+    return extract_state(driver.page_source)
+
+
+def _results(state: dict) -> dict:
+    return ((state or {}).get("results") or {}).get("results") or {}
+
+
+def total_count(state: dict) -> Optional[int]:
+    """Total number of jobs matching the search, if the state carries it."""
+    count = _results(state).get("totalCount")
+    return int(count) if count is not None else None
+
+
+def _clean(value) -> Optional[str]:
+    if value is None:
+        return None
+    value = " ".join(str(value).split())
+    return value or None
+
+
+def _work_type(job: dict) -> Optional[str]:
+    if job.get("workType"):
+        return job["workType"]
+    work_types = job.get("workTypes") or []
+    return ", ".join(work_types) if work_types else None
+
+
+def _salary(job: dict) -> Optional[str]:
+    salary = job.get("salary")
+    if isinstance(salary, dict):
+        salary = salary.get("label")
+    return salary or job.get("salaryLabel")
+
+
+def jobs_from_state(state: dict, base_url: str) -> List[dict]:
+    """
+    One dict per card: the parse_job_detail fields plus "link".
+    Fields the state does not carry are None.
+    """
+    jobs = []
+    for job in _results(state).get("jobs") or []:
+        job_id = job.get("id")
+        if not job_id:
+            continue
+        jobs.append({
+            "job_name": _clean(job.get("title")),
+            "company_name": _clean((job.get("advertiser") or {}).get("description")),
+            "work_type": _clean(_work_type(job)),
+            "salary_range": _clean(_salary(job)),
+            "link": f"{base_url}/job/{job_id}",
+        })
+    return jobs
+
+
+def missing_fields(job: dict, required=DETAIL_FIELDS) -> List[str]:
+    return [key for key in required if not job.get(key)]
+
+
+_DIGITS = re.compile(r"\d[\d.,]*")
+
+
+def total_count_from_text(text: str) -> Optional[int]:
+    """'1.234 lowongan' / '1,234 jobs' → 1234."""
+    m = _DIGITS.search(text or "")
+    if not m:
+        return None
+    return int(re.sub(r"[.,]", "", m.group(0)))
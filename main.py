@@ -1,11 +1,142 @@
-from crawler import scrape_classification
-import pandas as pd
+import argparse
+import os
+
+import archive
+import metrics
+import salary
+from batch import read_targets_file, run_batch, summary
+from crawler import last_run, load_resumable, scrape_classification
+from sinks import open_sink, output_path, resumable
+from utils import build_classification_url
 import config
 
 if __name__ == "__main__":
-    data_dict = scrape_classification()
+    ap = argparse.ArgumentParser(description="Jobstreet scraper (CLI)")
+    ap.add_argument("--resume", action="store_true",
+                    help="continue the previous interrupted run for the same output file")
+    ap.add_argument("--start-page", type=int, default=config.START_PAGE,
+                    help="first results page to collect")
+    ap.add_argument("--pagination", choices=["click", "url"], default=config.PAGINATION_MODE,
+                    help="click the next button, or load ?page=N URLs directly")
+    ap.add_argument("--target", action="append", default=[], metavar="COUNTRY:CLASSIFICATION",
+                    help="batch mode: add a target, e.g. id:jobs-in-accounting (repeatable)")
+    ap.add_argument("--targets-file",
+                    help="batch mode: file with one COUNTRY:CLASSIFICATION target per line")
+    ap.add_argument("--output-dir", default=config.BATCH_OUTPUT_DIR,
+                    help="batch mode: root of the {country}/{classification} output files")
+    ap.add_argument("--metrics", metavar="FILE",
+                    help="record stage timings and write them to FILE (.json, or .prom for Prometheus)")
+    ap.add_argument("--salary-columns", action="store_true", default=config.NORMALIZE_SALARY,
+                    help="add numeric Salary Min/Max, Currency and Period columns after the run")
+    ap.add_argument("--normalize-salaries", nargs="+", metavar="FILE",
+                    help="add the salary columns to existing output files and exit")
+    ap.add_argument("--dataset", metavar="DIR", default=config.DATASET_DIR,
+                    help="append the finished run to a partitioned Parquet dataset in DIR")
+    ap.add_argument("--compact-dataset", metavar="DIR",
+                    help="merge each dataset partition into one file, dropping duplicate jobs, and exit")
+    ap.add_argument("--archive", metavar="DIR", default=config.ARCHIVE_DIR,
+                    help="keep every detail page's HTML (compressed) in DIR")
+    ap.add_argument("--reparse", metavar="FILE",
+                    help="rebuild FILE from the HTML archive (no browser, all cores) and exit")
+    ap.add_argument("--processes", type=int, help="--reparse: worker processes (default: all cores)")
+    ap.add_argument("--recrawl", metavar="FILE",
+                    help="revisit known jobs (most stale / most often changed first), write the "
+                         "changed ones to FILE, mark removed postings closed, and exit")
+    ap.add_argument("--budget", type=int, default=config.RECRAWL_BUDGET,
+                    help="--recrawl: detail pages to spend")
+    args = ap.parse_args()
+    config.START_PAGE = args.start_page
+    config.PAGINATION_MODE = args.pagination
+    config.ARCHIVE_DIR = args.archive
+    if args.metrics:
+        config.METRICS_FILE = args.metrics
+        metrics.set_enabled(True)
+
+    if args.normalize_salaries:
+        for path in args.normalize_salaries:
+            if not last_run(path)[0]:
+                print("Skipped", path, "(its run is unfinished; resume it first)")
+                continue
+            print("Salary columns added:", salary.normalize_file(path), "rows in", path)
+        raise SystemExit(0)
+
+    if args.reparse:
+        if not config.ARCHIVE_DIR:
+            ap.error("--reparse needs --archive DIR (or ARCHIVE_DIR)")
+        with open_sink(args.reparse) as sink:
+            count = archive.reparse(sink, processes=args.processes)
+        print("Saved", count, "jobs to", args.reparse)
+        raise SystemExit(0)
+
+    if args.recrawl:
+        from recrawl import recrawl
+        from seen_index import SeenIndex, default_index_path
+        # only incremental runs record jobs (and their fingerprints) in the index
+        if not config.INCREMENTAL:
+            ap.error("--recrawl needs INCREMENTAL = True (and earlier runs made with it)")
+        index_path = default_index_path(output_path(config.OUTPUT_FORMAT))
+        if not os.path.exists(index_path):
+            ap.error(f"--recrawl: no seen-jobs index at {index_path}; run an INCREMENTAL crawl first")
+        index = SeenIndex(index_path)
+        try:
+            with metrics.exporting(), open_sink(args.recrawl) as sink:
+                recrawl(sink, index, budget=args.budget)
+            print("Job status:", index.status_counts())
+        finally:
+            index.close()
+        print("Saved", sink.count, "changed jobs to", args.recrawl)
+        raise SystemExit(0)
+
+    if args.compact_dataset:
+        import dataset
+        print("Duplicates dropped:", dataset.compact(args.compact_dataset))
+        raise SystemExit(0)
+
+    specs = list(args.target)
+    if args.targets_file:
+        specs += read_targets_file(args.targets_file)
+    if specs:
+        with metrics.exporting():
+            targets = run_batch(specs, output_dir=args.output_dir, resume=args.resume)
+        for target in targets:
+            if target.status != "done":
+                continue
+            if args.salary_columns:
+                salary.normalize_file(target.output_file, country=target.country)
+            if args.dataset:
+                import dataset
+                dataset.append_output(target.output_file, target.country, target.classification,
+                                      root=args.dataset, run_id=target.run_id)
+        print(summary(targets))
+        if metrics.enabled():
+            print(metrics.summary())
+        raise SystemExit(0)
+
+    out_file = output_path(config.OUTPUT_FORMAT)
+
+    journal = None
+    if args.resume and not resumable(out_file, config.OUTPUT_FORMAT):
+        print("Parquet runs cannot be resumed (a Parquet file cannot be appended to); starting a new run.")
+    elif args.resume:
+        _, _, full_url = build_classification_url(config.COUNTRY_CODE, config.JOB_CLASSIFICATION)
+        journal = load_resumable(out_file, full_url=full_url, list_only=config.LIST_ONLY)
+        print("Resuming previous run." if journal else "Nothing to resume, starting a new run.")
 
-    df = pd.DataFrame(data_dict)
-    df.to_csv(config.OUTPUT_CSV, index=False, encoding="utf-8-sig")
+    # rows are streamed to disk while scraping
+    with metrics.exporting(), open_sink(out_file, config.OUTPUT_FORMAT, append=journal is not None) as sink:
+        count = scrape_classification(sink=sink, journal=journal)
 
-    print("Saved", len(df), "jobs to", config.OUTPUT_CSV)
+    finished, run_id = last_run(out_file)
+    if args.salary_columns and count and finished:
+        salary.normalize_file(out_file, country=config.COUNTRY_CODE)
+    print("Saved", count, "jobs to", out_file)
+    if not finished:
+        print("The run is unfinished: salary columns and the dataset wait until --resume completes it.")
+    elif args.dataset and count:
+        import dataset
+        if dataset.append_output(out_file, config.COUNTRY_CODE, config.JOB_CLASSIFICATION,
+                                 root=args.dataset, run_id=run_id):
+            print("Appended to dataset", args.dataset)
+    if metrics.enabled():
+        print(metrics.summary())
+        print("Metrics written to", config.METRICS_FILE)
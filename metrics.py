@@ -0,0 +1,246 @@
+# metrics.py
+"""
+Lightweight run instrumentation: per-stage timers, counters and histograms.
+
+    with metrics.timer("navigation"):
+        driver.get(url)
+    metrics.count("jobs_scraped")
+
+Disabled (METRICS_ENABLED = False) every call is one flag check: timer()
+hands back a shared no-op context manager and count()/observe() return at
+once. Enabled, a snapshot can be exported as JSON or Prometheus text at
+run end or every METRICS_EXPORT_INTERVAL seconds, and summary() gives the
+throughput / stage-breakdown line shown in the GUI.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import config
+
+# seconds; the last bucket is +Inf
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+PROM_PREFIX = "jobstreet"
+
+
+class Histogram:
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def add(self, value: float):
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "max": round(self.max, 6),
+            "buckets": dict(zip([str(b) for b in BUCKETS] + ["+Inf"], self.buckets)),
+        }
+
+
+class Registry:
+    def __init__(self):
+        self.enabled = config.METRICS_ENABLED
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self.counters = {}
+            self.timers = {}
+            self.histograms = {}
+
+    def count(self, name: str, n: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def _add(self, table: dict, name: str, value: float):
+        with self._lock:
+            hist = table.get(name)
+            if hist is None:
+                hist = table[name] = Histogram()
+            hist.add(value)
+
+    def record_time(self, name: str, seconds: float):
+        self._add(self.timers, name, seconds)
+
+    def observe(self, name: str, value: float):
+        self._add(self.histograms, name, value)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "started": self.started,
+                "elapsed": round(time.time() - self.started, 3),
+                "counters": dict(self.counters),
+                "timers": {name: h.to_dict() for name, h in self.timers.items()},
+                "histograms": {name: h.to_dict() for name, h in self.histograms.items()},
+            }
+
+
+REGISTRY = Registry()
+
+
+class _Timer:
+    __slots__ = ("name", "started")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        REGISTRY.record_time(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def enabled() -> bool:
+    return REGISTRY.enabled
+
+
+def set_enabled(on: bool):
+    REGISTRY.enabled = bool(on)
+
+
+def timer(name: str):
+    """Context manager timing one stage (a shared no-op when disabled)."""
+    if not REGISTRY.enabled:
+        return _NULL_TIMER
+    return _Timer(name)
+
+
+def count(name: str, n: int = 1):
+    if REGISTRY.enabled:
+        REGISTRY.count(name, n)
+
+
+def observe(name: str, value: float):
+    if REGISTRY.enabled:
+        REGISTRY.observe(name, value)
+
+
+def reset():
+    REGISTRY.reset()
+
+
+# --- export ---
+
+def to_prometheus(snapshot: dict) -> str:
+    """Prometheus text exposition format."""
+    lines = [f"# TYPE {PROM_PREFIX}_elapsed_seconds gauge",
+             f"{PROM_PREFIX}_elapsed_seconds {snapshot['elapsed']}"]
+
+    for name, value in sorted(snapshot["counters"].items()):
+        metric = f"{PROM_PREFIX}_{name}_total"
+        lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+
+    for family, label, table in (("stage_seconds", "stage", snapshot["timers"]),
+                                 ("observed", "name", snapshot["histograms"])):
+        if not table:
+            continue
+        metric = f"{PROM_PREFIX}_{family}"
+        lines.append(f"# TYPE {metric} histogram")
+        for name, hist in sorted(table.items()):
+            cumulative = 0
+            for bound, n in hist["buckets"].items():
+                cumulative += n
+                lines.append(f'{metric}_bucket{{{label}="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_sum{{{label}="{name}"}} {hist["sum"]}')
+            lines.append(f'{metric}_count{{{label}="{name}"}} {hist["count"]}')
+    return "\n".join(lines) + "\n"
+
+
+def export(path: str = None) -> str:
+    """Write the current snapshot; .prom/.txt → Prometheus text, else JSON."""
+    path = path or config.METRICS_FILE
+    snapshot = REGISTRY.snapshot()
+    if path.endswith((".prom", ".txt")):
+        text = to_prometheus(snapshot)
+    else:
+        text = json.dumps(snapshot, indent=2)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)  # readers never see a half-written file
+    return path
+
+
+@contextmanager
+def exporting(path: str = None, interval: float = None):
+    """
+    Reset the registry for a run, export every `interval` seconds while it
+    runs and once more at the end. Does nothing when metrics are disabled.
+    """
+    if not REGISTRY.enabled:
+        yield
+        return
+
+    interval = config.METRICS_EXPORT_INTERVAL if interval is None else interval
+    reset()
+    done = threading.Event()
+
+    def periodic():
+        while not done.wait(interval):
+            export(path)
+
+    thread = None
+    if interval and interval > 0:
+        thread = threading.Thread(target=periodic, daemon=True)
+        thread.start()
+    try:
+        yield
+    finally:
+        done.set()
+        if thread is not None:
+            thread.join()
+        export(path)
+
+
+def summary(snapshot: dict = None) -> str:
+    """'12.3 jobs/min | navigation 41% · human_delay 35% · parse 4% ...'"""
+    snapshot = snapshot or REGISTRY.snapshot()
+    elapsed = max(snapshot["elapsed"], 1e-9)
+    jobs = snapshot["counters"].get("jobs_scraped", 0)
+    head = f"{jobs} jobs, {jobs * 60 / elapsed:.1f} jobs/min"
+
+    timers = snapshot["timers"]
+    total = sum(h["sum"] for h in timers.values())
+    if not total:
+        return head
+    stages = sorted(timers.items(), key=lambda kv: kv[1]["sum"], reverse=True)
+    parts = [f"{name} {h['sum'] / total:.0%} ({h['mean'] * 1000:.0f} ms avg)" for name, h in stages]
+    return head + " | " + " · ".join(parts)
@@ -0,0 +1,219 @@
+# nav_policy.py
+"""
+Navigation policy: timeouts, classified failures, retries, a circuit
+breaker and dead letters (used by DriverSlot.get).
+
+Every driver gets PAGE_LOAD_TIMEOUT / SCRIPT_TIMEOUT, so a hung page fails
+instead of stalling its worker. A failed navigation is classified:
+
+    timeout   the page load timed out        retried on the same driver
+    crash     any other driver error         retried on a relaunched driver
+    blocked   block / challenge page         retried on a rotated session
+    gone      404 / expired posting          not retried
+    empty     job page without a title       retried on the same driver
+
+and retried up to RETRY_LIMITS[class] times, timeouts and crashes after an
+exponential backoff (RETRY_BACKOFF seconds doubled per attempt, with
+jitter). A job page whose posting is gone is dead-lettered and skipped by
+later runs; so is one that timed out in DEAD_LETTER_TIMEOUT_RUNS runs.
+Crashes and block pages say nothing about the page, so those jobs stay
+pending in the run journal and the next run retries them. The CircuitBreaker shared by a
+crawl's pools pauses every navigation for CIRCUIT_PAUSE_SECONDS once
+CIRCUIT_FAILURE_RATE of the last CIRCUIT_WINDOW navigations failed.
+"""
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from selenium.common.exceptions import TimeoutException
+
+import config
+import metrics
+from utils import job_id_from_url
+
+# failure classes
+TIMEOUT = "timeout"
+CRASH = "crash"
+BLOCKED = "blocked"
+GONE = "gone"
+EMPTY = "empty"  # a job page that loaded but has no title and is not gone
+DEAD_LETTER = "dead letter"  # skipped: failed for good in an earlier run
+
+# page titles of expired / removed postings
+NOT_FOUND_MARKERS = ("not found", "no longer advertised", "no longer available", "has expired",
+                     "tidak ditemukan")
+
+DEAD_LETTER_SUFFIX = ".dead.jsonl"
+
+
+class NavigationError(RuntimeError):
+    """A navigation given up on: its failure class, attempts and last error."""
+
+    def __init__(self, url: str, kind: str, attempts: int = 0, error: Exception = None):
+        self.url = url
+        self.kind = kind
+        self.attempts = attempts
+        self.error = error
+        detail = f" ({error!r})" if error is not None else ""
+        super().__init__(f"{kind} after {attempts} attempt(s): {url}{detail}")
+
+
+def apply_timeouts(driver):
+    """Page-load and script timeouts, so a hung page raises instead of blocking."""
+    try:
+        driver.set_page_load_timeout(config.PAGE_LOAD_TIMEOUT)
+        driver.set_script_timeout(config.SCRIPT_TIMEOUT)
+    except Exception:
+        pass
+
+
+def classify_error(error: Exception) -> str:
+    return TIMEOUT if isinstance(error, TimeoutException) else CRASH
+
+
+def gone_reason(driver, url: str) -> Optional[str]:
+    """"redirected" or "not found" when the job page `url` is gone, else None."""
+    job_id = job_id_from_url(url)
+    if job_id is not None and job_id_from_url(driver.current_url) != job_id:
+        return "redirected"
+    title = (driver.title or "").lower()
+    if any(marker in title for marker in NOT_FOUND_MARKERS):
+        return "not found"
+    return None
+
+
+def retry_limit(kind: str) -> int:
+    return config.RETRY_LIMITS.get(kind, 0)
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff before retry `attempt` (1-based), half of it jitter."""
+    delay = min(config.RETRY_BACKOFF * 2 ** (attempt - 1), config.RETRY_BACKOFF_MAX)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class CircuitBreaker:
+    """Pauses every navigation of a crawl while the failure rate spikes (thread-safe)."""
+
+    def __init__(self, window: int = None, failure_rate: float = None, pause: float = None,
+                 log: Callable = print):
+        self.window = config.CIRCUIT_WINDOW if window is None else window
+        self.failure_rate = config.CIRCUIT_FAILURE_RATE if failure_rate is None else failure_rate
+        self.pause = config.CIRCUIT_PAUSE_SECONDS if pause is None else pause
+        self.log = log
+        self.trips = 0
+        self.open_until = 0.0
+        self._outcomes = deque(maxlen=max(1, self.window))
+        self._lock = threading.Lock()
+
+    def wait(self, stop_event: threading.Event = None):
+        """Block while the breaker is open (a stop ends the wait)."""
+        pause = self.open_until - time.monotonic()
+        if pause <= 0:
+            return
+        if stop_event is not None:
+            stop_event.wait(pause)
+        else:
+            time.sleep(pause)
+
+    def record(self, ok: bool):
+        if not self.window or not self.pause:
+            return
+        with self._lock:
+            self._outcomes.append(ok)
+            failures = self._outcomes.count(False)
+            if len(self._outcomes) < self.window or failures < self.failure_rate * self.window:
+                return
+            # open; after the pause the window refills from scratch (half-open)
+            self._outcomes.clear()
+            self.trips += 1
+            self.open_until = time.monotonic() + self.pause
+        metrics.count("circuit_trips")
+        self.log(f"[circuit] {failures}/{self.window} recent navigations failed → "
+                 f"pausing the crawl for {self.pause:g}s")
+
+    def summary(self) -> str:
+        return f"{self.trips} circuit breaker pauses"
+
+
+def dead_letter_path(output_file: str = None) -> str:
+    return (output_file or config.OUTPUT_CSV) + DEAD_LETTER_SUFFIX
+
+
+class DeadLetters:
+    """
+    Append-only JSON Lines file of job pages that failed for good, next to
+    the output file: gone postings, and pages that timed out in
+    DEAD_LETTER_TIMEOUT_RUNS runs (each run's timeout is one line). Only
+    job pages are kept: a list page failing today says nothing about
+    tomorrow.
+    """
+
+    def __init__(self, path: str, timeout_runs: int = None):
+        self.path = path
+        self.timeout_runs = config.DEAD_LETTER_TIMEOUT_RUNS if timeout_runs is None else timeout_runs
+        self.added = 0
+        self._lock = threading.Lock()
+        self._urls = set()
+        self._timeouts = Counter()  # url: runs it timed out in
+        self._timed_out = set()  # this run's, counted once
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        url, kind = entry["url"], entry["kind"]
+                    except (ValueError, KeyError, TypeError):
+                        continue  # torn last line
+                    if kind == GONE:
+                        self._urls.add(url)
+                    elif kind == TIMEOUT:
+                        self._timeouts[url] += 1
+        except FileNotFoundError:
+            pass
+        if self.timeout_runs:
+            self._urls.update(url for url, runs in self._timeouts.items() if runs >= self.timeout_runs)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._urls
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+    def add(self, url: str, kind: str, attempts: int, error: Exception = None):
+        """Record a job page given up on; only gone postings and timeouts are kept."""
+        job_id = job_id_from_url(url)
+        if job_id is None or kind not in (GONE, TIMEOUT):
+            return
+        entry = {"url": url, "job_id": job_id, "kind": kind, "attempts": attempts,
+                 "error": repr(error) if error is not None else None,
+                 "at": datetime.now(timezone.utc).isoformat(timespec="seconds")}
+        with self._lock:
+            if url in self._urls or url in self._timed_out:
+                return
+            if kind == TIMEOUT:
+                self._timed_out.add(url)
+                self._timeouts[url] += 1
+                dead = bool(self.timeout_runs) and self._timeouts[url] >= self.timeout_runs
+            else:
+                dead = True
+            if dead:
+                self._urls.add(url)
+                self.added += 1
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        if dead:
+            metrics.count("dead_letters")
+
+    def summary(self) -> str:
+        return f"{self.added} job pages dead-lettered this run, {len(self)} in {self.path}"
@@ -0,0 +1,16 @@
+# page_selectors.py
+# XPath selectors shared by every extraction backend (Selenium, JS, lxml).
+# Kept free of selenium imports so offline parsing can run in worker processes.
+
+JOBCARD_XPATH = '//article[@data-card-type="JobCard"]'
+JOBCARD_LINK_XPATH = './/a[@data-automation="job-list-item-link-overlay"]'
+DETAIL_FIELD_XPATHS = {
+    "job_name": '//h1',
+    "company_name": '//span[@data-automation="advertiser-name"]',
+    "work_type": '//span[@data-automation="job-detail-work-type"]',
+    "salary_range": '//span[@data-automation="job-detail-salary"]',
+}
+TOTAL_COUNT_XPATH = '//*[@data-automation="totalJobsCount"]'
+LOGIN_EMAIL_XPATH = '//input[@type="email" or @name="emailAddress"]'
+LOGIN_PASSWORD_XPATH = '//input[@type="password"]'
+LOGIN_SUBMIT_XPATH = '//button[@type="submit"]'
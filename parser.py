@@ -1,15 +1,49 @@
+import json
+
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 
+import config
+from page_selectors import JOBCARD_XPATH, JOBCARD_LINK_XPATH, DETAIL_FIELD_XPATHS
+
+# One execute_script call returns every card href as a JSON array
+LINKS_JS = """
+var cards = document.evaluate(arguments[0], document, null,
+                              XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+var hrefs = [];
+for (var i = 0; i < cards.snapshotLength; i++) {
+    var a = document.evaluate(arguments[1], cards.snapshotItem(i), null,
+                              XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    if (a && a.href) { hrefs.push(a.href); }
+}
+return JSON.stringify(hrefs);
+"""
+
+# One execute_script call returns every detail field as a JSON object
+DETAIL_JS = """
+var fields = arguments[0], out = {};
+for (var key in fields) {
+    var node = document.evaluate(fields[key], document, null,
+                                 XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    out[key] = node ? node.innerText : null;
+}
+return JSON.stringify(out);
+"""
+
+
+def _absolute(base_url: str, href: str) -> str:
+    return base_url + href if href.startswith("/") else href
+
+
 def extract_links_from_list_page(driver: WebDriver, base_url: str):
-    jobcards = driver.find_elements(By.XPATH, '//article[@data-card-type="JobCard"]')
+    jobcards = driver.find_elements(By.XPATH, JOBCARD_XPATH)
 
     links = []
     for jobcard in jobcards:
         try:
-            link_elem = jobcard.find_element(By.XPATH, './/a[@data-automation="job-list-item-link-overlay"]')
+            link_elem = jobcard.find_element(By.XPATH, JOBCARD_LINK_XPATH)
             href = link_elem.get_attribute("href")
-            full_link = base_url + href if href.startswith("/") else href
+            full_link = _absolute(base_url, href)
             links.append(full_link)
         except:
             continue
@@ -19,22 +53,22 @@ def extract_links_from_list_page(driver: WebDriver, base_url: str):
 
 def parse_job_detail(driver: WebDriver):
     try:
-        job_name = driver.find_element(By.XPATH, '//h1').text.strip()
+        job_name = driver.find_element(By.XPATH, DETAIL_FIELD_XPATHS["job_name"]).text.strip()
     except:
         job_name = None
 
     try:
-        company_name = driver.find_element(By.XPATH, '//span[@data-automation="advertiser-name"]').text.strip()
+        company_name = driver.find_element(By.XPATH, DETAIL_FIELD_XPATHS["company_name"]).text.strip()
     except:
         company_name = None
 
     try:
-        work_type = driver.find_element(By.XPATH, '//span[@data-automation="job-detail-work-type"]').text.strip()
+        work_type = driver.find_element(By.XPATH, DETAIL_FIELD_XPATHS["work_type"]).text.strip()
     except:
         work_type = None
 
     try:
-        salary_range = driver.find_element(By.XPATH, '//span[@data-automation="job-detail-salary"]').text.strip()
+        salary_range = driver.find_element(By.XPATH, DETAIL_FIELD_XPATHS["salary_range"]).text.strip()
     except:
         salary_range = None
 
@@ -44,3 +78,38 @@ def parse_job_detail(driver: WebDriver):
         "work_type": work_type,
         "salary_range": salary_range,
     }
+
+
+def extract_links_js(driver: WebDriver, base_url: str):
+    """Same as extract_links_from_list_page, in a single WebDriver round trip."""
+    hrefs = json.loads(driver.execute_script(LINKS_JS, JOBCARD_XPATH, JOBCARD_LINK_XPATH) or "[]")
+    return [_absolute(base_url, href) for href in hrefs if href]
+
+
+def parse_job_detail_js(driver: WebDriver):
+    """Same as parse_job_detail, in a single WebDriver round trip."""
+    payload = json.loads(driver.execute_script(DETAIL_JS, DETAIL_FIELD_XPATHS) or "{}")
+    return {
+        key: payload[key].strip() if payload.get(key) is not None else None
+        for key in DETAIL_FIELD_XPATHS
+    }
+
+
+def extract_links(driver: WebDriver, base_url: str):
+    """Link extraction using the configured PARSER_MODE."""
+    if config.PARSER_MODE == "js":
+        return extract_links_js(driver, base_url)
+    if config.PARSER_MODE == "html":
+        from html_parser import extract_links_from_html
+        return extract_links_from_html(driver.page_source, base_url)
+    return extract_links_from_list_page(driver, base_url)
+
+
+def parse_detail(driver: WebDriver):
+    """Detail parsing using the configured PARSER_MODE."""
+    if config.PARSER_MODE == "js":
+        return parse_job_detail_js(driver)
+    if config.PARSER_MODE == "html":
+        from html_parser import parse_job_detail_html
+        return parse_job_detail_html(driver.page_source)
+    return parse_job_detail(driver)
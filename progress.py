@@ -0,0 +1,68 @@
+# progress.py
+"""
+Crawl progress counters for the GUI panel: pages, jobs done / skipped out of
+the jobs known so far, rate and ETA. crawl() updates it from the worker
+threads; the GUI reads it on its poll timer.
+"""
+import threading
+import time
+from typing import Optional
+
+
+class Progress:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+        self.pages = 0
+        self.total = 0
+        self.done = 0
+        self.skipped = 0
+        self.total_final = False  # False while pagination may still add jobs
+        self._first_job = None
+
+    def page_done(self, new_jobs: int):
+        with self._lock:
+            self.pages += 1
+            self.total += new_jobs
+
+    def set_total(self, total: int, final: bool = True):
+        with self._lock:
+            self.total = total
+            self.total_final = final
+
+    def job_done(self, ok: bool = True):
+        with self._lock:
+            if self._first_job is None:
+                self._first_job = time.monotonic()
+            if ok:
+                self.done += 1
+            else:
+                self.skipped += 1
+
+    @property
+    def finished(self) -> int:
+        return self.done + self.skipped
+
+    def rate(self) -> float:
+        """Jobs per minute since the first job finished."""
+        if self._first_job is None or self.finished < 2:
+            return 0.0
+        elapsed = time.monotonic() - self._first_job
+        return (self.finished - 1) * 60 / elapsed if elapsed > 0 else 0.0
+
+    def eta_seconds(self) -> Optional[float]:
+        rate = self.rate()
+        if not rate or not self.total:
+            return None
+        return max(0, self.total - self.finished) * 60 / rate
+
+    def fraction(self) -> float:
+        return min(1.0, self.finished / self.total) if self.total else 0.0
+
+    def summary(self) -> str:
+        total = f"{self.total}" if self.total_final else f"{self.total}+"
+        eta = self.eta_seconds()
+        eta_text = time.strftime("%H:%M:%S", time.gmtime(eta)) if eta is not None else "--:--:--"
+        elapsed = time.strftime("%H:%M:%S", time.gmtime(time.monotonic() - self.started))
+        return (f"Pages {self.pages} | Jobs {self.done}/{total} (skipped {self.skipped}) | "
+                f"{self.rate():.1f} jobs/min | elapsed {elapsed} | ETA {eta_text}")
@@ -0,0 +1,212 @@
+# proxy_pool.py
+"""
+Proxy rotation for browsers and HTTP sessions (config.PROXIES).
+
+Every browser is launched behind one proxy, picked by ProxyPool.acquire:
+a weighted draw favouring proxies with a high success rate and low page
+latency (untried proxies start neutral). Each proxy allows at most
+PROXY_MAX_SESSIONS browsers at a time and one navigation per
+PROXY_MIN_INTERVAL seconds. PROXY_MAX_FAILURES block pages or errors in a
+row quarantine it for PROXY_QUARANTINE_SECONDS, doubled on every repeat;
+browsers behind a quarantined proxy are recycled onto another one.
+
+Chrome takes no credentials in --proxy-server, so authenticated proxies
+(user:pass@host:port) are answered by a small generated extension.
+"""
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from urllib.parse import quote, unquote, urlsplit
+
+import config
+import metrics
+from throttle import RateLimiter
+
+
+class Proxy:
+    """One proxy endpoint and its health counters (guarded by the pool's lock)."""
+
+    def __init__(self, spec: str):
+        parts = urlsplit(spec if "://" in spec else f"http://{spec}")
+        if not parts.hostname or not parts.port:
+            raise ValueError(f"Bad proxy {spec!r} (expected [scheme://][user:pass@]host:port)")
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.username = unquote(parts.username) if parts.username is not None else None
+        self.password = unquote(parts.password) if parts.password is not None else None
+        self.limiter = RateLimiter(config.PROXY_MIN_INTERVAL)
+
+        self.sessions = 0
+        self.pages = 0
+        self.blocks = 0
+        self.errors = 0
+        self.failures_in_row = 0
+        self.latency_ewma = None
+        self.quarantines = 0
+        self.quarantined_until = 0.0
+
+    @property
+    def server(self) -> str:
+        """scheme://host:port, without credentials (Chrome's --proxy-server)."""
+        return f"{self.scheme}://{self.host}:{self.port}"
+
+    @property
+    def url(self) -> str:
+        """Full proxy URL, credentials included (requests / urllib)."""
+        if self.username is None:
+            return self.server
+        auth = quote(self.username, safe="") + ":" + quote(self.password or "", safe="")
+        return f"{self.scheme}://{auth}@{self.host}:{self.port}"
+
+    @property
+    def requests_proxies(self) -> Dict[str, str]:
+        return {"http": self.url, "https": self.url}
+
+    def quarantined(self, now: float = None) -> bool:
+        return (now or time.monotonic()) < self.quarantined_until
+
+    def weight(self) -> float:
+        """Selection weight: smoothed success rate squared over page latency."""
+        success = (self.pages - self.blocks - self.errors + 1) / (self.pages + 2)
+        latency = self.latency_ewma if self.latency_ewma is not None else 1.0
+        return success * success / max(latency, 0.05)
+
+    def __str__(self) -> str:
+        return f"{self.host}:{self.port}"
+
+
+def parse_proxies(specs: List[str]) -> List[Proxy]:
+    return [Proxy(spec.strip()) for spec in specs if spec and spec.strip()]
+
+
+class ProxyPool:
+    """Health-weighted proxy selection shared by every driver of a crawl."""
+
+    def __init__(self, proxies: List[str] = None, log: Callable = print):
+        self.proxies = parse_proxies(config.PROXIES if proxies is None else proxies)
+        if not self.proxies:
+            raise ValueError("ProxyPool needs at least one proxy")
+        self.log = log
+        self.closed = False
+        self._cond = threading.Condition()
+
+    def _available(self, now: float) -> List[Proxy]:
+        return [p for p in self.proxies
+                if not p.quarantined(now) and p.sessions < config.PROXY_MAX_SESSIONS]
+
+    def acquire(self, timeout: float = None) -> Proxy:
+        """
+        A proxy for one new session, waiting (up to PROXY_WAIT_TIMEOUT) while
+        every proxy is quarantined or at its session cap.
+        """
+        timeout = config.PROXY_WAIT_TIMEOUT if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self.closed:
+                    raise RuntimeError("Proxy pool closed")
+                now = time.monotonic()
+                available = self._available(now)
+                if available:
+                    proxy = random.choices(available, weights=[p.weight() for p in available])[0]
+                    proxy.sessions += 1
+                    return proxy
+                if now >= deadline:
+                    raise RuntimeError(f"No proxy available within {timeout:g}s")
+                # a release notifies; the end of a quarantine does not
+                wake = [p.quarantined_until for p in self.proxies if p.quarantined(now)]
+                self._cond.wait(min([deadline] + wake) - now)
+
+    def release(self, proxy: Optional[Proxy]):
+        if proxy is None:
+            return
+        with self._cond:
+            proxy.sessions = max(0, proxy.sessions - 1)
+            self._cond.notify()
+
+    def record(self, proxy: Optional[Proxy], latency: float = None, blocked: bool = False,
+               error: bool = False):
+        """Feed one page (or request) outcome through `proxy`."""
+        if proxy is None:
+            return
+        with self._cond:
+            proxy.pages += 1
+            if latency is not None and not error:
+                proxy.latency_ewma = latency if proxy.latency_ewma is None \
+                    else 0.8 * proxy.latency_ewma + 0.2 * latency
+            if not (blocked or error):
+                proxy.failures_in_row = 0
+                return
+            proxy.blocks += blocked
+            proxy.errors += error
+            proxy.failures_in_row += 1
+            if proxy.failures_in_row < config.PROXY_MAX_FAILURES or proxy.quarantined():
+                return
+            cooldown = config.PROXY_QUARANTINE_SECONDS * 2 ** proxy.quarantines
+            proxy.quarantines += 1
+            proxy.failures_in_row = 0
+            proxy.quarantined_until = time.monotonic() + cooldown
+        metrics.count("proxy_quarantines")
+        self.log(f"[proxy] {proxy}: {config.PROXY_MAX_FAILURES} failures in a row → "
+                 f"quarantined for {cooldown:.0f}s")
+
+    def close(self):
+        """Fail pending and future acquire() calls."""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def summary(self) -> str:
+        with self._cond:
+            parts = []
+            for p in self.proxies:
+                latency = f"{p.latency_ewma:.2f}s" if p.latency_ewma is not None else "-"
+                state = ", quarantined" if p.quarantined() else ""
+                parts.append(f"{p} {p.pages} pages/{p.blocks} blocks/{p.errors} errors {latency}{state}")
+        return "; ".join(parts)
+
+
+def proxy_of(driver) -> Optional[Proxy]:
+    """The proxy a driver was launched behind (None without a proxy pool)."""
+    return getattr(driver, "scraper_proxy", None)
+
+
+AUTH_MANIFEST = {
+    "name": "Proxy auth",
+    "version": "1.0",
+    "manifest_version": 3,
+    "permissions": ["webRequest", "webRequestAuthProvider"],
+    "host_permissions": ["<all_urls>"],
+    "background": {"service_worker": "background.js"},
+}
+
+AUTH_JS = """
+chrome.webRequest.onAuthRequired.addListener(
+    function (details, callback) {
+        callback(details.isProxy ? {authCredentials: %s} : {});
+    },
+    {urls: ["<all_urls>"]},
+    ["asyncBlocking"]
+);
+"""
+
+
+def auth_extension(proxy: Proxy) -> str:
+    """Directory of an unpacked extension answering the proxy's auth challenge."""
+    digest = hashlib.sha1(proxy.url.encode("utf-8")).hexdigest()[:12]
+    path = os.path.join(config.PROXY_AUTH_EXTENSION_DIR, digest)
+    if not os.path.exists(os.path.join(path, "background.js")):
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(AUTH_MANIFEST, f)
+        credentials = json.dumps({"username": proxy.username, "password": proxy.password or ""})
+        tmp = os.path.join(path, f"background.js.{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(AUTH_JS % credentials)
+        os.replace(tmp, os.path.join(path, "background.js"))
+    return path
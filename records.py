@@ -0,0 +1,90 @@
+# records.py
+"""
+Scraped job records.
+
+JobRecord is one job with fixed slots (no per-instance __dict__). RecordBatch
+stores a batch column by column, the layout Arrow and pandas are built
+from, so a batch converts without an intermediate dict per row. Sinks, the
+crawl engine and the in-memory result all use these two types.
+"""
+from dataclasses import dataclass, fields
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# record attribute → output column (the order of every output file)
+COLUMN_NAMES = {
+    "job_name": "Job Name",
+    "company_name": "Company",
+    "work_type": "Work Type",
+    "salary_range": "Salary Range",
+    "link": "Link",
+}
+COLUMNS = list(COLUMN_NAMES.values())
+
+
+@dataclass(slots=True)
+class JobRecord:
+    job_name: Optional[str] = None
+    company_name: Optional[str] = None
+    work_type: Optional[str] = None
+    salary_range: Optional[str] = None
+    link: Optional[str] = None
+
+    @classmethod
+    def from_parsed(cls, link: str, parsed: dict) -> "JobRecord":
+        """parse_job_detail output + link."""
+        return cls(parsed.get("job_name"), parsed.get("company_name"), parsed.get("work_type"),
+                   parsed.get("salary_range"), link)
+
+    def values(self) -> Tuple[Optional[str], ...]:
+        """Field values in COLUMNS order."""
+        return (self.job_name, self.company_name, self.work_type, self.salary_range, self.link)
+
+    def to_row(self) -> Dict[str, Optional[str]]:
+        """{output column: value}"""
+        return dict(zip(COLUMNS, self.values()))
+
+
+FIELDS = [f.name for f in fields(JobRecord)]
+
+
+class RecordBatch:
+    """Column-oriented batch of JobRecords: one list per field."""
+
+    __slots__ = ("_columns",)
+
+    def __init__(self):
+        self._columns: List[list] = [[] for _ in FIELDS]
+
+    def append(self, record: JobRecord):
+        for column, value in zip(self._columns, record.values()):
+            column.append(value)
+
+    def __len__(self) -> int:
+        return len(self._columns[0])
+
+    def __iter__(self) -> Iterator[JobRecord]:
+        return (JobRecord(*values) for values in zip(*self._columns))
+
+    def clear(self):
+        for column in self._columns:
+            column.clear()
+
+    def rows(self) -> Iterator[tuple]:
+        """Value tuples in COLUMNS order (csv.writer rows)."""
+        return zip(*self._columns)
+
+    @property
+    def columns(self) -> Dict[str, list]:
+        """{output column: values}"""
+        return dict(zip(COLUMNS, self._columns))
+
+    def to_arrow(self, schema=None):
+        """pyarrow Table built straight from the column lists (needs pyarrow)."""
+        import pyarrow as pa
+
+        return pa.Table.from_pydict(self.columns, schema=schema)
+
+    def to_pandas(self):
+        import pandas as pd
+
+        return pd.DataFrame(self.columns, columns=COLUMNS)
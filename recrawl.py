@@ -0,0 +1,94 @@
+# recrawl.py
+"""
+Change-aware revisits of already scraped jobs (main.py --recrawl).
+
+Every scraped job keeps a fingerprint of its parsed fields in the seen-jobs
+index. A recrawl spends at most RECRAWL_BUDGET detail pages on the open
+jobs most worth a look (SeenIndex.due): the longer since a job was last
+checked and the more often it changed before, the sooner it comes back.
+Jobs whose fields changed are written to the sink; postings that now show
+a not-found page or redirect away from their /job/<id> URL are marked
+closed and left out of later recrawls (until a list page shows them again).
+"""
+import threading
+from collections import Counter
+from typing import Callable
+
+import config
+from archive import HtmlArchive
+from driver_pool import DriverPool, DriverSlot, parse_job_page
+from nav_policy import gone_reason
+from page_selectors import DETAIL_FIELD_XPATHS
+from progress import Progress
+from records import JobRecord
+from seen_index import SeenIndex, fingerprint
+
+
+def revisit(slot: DriverSlot, job: tuple):
+    """("closed", reason) or ("open", parsed) for one (job_id, url, score)."""
+    _, url, _ = job
+    slot.get(url, ready_xpath=DETAIL_FIELD_XPATHS["job_name"])
+    slot.delay()
+    reason = gone_reason(slot.driver, url)
+    if reason:
+        return "closed", reason
+    parsed = parse_job_page(slot, url)
+    if not parsed.get("job_name"):
+        raise RuntimeError("no job title on the page")
+    return "open", parsed
+
+
+def recrawl(sink, index: SeenIndex, budget: int = None, num_workers: int = None,
+            stop_event: threading.Event = None, log: Callable = print,
+            progress: Progress = None) -> Counter:
+    """
+    Revisit up to `budget` known jobs, best first, and write the changed
+    ones to `sink`. Returns counts of checked / changed / unchanged /
+    closed / failed jobs.
+    """
+    budget = config.RECRAWL_BUDGET if budget is None else budget
+    progress = progress or Progress()
+    counts = Counter()
+    jobs = index.due(budget, min_age_hours=config.RECRAWL_MIN_AGE_HOURS,
+                     change_weight=config.RECRAWL_CHANGE_WEIGHT)
+    progress.set_total(len(jobs))
+    log(f"Recrawling {len(jobs)} of {len(index)} known jobs (budget {budget})...")
+    if not jobs:
+        return counts
+
+    def on_result(i, job, result):
+        job_id, url, score = job
+        if result is None:
+            counts["failed"] += 1
+            progress.job_done(ok=False)
+            log(f"[{i + 1}] Skipped {url}")
+            return
+        counts["checked"] += 1
+        progress.job_done()
+        status, value = result
+        if status == "closed":
+            index.record_check(job_id, closed_reason=value)
+            counts["closed"] += 1
+            log(f"[{i + 1}] Closed ({value}): {url}")
+        elif index.record_check(job_id, fingerprint(value)):
+            sink.write(JobRecord.from_parsed(url, value))
+            counts["changed"] += 1
+            log(f"[{i + 1}] Changed (score {score:.2f}):", value)
+        else:
+            counts["unchanged"] += 1
+
+    archive = HtmlArchive() if config.ARCHIVE_DIR else None
+    pool = DriverPool(num_workers=num_workers, stop_event=stop_event, log=log, archive=archive)
+    try:
+        pool.map(revisit, jobs, on_result=on_result)
+    finally:
+        sink.flush()
+        if archive is not None:
+            archive.close()
+    log("Recrawl:", summary(counts))
+    return counts
+
+
+def summary(counts: Counter) -> str:
+    return (f"{counts['checked']} checked, {counts['changed']} changed, {counts['unchanged']} unchanged, "
+            f"{counts['closed']} closed, {counts['failed']} failed")
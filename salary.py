@@ -0,0 +1,165 @@
+# salary.py
+"""
+Salary normalization: the raw "Salary Range" text ("Rp 8.000.000 – Rp
+12.000.000 per month", "RM 3,500 - RM 4,000 monthly", "Rp 12 jt – 18 jt",
+"$25 - $30 per hour", ...) → numeric Salary Min / Salary Max plus Salary
+Currency and Salary Period columns.
+
+Vectorized over a pandas column: the column is factorized first (job boards
+repeat a few thousand salary labels across any number of rows), the unique
+labels are parsed with pandas string ops, and the results are taken back to
+every row by code.
+
+Number rules:
+- "." or "," followed by exactly three digits is a thousands separator
+  ("8.000.000", "3,500", "1,234.5"); any other is a decimal point ("8,5 jt")
+- suffixes scale the number: K / rb / ribu (thousand), jt / juta / M (million);
+  a suffix on the upper bound only ("12 – 18 jt") applies to both bounds
+- "up to X" has no minimum, "from X" no maximum; a single figure is both
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from sinks import format_from_path
+
+SALARY_COLUMNS = ["Salary Min", "Salary Max", "Salary Currency", "Salary Period"]
+
+# currency of a label without a currency mark, and of a bare "$"
+COUNTRY_CURRENCY = {"id": "IDR", "my": "MYR", "sg": "SGD", "ph": "PHP"}
+COUNTRY_DOLLAR = {"sg": "SGD"}
+
+# first match wins (S$ before $)
+CURRENCY_PATTERNS = [
+    (r"\bidr\b|\brp", "IDR"),
+    (r"\bmyr\b|\brm\b|\brm(?=\d)", "MYR"),
+    (r"\bsgd\b|s\$", "SGD"),
+    (r"\bphp\b|₱", "PHP"),
+    (r"\busd\b|us\$", "USD"),
+    (r"\$", "$"),
+]
+
+PERIOD_PATTERNS = [
+    (r"hour|hourly|\bhr\b|\bjam\b", "hour"),
+    (r"\bday\b|daily|\bhari\b", "day"),
+    (r"week|\bminggu\b", "week"),
+    (r"month|\bmo\b|bulan", "month"),
+    (r"year|annual|annum|\byr\b|tahun|\bp\.?a\b", "year"),
+]
+
+MULTIPLIERS = {"k": 1e3, "rb": 1e3, "ribu": 1e3, "jt": 1e6, "juta": 1e6, "m": 1e6}
+
+NUMBER_RE = r"(?P<number>\d(?:[\d.,]*\d)?)\s*(?P<suffix>ribu|rb|juta|jt|k|m)?(?![a-z])"
+THOUSANDS_RE = r"[.,](?=\d{3}(?!\d))"
+UP_TO_RE = r"^\W*(?:up to|hingga|sampai|maks|max)"
+FROM_RE = r"^\W*(?:from|mulai|min)\b"
+
+
+def _match_first(text: pd.Series, patterns) -> pd.Series:
+    conditions = [text.str.contains(pattern, regex=True, na=False).to_numpy(bool) for pattern, _ in patterns]
+    values = [value for _, value in patterns]
+    return pd.Series(np.select(conditions, values, default=None), index=text.index, dtype=object)
+
+
+def _to_number(numbers: pd.Series) -> pd.Series:
+    numbers = numbers.str.replace(THOUSANDS_RE, "", regex=True).str.replace(",", ".", regex=False)
+    return pd.to_numeric(numbers, errors="coerce")
+
+
+def parse_labels(labels: pd.Series, country: str = None) -> pd.DataFrame:
+    """Parse salary labels (one row per label) into SALARY_COLUMNS."""
+    text = labels.astype("string").str.lower()
+
+    found = text.str.extractall(NUMBER_RE)
+    values = _to_number(found["number"]) * found["suffix"].map(MULTIPLIERS).fillna(1.0)
+    values = values.to_numpy(float)
+    match = found.index.get_level_values("match")
+    rows = found.index.get_level_values(0)
+    has_suffix = found["suffix"].notna().to_numpy()
+
+    low = pd.Series(np.nan, index=labels.index)
+    high = pd.Series(np.nan, index=labels.index)
+    low_suffix = pd.Series(False, index=labels.index)
+    low.loc[rows[match == 0]] = values[match == 0]
+    low_suffix.loc[rows[match == 0]] = has_suffix[match == 0]
+    second = match == 1
+    high.loc[rows[second]] = values[second]
+
+    # "12 – 18 jt": the upper bound's suffix applies to a bare lower bound
+    scale = pd.Series(1.0, index=labels.index)
+    scale.loc[rows[second]] = found["suffix"][second].map(MULTIPLIERS).fillna(1.0).to_numpy()
+    rescale = ~low_suffix & (scale > 1) & (low * scale <= high)
+    low = low.where(~rescale, low * scale)
+
+    high = high.fillna(low)
+    up_to = text.str.contains(UP_TO_RE, regex=True, na=False).to_numpy(bool) & high.notna().to_numpy()
+    from_ = text.str.contains(FROM_RE, regex=True, na=False).to_numpy(bool)
+    low = low.mask(up_to & (low == high))
+    high = high.mask(from_ & (low == high))
+
+    currency = _match_first(text, CURRENCY_PATTERNS)
+    currency = currency.mask(currency == "$", COUNTRY_DOLLAR.get(country, "USD"))
+    if country in COUNTRY_CURRENCY:
+        currency = currency.where(currency.notna() | low.isna() & high.isna(),
+                                  COUNTRY_CURRENCY[country])
+
+    return pd.DataFrame({
+        "Salary Min": low.to_numpy(float),
+        "Salary Max": high.to_numpy(float),
+        "Salary Currency": currency.to_numpy(object),
+        "Salary Period": _match_first(text, PERIOD_PATTERNS).to_numpy(object),
+    }, index=labels.index)
+
+
+def normalize_salaries(salaries: pd.Series, country: str = None) -> pd.DataFrame:
+    """SALARY_COLUMNS for a whole column, each distinct label parsed once."""
+    codes, uniques = pd.factorize(salaries)
+    parsed = parse_labels(pd.Series(uniques, dtype=object), country=country)
+    # code -1 (missing label) → the all-empty row appended at the end
+    parsed = pd.concat([parsed, pd.DataFrame({col: [None] for col in SALARY_COLUMNS})],
+                       ignore_index=True)
+    out = parsed.iloc[np.where(codes < 0, len(uniques), codes)].reset_index(drop=True)
+    out.index = salaries.index
+    out["Salary Min"] = out["Salary Min"].astype(float)
+    out["Salary Max"] = out["Salary Max"].astype(float)
+    out["Salary Currency"] = out["Salary Currency"].astype("category")
+    out["Salary Period"] = out["Salary Period"].astype("category")
+    return out
+
+
+def add_salary_columns(df: pd.DataFrame, country: str = None) -> pd.DataFrame:
+    """df with SALARY_COLUMNS (re)computed from "Salary Range", right after it."""
+    df = df.drop(columns=[col for col in SALARY_COLUMNS if col in df.columns])
+    parsed = normalize_salaries(df["Salary Range"], country=country)
+    at = df.columns.get_loc("Salary Range") + 1
+    return pd.concat([df.iloc[:, :at], parsed, df.iloc[:, at:]], axis=1)
+
+
+def read_output(path: str) -> pd.DataFrame:
+    fmt = format_from_path(path)
+    if fmt == "parquet":
+        return pd.read_parquet(path)
+    if fmt == "jsonl":
+        return pd.read_json(path, lines=True, dtype=False)
+    return pd.read_csv(path, dtype=str, keep_default_na=False, na_values=[""], encoding="utf-8-sig")
+
+
+def write_output(df: pd.DataFrame, path: str):
+    """Replace an output file atomically, in the format of its extension."""
+    fmt = format_from_path(path)
+    tmp = f"{path}.tmp"
+    if fmt == "parquet":
+        df.to_parquet(tmp, index=False)
+    elif fmt == "jsonl":
+        df.to_json(tmp, orient="records", lines=True, force_ascii=False)
+    else:
+        df.to_csv(tmp, index=False, encoding="utf-8-sig", float_format="%.15g")
+    os.replace(tmp, path)
+
+
+def normalize_file(path: str, country: str = None) -> int:
+    """Add the salary columns to an existing output file in place; returns the row count."""
+    df = add_salary_columns(read_output(path), country=country)
+    write_output(df, path)
+    return len(df)
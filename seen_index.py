@@ -0,0 +1,210 @@
+# seen_index.py
+"""
+Persistent index of already-scraped jobs for incremental crawls.
+
+A SQLite file next to the output CSV stores canonical job IDs with their
+first/last-seen timestamps, so repeat runs skip known jobs and stop
+paginating once a whole list page is already known. The recrawl columns
+(fingerprint of the scraped fields, checks, changes, open/closed status)
+are kept by recrawl.py.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional, Set, Tuple
+
+import config
+from utils import canonical_job_url, job_id_from_url
+
+INDEX_FILENAME = "seen_jobs.sqlite"
+FINGERPRINT_FIELDS = ("job_name", "company_name", "work_type", "salary_range")
+
+# added to indexes written before recrawl existed
+RECRAWL_COLUMNS = {
+    "fingerprint": "TEXT",
+    "last_checked": "TEXT",
+    "checks": "INTEGER NOT NULL DEFAULT 0",
+    "changes": "INTEGER NOT NULL DEFAULT 0",
+    "status": "TEXT NOT NULL DEFAULT 'open'",
+    "closed_reason": "TEXT",
+}
+
+_MARK_SQL = """INSERT INTO jobs (job_id, url, first_seen, last_seen, fingerprint, last_checked)
+               VALUES (?, ?, ?, ?, ?, ?)
+               ON CONFLICT(job_id) DO UPDATE SET
+                   last_seen = excluded.last_seen,
+                   fingerprint = COALESCE(excluded.fingerprint, jobs.fingerprint),
+                   last_checked = COALESCE(excluded.last_checked, jobs.last_checked)"""
+
+
+def default_index_path(output_file: str = None) -> str:
+    output_file = output_file or config.OUTPUT_CSV
+    return os.path.join(os.path.dirname(os.path.abspath(output_file)), INDEX_FILENAME)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def fingerprint(parsed: dict) -> str:
+    """Hash of a parse_job_detail result (whitespace-insensitive)."""
+    values = [" ".join(parsed[f].split()) if parsed.get(f) else None for f in FINGERPRINT_FIELDS]
+    return hashlib.sha1(json.dumps(values, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+
+class SeenIndex:
+    def __init__(self, path: str = None):
+        self.path = path or default_index_path()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # pool workers report results from their own threads
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS jobs (
+                       job_id     TEXT PRIMARY KEY,
+                       url        TEXT,
+                       first_seen TEXT NOT NULL,
+                       last_seen  TEXT NOT NULL
+                   )"""
+            )
+            existing = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            for column, decl in RECRAWL_COLUMNS.items():
+                if column not in existing:
+                    self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {decl}")
+
+    def __contains__(self, job_id: str) -> bool:
+        return bool(job_id) and job_id in self.known([job_id])
+
+    def known(self, job_ids: Iterable[str]) -> Set[str]:
+        """The subset of job_ids already in the index."""
+        job_ids = list(job_ids)
+        if not job_ids:
+            return set()
+        marks = ",".join("?" * len(job_ids))
+        with self._lock:
+            rows = self._conn.execute(f"SELECT job_id FROM jobs WHERE job_id IN ({marks})", job_ids)
+            return {row[0] for row in rows}
+
+    def mark(self, job_id: str, url: str = None, fingerprint: str = None):
+        """Record a scraped job (insert, or refresh last_seen and the fingerprint)."""
+        if not job_id:
+            return
+        now = _now()
+        with self._lock, self._conn:
+            self._conn.execute(_MARK_SQL, (job_id, url, now, now, fingerprint, now if fingerprint else None))
+
+    def mark_many(self, jobs: Iterable[Tuple[str, str, str]]):
+        """mark() for (job_id, url, fingerprint) tuples, in one transaction."""
+        now = _now()
+        rows = [(job_id, url, now, now, fp, now if fp else None) for job_id, url, fp in jobs if job_id]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(_MARK_SQL, rows)
+
+    def touch(self, job_ids: Iterable[str]):
+        """Refresh last_seen for known jobs seen again on a list page (they are open)."""
+        now = _now()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE jobs SET last_seen = ?, status = 'open', closed_reason = NULL WHERE job_id = ?",
+                [(now, job_id) for job_id in job_ids])
+
+    def due(self, limit: int, min_age_hours: float = 0.0,
+            change_weight: float = 1.0) -> List[Tuple[str, str, float]]:
+        """
+        (job_id, url, score) of the `limit` open jobs most worth revisiting,
+        best first. score = days since the last check (or scrape) x
+        (1 + change_weight x smoothed change rate); jobs checked less than
+        min_age_hours ago are left out.
+        """
+        with self._lock:
+            return self._conn.execute(
+                """SELECT job_id, url, age * (1 + ? * change_rate) AS score FROM (
+                       SELECT job_id, url,
+                              julianday(?) - julianday(COALESCE(last_checked, last_seen)) AS age,
+                              (changes + 1.0) / (checks + 2.0) AS change_rate
+                       FROM jobs WHERE status = 'open' AND url IS NOT NULL)
+                   WHERE age * 24 >= ?
+                   ORDER BY score DESC, job_id LIMIT ?""",
+                (change_weight, _now(), min_age_hours, limit),
+            ).fetchall()
+
+    def record_check(self, job_id: str, fingerprint: str = None, closed_reason: str = None) -> bool:
+        """
+        Store a revisit: the new fingerprint, or closed_reason for a posting
+        that is gone. Returns True when the fields changed since the last
+        fingerprint.
+        """
+        now = _now()
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT fingerprint FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            previous = row[0] if row else None
+            changed = fingerprint is not None and previous is not None and fingerprint != previous
+            if closed_reason:
+                self._conn.execute(
+                    """UPDATE jobs SET last_checked = ?, checks = checks + 1, status = 'closed',
+                           closed_reason = ? WHERE job_id = ?""",
+                    (now, closed_reason, job_id))
+            else:
+                self._conn.execute(
+                    """UPDATE jobs SET last_checked = ?, checks = checks + 1, changes = changes + ?,
+                           fingerprint = COALESCE(?, fingerprint) WHERE job_id = ?""",
+                    (now, int(changed), fingerprint, job_id))
+        return changed
+
+    def status_counts(self) -> dict:
+        """{status: jobs}"""
+        with self._lock:
+            return dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _link_of(item) -> str:
+    return item["link"] if isinstance(item, dict) else item
+
+
+def filter_new(items: list, base_url: str, run_ids: Set[str],
+               index: Optional[SeenIndex] = None) -> Tuple[List, bool]:
+    """
+    Canonicalise one list page's links (str or list-only job dicts), drop
+    duplicates within the run and jobs already in the index.
+
+    Returns (new_items, page_all_known). page_all_known is True when the page
+    had jobs and every one of them was already in the index.
+    """
+    ids = [job_id_from_url(_link_of(item)) for item in items]
+    known = index.known(i for i in ids if i) if index is not None else set()
+    if known:
+        index.touch(known)
+
+    fresh = []
+    for item, job_id in zip(items, ids):
+        if job_id is None:
+            # not a recognisable job link, keep it untouched
+            fresh.append(item)
+            continue
+        if job_id in run_ids or job_id in known:
+            continue
+        run_ids.add(job_id)
+
+        link = canonical_job_url(base_url, job_id)
+        if isinstance(item, dict):
+            item = dict(item, link=link)
+        else:
+            item = link
+        fresh.append(item)
+
+    page_all_known = bool(ids) and all(i is not None and i in known for i in ids)
+    return fresh, page_all_known
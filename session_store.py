@@ -0,0 +1,294 @@
+# session_store.py
+"""
+Browser sessions reused across drivers and runs (SESSION_REUSE).
+
+After a clean page load (no block page) a driver's cookies, localStorage
+and user agent are saved to COOKIES_FILE, at most every
+SESSION_SAVE_INTERVAL seconds and one session per proxy (clearance cookies
+belong to an exit IP). Every new driver gets the stored session before its
+first navigation, through CDP (cookies, user agent and a localStorage seed
+script), so restarted drivers skip the cookieless warm-up and the
+challenges it draws; HTTP clients start with the cookies too. Sessions
+older than SESSION_MAX_AGE_HOURS, expired cookies and the session of a
+proxy that just hit a block page are dropped.
+
+With SESSION_PROFILE_DIR browsers run on persistent Chrome profiles instead
+of temporary ones. A profile belongs to one proxy and is leased to one
+browser at a time (a lock file next to it also keeps other scraper
+processes out); it is cleared when its browser hits a block page.
+"""
+import json
+import os
+import pickle
+import threading
+import time
+from itertools import count
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+from selenium.webdriver.common.by import By
+
+import config
+import metrics
+from page_selectors import LOGIN_EMAIL_XPATH, LOGIN_PASSWORD_XPATH, LOGIN_SUBMIT_XPATH
+from proxy_pool import proxy_of
+
+LOCAL_STORAGE_JS = "return JSON.stringify(Object.assign({}, window.localStorage));"
+
+# runs before the page's own scripts on every document of the saved origin
+SEED_STORAGE_JS = """
+(function (origin, items) {
+    if (location.origin !== origin) { return; }
+    for (var key in items) {
+        if (window.localStorage.getItem(key) === null) { window.localStorage.setItem(key, items[key]); }
+    }
+})(%s, %s);
+"""
+
+SAME_SITE = {"strict": "Strict", "lax": "Lax", "none": "None"}
+
+
+def _key(proxy) -> str:
+    return str(proxy) if proxy is not None else "direct"
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _cdp_cookie(cookie: dict, origin: str) -> dict:
+    """Selenium cookie dict → CDP Network.CookieParam."""
+    param = {"name": cookie["name"], "value": cookie["value"], "path": cookie.get("path", "/"),
+             "secure": bool(cookie.get("secure")), "httpOnly": bool(cookie.get("httpOnly"))}
+    if cookie.get("domain"):
+        param["domain"] = cookie["domain"]
+    else:
+        param["url"] = origin
+    if cookie.get("expiry"):
+        param["expires"] = cookie["expiry"]
+    same_site = SAME_SITE.get(str(cookie.get("sameSite", "")).lower())
+    if same_site:
+        param["sameSite"] = same_site
+    return param
+
+
+class SessionStore:
+    """Saved sessions by proxy, shared by every driver of a crawl (thread-safe)."""
+
+    def __init__(self, path: str = None, log: Callable = print):
+        self.path = path or config.COOKIES_FILE
+        self.log = log
+        self.saved = 0
+        self.restored = 0
+        self._lock = threading.Lock()
+        self._last_save = {}  # proxy key → monotonic time of the last save
+        self._sessions = self._load()
+
+    @staticmethod
+    def _expired(session: dict) -> bool:
+        return time.time() - session["saved_at"] > config.SESSION_MAX_AGE_HOURS * 3600
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "rb") as f:
+                sessions = pickle.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self.log(f"[session] Ignoring unreadable {self.path}: {e!r}")
+            return {}
+        if not isinstance(sessions, dict):
+            return {}
+        return {key: s for key, s in sessions.items() if not self._expired(s)}
+
+    def _write(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(self._sessions, f)
+        os.replace(tmp, self.path)
+
+    def get(self, proxy=None) -> Optional[dict]:
+        """The stored session for a proxy (None for direct), unless expired."""
+        with self._lock:
+            session = self._sessions.get(_key(proxy))
+            if session is not None and self._expired(session):
+                del self._sessions[_key(proxy)]
+                session = None
+            return session
+
+    def save(self, driver, proxy=None, force: bool = False, logged_in: bool = None) -> bool:
+        """
+        Store the driver's session (skipped within SESSION_SAVE_INTERVAL of
+        the last save unless force). Returns True if it was saved.
+        """
+        key = _key(proxy)
+        now = time.monotonic()
+        with self._lock:
+            last = self._last_save.get(key)
+            if not force and last is not None and now - last < config.SESSION_SAVE_INTERVAL:
+                return False
+            self._last_save[key] = now  # claimed before the round trips: one worker saves
+            previous = self._sessions.get(key)
+        url = driver.current_url or ""
+        if not url.startswith("http"):
+            return False
+        try:
+            storage = json.loads(driver.execute_script(LOCAL_STORAGE_JS) or "{}")
+        except Exception:
+            storage = {}
+        if logged_in is None:
+            logged_in = bool(previous and previous.get("logged_in"))
+        session = {
+            "saved_at": time.time(),
+            "origin": _origin(url),
+            "user_agent": driver.execute_script("return navigator.userAgent"),
+            "cookies": driver.get_cookies(),
+            "local_storage": storage,
+            "logged_in": logged_in,
+        }
+        with self._lock:
+            self._sessions[key] = session
+            self._write()
+            self.saved += 1
+        metrics.count("sessions_saved")
+        return True
+
+    def restore(self, driver, proxy=None) -> bool:
+        """Load the stored session into a fresh driver (before its first page)."""
+        session = self.get(proxy)
+        if session is None:
+            return False
+        now = time.time()
+        cookies = [_cdp_cookie(c, session["origin"]) for c in session["cookies"]
+                   if not c.get("expiry") or c["expiry"] > now]
+        if session.get("user_agent"):
+            driver.execute_cdp_cmd("Network.setUserAgentOverride", {"userAgent": session["user_agent"]})
+        if cookies:
+            driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+        if session["local_storage"]:
+            source = SEED_STORAGE_JS % (json.dumps(session["origin"]), json.dumps(session["local_storage"]))
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})
+        with self._lock:
+            self.restored += 1
+        metrics.count("sessions_restored")
+        return True
+
+    def apply(self, http_session, proxy=None) -> bool:
+        """Give a requests.Session the stored cookies and user agent."""
+        session = self.get(proxy)
+        if session is None:
+            return False
+        now = time.time()
+        for c in session["cookies"]:
+            if not c.get("expiry") or c["expiry"] > now:
+                http_session.cookies.set(c["name"], c["value"], domain=c.get("domain"), path=c.get("path", "/"))
+        if session.get("user_agent"):
+            http_session.headers["User-Agent"] = session["user_agent"]
+        return True
+
+    def invalidate(self, proxy=None):
+        """Forget a proxy's session (its cookies just met a block page)."""
+        with self._lock:
+            if self._sessions.pop(_key(proxy), None) is not None:
+                self._write()
+            self._last_save.pop(_key(proxy), None)
+
+    # --- persistent profiles ---
+
+    def lease_profile(self, proxy=None) -> Optional[str]:
+        """A persistent profile directory for this proxy no browser is using (None = off)."""
+        if not config.SESSION_PROFILE_DIR:
+            return None
+        base = os.path.join(config.SESSION_PROFILE_DIR, _key(proxy).replace(":", "_"))
+        os.makedirs(base, exist_ok=True)
+        for i in count():
+            path = os.path.join(base, f"profile-{i}")
+            if _lock_profile(path):
+                os.makedirs(path, exist_ok=True)
+                return path
+
+    @staticmethod
+    def release_profile(path: Optional[str]):
+        if path is not None:
+            try:
+                os.remove(path + ".lock")
+            except FileNotFoundError:
+                pass
+
+    def summary(self) -> str:
+        return f"{self.restored} sessions restored, {self.saved} saved to {self.path}"
+
+
+def _lock_profile(path: str) -> bool:
+    """Take the profile's lock file; a lock left by a dead process is taken over."""
+    lock = path + ".lock"
+    for _ in range(2):
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                with open(lock) as f:
+                    pid = int(f.read().strip() or 0)
+                os.kill(pid, 0)
+                return False
+            except (ProcessLookupError, ValueError):
+                try:
+                    os.remove(lock)  # stale
+                except FileNotFoundError:
+                    pass
+            except FileNotFoundError:
+                pass  # released meanwhile
+            except OSError:
+                return False  # held by another user's live process
+            continue
+        with os.fdopen(fd, "w") as f:
+            f.write(str(os.getpid()))
+        return True
+    return False
+
+
+def login(slot, base_url: str, log: Callable = print) -> bool:
+    """
+    Sign in with LOGIN_EMAIL / LOGIN_PASSWORD, then wait up to LOGIN_TIMEOUT
+    for the browser to be back on the site (time to finish a code or
+    captcha by hand in the window). Returns True once signed in.
+    """
+    slot.get(base_url.rstrip("/") + config.LOGIN_PATH)
+    driver = slot.driver
+    credentials = ((LOGIN_EMAIL_XPATH, config.LOGIN_EMAIL), (LOGIN_PASSWORD_XPATH, config.LOGIN_PASSWORD))
+    for xpath, value in credentials:
+        fields = driver.find_elements(By.XPATH, xpath)
+        if fields and value:
+            fields[0].clear()
+            fields[0].send_keys(value)
+    buttons = driver.find_elements(By.XPATH, LOGIN_SUBMIT_XPATH)
+    if buttons:
+        buttons[0].click()
+
+    site = urlsplit(base_url).netloc
+    deadline = time.monotonic() + config.LOGIN_TIMEOUT
+    log(f"Waiting up to {config.LOGIN_TIMEOUT}s for the login to finish...")
+    while time.monotonic() < deadline:
+        parts = urlsplit(driver.current_url)
+        if parts.netloc == site and "login" not in parts.path:
+            return True
+        time.sleep(1)
+    return False
+
+
+def ensure_login(slot, base_url: str, store: SessionStore = None, log: Callable = print) -> bool:
+    """ENABLE_LOGIN: log in unless the stored session already is."""
+    proxy = proxy_of(slot.driver)
+    session = store.get(proxy) if store is not None else None
+    if session is not None and session.get("logged_in"):
+        return True
+    if not login(slot, base_url, log=log):
+        log("Login did not finish in time; continuing logged out.")
+        return False
+    log("Logged in.")
+    if store is not None:
+        store.save(slot.driver, proxy, force=True, logged_in=True)
+    return True
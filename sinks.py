@@ -0,0 +1,185 @@
+# sinks.py
+"""
+Streaming result writers.
+
+Each scraped job is appended to a sink as soon as it is parsed and written
+out in batches, so memory stays flat on long runs and a crash only loses
+the last unflushed batch. Batches are column-oriented (records.RecordBatch).
+"""
+import csv
+import json
+import os
+
+import config
+from records import COLUMNS, JobRecord, RecordBatch
+
+
+class ResultSink:
+    """Base sink: buffers records and hands full batches to _write_batch."""
+
+    resumable = True  # can be reopened with append=True to resume a run
+
+    def __init__(self, batch_size: int = None):
+        self.batch_size = batch_size or config.SINK_BATCH_SIZE
+        self.count = 0
+        self.closed = False
+        self.on_flush = None  # called after each batch reaches the file
+        self._batch = RecordBatch()
+
+    def write(self, record: JobRecord):
+        self._batch.append(record)
+        self.count += 1
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if len(self._batch):
+            self._write_batch(self._batch)
+            self._batch.clear()
+            if self.on_flush:
+                self.on_flush()
+
+    def close(self):
+        if self.closed:
+            return
+        self.flush()
+        self._close()
+        self.closed = True
+
+    def _write_batch(self, batch: RecordBatch):
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MemorySink(ResultSink):
+    """Keeps every record in one RecordBatch, for callers that want the rows back."""
+
+    def __init__(self):
+        super().__init__()
+        self.records = self._batch
+
+    def flush(self):
+        pass  # the batch is the result
+
+    @property
+    def columns(self):
+        """{column: values}"""
+        return self.records.columns
+
+
+class CsvSink(ResultSink):
+    def __init__(self, path: str, append: bool = False, batch_size: int = None):
+        super().__init__(batch_size)
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        resume = append and os.path.exists(path) and os.path.getsize(path) > 0
+        if resume:
+            with open(path, newline="", encoding="utf-8-sig") as f:
+                header = next(csv.reader(f), None)
+            if header != COLUMNS:
+                # e.g. salary columns added: appended rows would land in the wrong columns
+                raise ValueError(f"{path} has other columns than this scraper writes; "
+                                 "cannot append to it")
+        # utf-8-sig (Excel-friendly); no second BOM when appending
+        self._f = open(path, "a" if resume else "w", newline="",
+                       encoding="utf-8" if resume else "utf-8-sig")
+        self._writer = csv.writer(self._f)
+        if not resume:
+            self._writer.writerow(COLUMNS)
+
+    def _write_batch(self, batch: RecordBatch):
+        self._writer.writerows(batch.rows())
+        self._f.flush()
+
+    def _close(self):
+        self._f.close()
+
+
+class JsonlSink(ResultSink):
+    def __init__(self, path: str, append: bool = False, batch_size: int = None):
+        super().__init__(batch_size)
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._f = open(path, "a" if append else "w", encoding="utf-8")
+
+    def _write_batch(self, batch: RecordBatch):
+        self._f.write("".join(json.dumps(dict(zip(COLUMNS, values)), ensure_ascii=False) + "\n"
+                              for values in batch.rows()))
+        self._f.flush()
+
+    def _close(self):
+        self._f.close()
+
+
+class ParquetSink(ResultSink):
+    """
+    One Parquet row group per batch (needs `pip install pyarrow`). The file
+    is only readable once its footer is written, so rows go to <path>.part,
+    renamed over path on close; a crashed run leaves the old output intact.
+    """
+
+    resumable = False  # a Parquet file cannot be appended to
+
+    def __init__(self, path: str, append: bool = False, batch_size: int = None):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if append:
+            raise ValueError("Parquet files cannot be appended to; use CSV or JSONL.")
+
+        super().__init__(batch_size)
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._schema = pa.schema([(col, pa.string()) for col in COLUMNS])
+        self._part = path + ".part"
+        self._writer = pq.ParquetWriter(self._part, self._schema)
+
+    def _write_batch(self, batch: RecordBatch):
+        self._writer.write_table(batch.to_arrow(self._schema))
+
+    def _close(self):
+        self._writer.close()
+        os.replace(self._part, self.path)
+
+
+SINKS = {
+    "csv": CsvSink,
+    "jsonl": JsonlSink,
+    "parquet": ParquetSink,
+}
+
+
+def format_from_path(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    return {"json": "jsonl", "pq": "parquet"}.get(ext, ext if ext in SINKS else "csv")
+
+
+def output_path(fmt: str = None) -> str:
+    """Configured output file for a format (defaults to OUTPUT_FORMAT)."""
+    fmt = fmt or config.OUTPUT_FORMAT
+    return {
+        "csv": config.OUTPUT_CSV,
+        "jsonl": config.OUTPUT_JSON,
+        "parquet": config.OUTPUT_PARQUET,
+    }[fmt]
+
+
+def resumable(path: str, fmt: str = None) -> bool:
+    """Whether a run writing to path can be resumed (its sink can be appended to)."""
+    return SINKS.get(fmt or format_from_path(path), CsvSink).resumable
+
+
+def open_sink(path: str, fmt: str = None, append: bool = False, batch_size: int = None) -> ResultSink:
+    """Open a sink for path; the format follows the file extension unless given."""
+    fmt = fmt or format_from_path(path)
+    if fmt not in SINKS:
+        raise ValueError(f"Unknown output format: {fmt!r} (expected one of {', '.join(SINKS)})")
+    return SINKS[fmt](path, append=append, batch_size=batch_size)
@@ -0,0 +1,57 @@
+# tests/conftest.py
+import os
+import sys
+
+import pytest
+from lxml import html as lxml_html
+from selenium.common.exceptions import NoSuchElementException
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures")
+
+
+def load_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+class FixtureElement:
+    def __init__(self, node):
+        self._node = node
+
+    @property
+    def text(self) -> str:
+        return " ".join(self._node.text_content().split())
+
+    def get_attribute(self, name: str):
+        return self._node.get(name)
+
+    def find_element(self, by, value):
+        found = self._node.xpath(value)
+        if not found:
+            raise NoSuchElementException(value)
+        return FixtureElement(found[0])
+
+
+class FixtureDriver:
+    """The Selenium element API over a saved page (XPath lookups only)."""
+
+    def __init__(self, page_source: str):
+        self.page_source = page_source
+        self._doc = lxml_html.fromstring(page_source)
+
+    def find_element(self, by, value):
+        found = self._doc.xpath(value)
+        if not found:
+            raise NoSuchElementException(value)
+        return FixtureElement(found[0])
+
+    def find_elements(self, by, value):
+        return [FixtureElement(node) for node in self._doc.xpath(value)]
+
+
+@pytest.fixture
+def fixture_driver():
+    return lambda name: FixtureDriver(load_fixture(name))
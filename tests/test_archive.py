@@ -0,0 +1,40 @@
+# tests/test_archive.py
+from types import SimpleNamespace
+
+import config
+from archive import HtmlArchive, reparse
+from conftest import FixtureDriver, load_fixture
+from driver_pool import parse_job_page
+from sinks import MemorySink
+
+URL = "https://id.jobstreet.com/job/80112201"
+GONE_URL = "https://id.jobstreet.com/job/80112202"
+NOT_FOUND_HTML = ("<html><head><title>Page not found | Jobstreet</title></head>"
+                  "<body><h2>This job is no longer advertised</h2></body></html>")
+
+
+def scrape_into(archive, url, page_source):
+    slot = SimpleNamespace(pool=SimpleNamespace(archive=archive), driver=FixtureDriver(page_source))
+    return parse_job_page(slot, url)
+
+
+def test_only_titled_pages_are_archived(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "PARSER_MODE", "html")
+    archive = HtmlArchive(str(tmp_path))
+    try:
+        assert scrape_into(archive, URL, load_fixture("detail_page.html"))["job_name"]
+        assert not scrape_into(archive, GONE_URL, NOT_FOUND_HTML)["job_name"]
+        assert [url for _, url, _ in archive.latest()] == [URL]
+    finally:
+        archive.close()
+
+
+def test_reparse_skips_snapshots_without_a_title(tmp_path):
+    archive = HtmlArchive(str(tmp_path))
+    archive.put(URL, load_fixture("detail_page.html"))
+    archive.put(GONE_URL, NOT_FOUND_HTML)  # archived by an older version
+    archive.close()
+
+    sink = MemorySink()
+    assert reparse(sink, root=str(tmp_path), processes=1, log=lambda *args: None) == 1
+    assert sink.columns["Link"] == [URL]
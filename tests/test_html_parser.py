@@ -0,0 +1,56 @@
+# tests/test_html_parser.py
+import html_parser
+import parser as job_parser
+from page_selectors import DETAIL_FIELD_XPATHS
+from conftest import load_fixture
+
+BASE_URL = "https://id.jobstreet.com"
+
+EXPECTED_DETAIL = {
+    "job_name": "Senior Data Engineer",
+    "company_name": "PT Contoh Teknologi",
+    "work_type": "Full time",
+    "salary_range": "Rp 15.000.000 – Rp 22.000.000 per month",
+}
+
+
+def test_detail_fixture_fields():
+    parsed = html_parser.parse_job_detail_html(load_fixture("detail_page.html"))
+    assert parsed == EXPECTED_DETAIL
+
+
+def test_detail_matches_selenium_parser(fixture_driver):
+    page = "detail_page.html"
+    expected = job_parser.parse_job_detail(fixture_driver(page))
+    parsed = html_parser.parse_job_detail_html(load_fixture(page))
+    assert parsed == expected
+    assert list(parsed) == list(expected) == list(DETAIL_FIELD_XPATHS)
+
+
+def test_missing_fields_are_none_like_selenium_parser(fixture_driver):
+    page = "block_page.html"  # a heading, none of the detail fields
+    parsed = html_parser.parse_job_detail_html(load_fixture(page))
+    assert parsed == job_parser.parse_job_detail(fixture_driver(page))
+    assert parsed["company_name"] is None and parsed["salary_range"] is None
+
+
+def test_list_links_match_selenium_parser(fixture_driver):
+    page = "list_page.html"
+    links = html_parser.extract_links_from_html(load_fixture(page), BASE_URL)
+    assert len(links) == 8
+    assert links[0].startswith(BASE_URL + "/job/80112233")
+    assert links == job_parser.extract_links_from_list_page(fixture_driver(page), BASE_URL)
+
+
+def test_parallel_reparse_matches_serial(tmp_path):
+    detail, block = load_fixture("detail_page.html"), load_fixture("block_page.html")
+    pages = [detail, block] * 5
+    paths = []
+    for i, page in enumerate(pages):
+        path = tmp_path / f"{i}.html"
+        path.write_text(page, encoding="utf-8")
+        paths.append(str(path))
+
+    serial = [html_parser.parse_job_detail_html(page) for page in pages]
+    assert html_parser.parse_details_parallel(pages, processes=2) == serial
+    assert html_parser.parse_detail_files_parallel(paths, processes=2) == serial
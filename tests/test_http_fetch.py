@@ -0,0 +1,118 @@
+# tests/test_http_fetch.py
+import pytest
+
+import config
+from benchmarks.bench_crawl import ZERO_DELAYS
+from benchmarks.replay_driver import ReplayFactory
+from benchmarks.standin_server import NOT_FOUND_HTML, SESSION_COOKIE, StandIn, job_id
+from driver_pool import DriverPool
+from http_fetch import HttpFetcher, scrape_details_http
+
+LINKS = [f"https://id.jobstreet.com/job/{job_id(1, card)}" for card in range(1, 9)]
+
+
+def quiet(*args):
+    pass
+
+
+@pytest.fixture
+def crawl(monkeypatch):
+    """Start a stand-in with the given options; returns (standin, factory, fetcher)."""
+    opened = []
+
+    def start(workers=1, **standin_options):
+        standin = StandIn(pages=1, **standin_options).start()
+        factory = ReplayFactory(standin.url)
+        for key, value in {**ZERO_DELAYS, "PARSER_MODE": "js", "DRIVER_SPARES": 0,
+                           "DRIVER_FACTORY": factory, "HTTP_SESSION_FACTORY": factory.http_session,
+                           "SESSION_REUSE": False}.items():
+            monkeypatch.setattr(config, key, value)
+        pool = DriverPool(num_workers=1, log=quiet)
+        fetcher = HttpFetcher(pool, workers=workers, log=quiet)
+        opened.append((standin, factory, pool, fetcher))
+        return standin, factory, fetcher
+
+    yield start
+    for standin, factory, pool, fetcher in opened:
+        fetcher.close()
+        pool.close()
+        standin.stop()
+        assert factory.leaked() == 0
+
+
+def scrape(fetcher, links=LINKS):
+    """scrape_details_http with a browser pool to fall back on; [(index, link, parsed)] in call order."""
+    results = []
+    parent = DriverPool(num_workers=1, log=quiet)
+    try:
+        scrape_details_http(links, fetcher, lambda *result: results.append(result), num_workers=1,
+                            log=quiet, parent=parent)
+    finally:
+        parent.close()
+    return results
+
+
+def test_sync_copies_cookies_and_user_agent(crawl):
+    standin, factory, fetcher = crawl(warmup_ms=1)
+    driver = factory()
+    driver.get(LINKS[0])  # a fresh browser is held back once and gets the session cookie
+    fetcher.sync(driver)
+    driver.quit()
+
+    assert fetcher.session.headers["User-Agent"] == driver.user_agent
+    assert fetcher.session.cookies.get(SESSION_COOKIE) == "1"
+    assert fetcher.scrape(LINKS[1])["job_name"]
+    assert standin.requests["warmup"] == 1  # the HTTP client came in with the browser's session
+
+
+def test_block_page_falls_back_to_the_browser(crawl, monkeypatch):
+    monkeypatch.setattr(config, "HTTP_MAX_BLOCKS", 100)
+    standin, factory, fetcher = crawl(block_every=1)  # every job blocked on its first visit
+
+    results = scrape(fetcher)
+    assert len(results) == len(LINKS)
+    assert all(parsed["job_name"] for _, _, parsed in results)
+    assert fetcher.fallbacks == len(LINKS) and fetcher.fetched == 0
+    assert not fetcher.disabled
+
+
+def test_repeated_blocks_switch_to_the_browser(crawl, monkeypatch):
+    monkeypatch.setattr(config, "HTTP_MAX_BLOCKS", 2)
+    standin, factory, fetcher = crawl(block_every=1)
+    requested = []
+    session_get = fetcher.session.get
+
+    def counted_get(url, **kwargs):
+        requested.append(url)
+        return session_get(url, **kwargs)
+
+    monkeypatch.setattr(fetcher.session, "get", counted_get)
+
+    results = scrape(fetcher)
+    assert fetcher.disabled
+    assert requested == LINKS[:2]  # no HTTP request after the second block page
+    assert len(results) == len(LINKS)
+    assert all(parsed["job_name"] for _, _, parsed in results)
+
+
+def test_results_in_link_order(crawl, monkeypatch):
+    monkeypatch.setattr(config, "HTTP_MAX_BLOCKS", 100)
+    standin, factory, fetcher = crawl(workers=4, block_every=2)  # even job ids blocked once
+
+    results = scrape(fetcher)
+    assert fetcher.fetched == fetcher.fallbacks == len(LINKS) // 2
+    # the browser's results take their place between the client's
+    assert [index for index, _, _ in results] == list(range(len(LINKS)))
+    assert [link for _, link, _ in results] == LINKS
+    assert all(parsed["job_name"].endswith(f"#{link.rsplit('/', 1)[1]}") for _, link, parsed in results)
+
+
+def test_page_without_a_title_falls_back_to_the_browser(crawl):
+    standin, factory, fetcher = crawl()
+    detail_page = standin.detail_page
+    # an expired posting answered with 200 instead of a 404
+    standin.detail_page = lambda jid: NOT_FOUND_HTML if jid == job_id(1, 1) else detail_page(jid)
+
+    assert fetcher.scrape(LINKS[0]) is None
+    assert fetcher.scrape(LINKS[1])["job_name"]
+    assert (fetcher.fallbacks, fetcher.fetched) == (1, 1)
@@ -0,0 +1,62 @@
+# tests/test_list_only.py
+import re
+
+import config
+import crawler
+from benchmarks.bench_crawl import CLASSIFICATION, ZERO_DELAYS
+from benchmarks.replay_driver import ReplayFactory
+from benchmarks.standin_server import StandIn, job_id
+from conftest import FixtureDriver, load_fixture
+from crawler import crawl, extract_jobs
+from sinks import MemorySink
+from utils import build_classification_url
+
+BASE_URL = "https://id.jobstreet.com"
+
+
+def card_ids(jobs):
+    return [re.search(r"/job/(\d+)", job["link"]).group(1) for job in jobs]
+
+
+def test_state_rows_for_the_cards_on_the_page(monkeypatch):
+    monkeypatch.setattr(config, "PARSER_MODE", "selenium")
+    jobs = extract_jobs(FixtureDriver(load_fixture("list_page.html")), BASE_URL)
+    assert len(jobs) == 8
+    assert all(job["job_name"] for job in jobs)
+
+
+def test_stale_state_falls_back_to_card_links(monkeypatch):
+    """After a client-side page change the cards are new but the state is page 1's."""
+    monkeypatch.setattr(config, "PARSER_MODE", "selenium")
+    # new card links, the embedded state still holds page 1's ids
+    page_two = re.sub(r"/job/801122(\d\d)", r"/job/802122\1", load_fixture("list_page.html"))
+
+    jobs = extract_jobs(FixtureDriver(page_two), BASE_URL)
+    assert len(jobs) == 8
+    assert all(set(job) == {"link"} for job in jobs)
+    assert all(i.startswith("802122") for i in card_ids(jobs))
+
+
+def test_pages_after_the_first_come_from_their_own_state(monkeypatch):
+    """Under the default click pagination, list-only still gets state rows on page 2."""
+    def no_click(driver):
+        raise AssertionError("list-only must not paginate by clicking")
+
+    with StandIn(pages=2) as standin:
+        factory = ReplayFactory(standin.url)
+        for key, value in {**ZERO_DELAYS, "PARSER_MODE": "js", "DRIVER_SPARES": 0,
+                           "DRIVER_FACTORY": factory, "PAGINATION_MODE": "click"}.items():
+            monkeypatch.setattr(config, key, value)
+        monkeypatch.setattr(crawler, "click_next_page", no_click)
+        base_url, _, full_url = build_classification_url("id", CLASSIFICATION)
+        sink = MemorySink()
+
+        assert crawl(base_url, full_url, sink, 2, num_workers=1, list_only=True,
+                     log=lambda *args: None) == 16
+
+    page_two = card_ids([{"link": link} for link in sink.columns["Link"]])[8:]
+    assert set(page_two) == {str(job_id(2, card)) for card in range(8)}
+    assert all(sink.columns["Job Name"])
+    # only the one card per page whose state lacks a field is visited, as on page 1
+    assert standin.requests == {"list": 2, "detail": 2}
+    assert factory.leaked() == 0
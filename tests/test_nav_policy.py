@@ -0,0 +1,28 @@
+# tests/test_nav_policy.py
+import config
+from benchmarks.bench_crawl import ZERO_DELAYS
+from benchmarks.replay_driver import ReplayFactory
+from benchmarks.standin_server import StandIn, job_id
+from driver_pool import scrape_details
+
+LINKS = [f"https://id.jobstreet.com/job/{job_id(1, card)}" for card in (1, 2)]
+# rendered, but neither a job nor a removed posting (an unknown challenge, say)
+UNTITLED_HTML = "<html><head><title>Jobstreet</title></head><body><div id='app'></div></body></html>"
+
+
+def test_untitled_page_is_retried_then_left_pending(monkeypatch):
+    with StandIn(pages=1) as standin:
+        factory = ReplayFactory(standin.url)
+        for key, value in {**ZERO_DELAYS, "PARSER_MODE": "js", "DRIVER_SPARES": 0,
+                           "DRIVER_FACTORY": factory, "RETRY_BACKOFF": 0}.items():
+            monkeypatch.setattr(config, key, value)
+        monkeypatch.setitem(config.RETRY_LIMITS, "empty", 1)
+        detail_page = standin.detail_page
+        standin.detail_page = lambda jid: UNTITLED_HTML if jid == job_id(1, 1) else detail_page(jid)
+
+        results = scrape_details(LINKS, num_workers=1, log=lambda *args: None)
+
+    assert results[0] is None  # not an all-None row: the job stays pending
+    assert results[1]["job_name"]
+    assert standin.requests["detail"] == 3  # the untitled page was loaded twice
+    assert factory.leaked() == 0
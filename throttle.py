@@ -0,0 +1,123 @@
+# throttle.py
+"""
+Navigation pacing shared by every driver of a crawl.
+
+RateLimiter keeps a fixed minimum interval between navigations.
+AdaptiveThrottle runs an AIMD policy on the navigation rate: it creeps up
+while pages load fast and clean, halves on a block page, backs off on slow
+loads, and pauses (asking the caller to rotate its session) after repeated
+blocks.
+"""
+import threading
+import time
+
+import config
+
+# record() verdicts
+OK = "ok"
+BACKOFF = "backoff"
+ROTATE = "rotate"
+
+
+class RateLimiter:
+    """Global navigation rate limit shared by every worker of a pool."""
+
+    delay_scale = 1.0
+
+    def __init__(self, min_interval: float):
+        self.min_interval = max(0.0, min_interval)
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self.pages = 0
+        self.blocks = 0
+
+    @property
+    def rate(self) -> float:
+        """Navigations per second."""
+        return 1.0 / self.min_interval if self.min_interval else float("inf")
+
+    def wait(self):
+        """Block until this caller's navigation slot is due."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def record(self, latency: float, blocked: bool) -> str:
+        """Feed one navigation outcome; a block page asks for a session rotation."""
+        with self._lock:
+            self.pages += 1
+            self.blocks += blocked
+        return ROTATE if blocked else OK
+
+    def summary(self) -> str:
+        return f"{self.pages} navigations, {self.blocks} block pages, rate {self.rate * 60:.1f}/min"
+
+
+class AdaptiveThrottle(RateLimiter):
+    """AIMD navigation rate driven by block detection and page-load latency."""
+
+    def __init__(self, start_rate: float = None, min_rate: float = None, max_rate: float = None):
+        self.min_rate = min_rate or config.THROTTLE_MIN_RATE
+        self.max_rate = max_rate or config.THROTTLE_MAX_RATE
+        if start_rate is None:
+            start_rate = 1.0 / config.GLOBAL_MIN_INTERVAL if config.GLOBAL_MIN_INTERVAL else self.max_rate
+        self.start_rate = min(max(start_rate, self.min_rate), self.max_rate)
+        super().__init__(1.0 / self.start_rate)
+
+        self.consecutive_blocks = 0
+        self.latency_ewma = None
+        self.paused_until = 0.0
+
+    @property
+    def rate(self) -> float:
+        return 1.0 / self.min_interval
+
+    @property
+    def delay_scale(self) -> float:
+        """Factor for the per-page human_delay: < 1 while healthy, > 1 when backing off."""
+        return min(max(self.start_rate / self.rate, config.THROTTLE_MIN_DELAY_SCALE), 3.0)
+
+    def _set_rate(self, rate: float):
+        self.min_interval = 1.0 / min(max(rate, self.min_rate), self.max_rate)
+
+    def wait(self):
+        pause = self.paused_until - time.monotonic()
+        if pause > 0:
+            time.sleep(pause)
+        super().wait()
+
+    def record(self, latency: float, blocked: bool) -> str:
+        """Feed one navigation outcome; returns OK, BACKOFF or ROTATE."""
+        with self._lock:
+            self.pages += 1
+            if blocked:
+                self.blocks += 1
+                self.consecutive_blocks += 1
+                self._set_rate(self.rate * config.THROTTLE_DECREASE)
+                if self.consecutive_blocks >= config.THROTTLE_PAUSE_AFTER:
+                    self.paused_until = time.monotonic() + config.THROTTLE_PAUSE_SECONDS
+                    self.consecutive_blocks = 0
+                return ROTATE
+
+            self.consecutive_blocks = 0
+            baseline = self.latency_ewma
+            self.latency_ewma = latency if baseline is None else 0.8 * baseline + 0.2 * latency
+
+            slow = latency > config.THROTTLE_SLOW_PAGE or (baseline is not None and latency > 3 * baseline)
+            if slow:
+                self._set_rate(self.rate * 0.8)
+                return BACKOFF
+
+            self._set_rate(self.rate + config.THROTTLE_INCREASE)
+            return OK
+
+
+def make_rate_limiter() -> RateLimiter:
+    """The configured limiter: adaptive if ADAPTIVE_THROTTLE, else fixed interval."""
+    if config.ADAPTIVE_THROTTLE:
+        return AdaptiveThrottle()
+    return RateLimiter(config.GLOBAL_MIN_INTERVAL)
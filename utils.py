@@ -1,4 +1,7 @@
 # utils.py
+import re
+
+
 def build_classification_url(country: str, classification: str):
     """
     Build:
@@ -21,3 +24,32 @@ def build_classification_url(country: str, classification: str):
     full_url = base_url + route
 
     return base_url, route, full_url
+
+
+_JOB_ID_RE = re.compile(r"/job/(\d+)")
+
+
+def job_id_from_url(url: str):
+    """
+    https://id.jobstreet.com/job/80112233?type=standard&ref=... → "80112233"
+    Returns None if the URL is not a job detail link.
+    """
+    m = _JOB_ID_RE.search(url or "")
+    return m.group(1) if m else None
+
+
+def canonical_job_url(base_url: str, job_id: str) -> str:
+    """Job link without tracking parameters or fragments."""
+    return f"{base_url}/job/{job_id}"
+
+
+def build_page_url(full_url: str, page: int) -> str:
+    """
+    URL of one search results page:
+        build_page_url("https://id.jobstreet.com/jobs-in-accounting", 3)
+        → https://id.jobstreet.com/jobs-in-accounting?page=3
+    """
+    if page <= 1:
+        return full_url
+    sep = "&" if "?" in full_url else "?"
+    return f"{full_url}{sep}page={page}"